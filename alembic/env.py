@@ -21,8 +21,8 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Set SQLAlchemy URL from settings
-config.set_main_option("sqlalchemy.url", settings.database_url)
+# Set SQLAlchemy URL from settings (migrations bypass PgBouncer)
+config.set_main_option("sqlalchemy.url", settings.direct_database_url)
 
 # Add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
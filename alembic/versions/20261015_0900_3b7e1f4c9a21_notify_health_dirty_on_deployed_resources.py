@@ -0,0 +1,44 @@
+"""notify_health_dirty_on_deployed_resources
+
+Revision ID: 3b7e1f4c9a21
+Revises: 616f14436ae6
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e1f4c9a21'
+down_revision: Union[str, Sequence[str], None] = '616f14436ae6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Wake the health checker when the set of containers to check changes.
+    # Only status/external_id updates fire, so the checker's own health
+    # column writes don't wake it up again.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_health_dirty() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('health_dirty', NEW.resource_id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER deployed_resources_health_dirty
+        AFTER INSERT OR UPDATE OF status, external_id ON deployed_resources
+        FOR EACH ROW EXECUTE FUNCTION notify_health_dirty()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS deployed_resources_health_dirty ON deployed_resources")
+    op.execute("DROP FUNCTION IF EXISTS notify_health_dirty()")
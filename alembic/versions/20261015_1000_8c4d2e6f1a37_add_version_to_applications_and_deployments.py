@@ -0,0 +1,31 @@
+"""add_version_to_applications_and_deployments
+
+Revision ID: 8c4d2e6f1a37
+Revises: 3b7e1f4c9a21
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d2e6f1a37'
+down_revision: Union[str, Sequence[str], None] = '3b7e1f4c9a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Optimistic concurrency: updates match on version and bump it
+    op.add_column('applications', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('deployments', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('deployments', 'version')
+    op.drop_column('applications', 'version')
@@ -0,0 +1,54 @@
+"""jsonb_for_template_application_deployment_json
+
+Revision ID: 5e9a3c7b2d48
+Revises: 8c4d2e6f1a37
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a3c7b2d48'
+down_revision: Union[str, Sequence[str], None] = '8c4d2e6f1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column) pairs stored as JSONB
+COLUMNS = [
+    ('application_templates', 'deployment_steps'),
+    ('application_templates', 'required_inputs'),
+    ('applications', 'user_inputs'),
+    ('deployments', 'resolved_config'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=False,
+            postgresql_using=f'{column}::jsonb',
+        )
+    op.create_index('ix_apps_user_inputs_gin', 'applications', ['user_inputs'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_apps_user_inputs_gin', table_name='applications', postgresql_using='gin')
+    for table, column in COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=False,
+            postgresql_using=f'{column}::json',
+        )
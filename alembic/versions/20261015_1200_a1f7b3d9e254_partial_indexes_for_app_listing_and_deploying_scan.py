@@ -0,0 +1,30 @@
+"""partial_indexes_for_app_listing_and_deploying_scan
+
+Revision ID: a1f7b3d9e254
+Revises: 5e9a3c7b2d48
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f7b3d9e254'
+down_revision: Union[str, Sequence[str], None] = '5e9a3c7b2d48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_apps_tenant_active_created', 'applications', ['tenant_id', sa.text('created_at DESC')], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_deployments_deploying_created', 'deployments', ['created_at'], unique=False, postgresql_where=sa.text("status = 'DEPLOYING'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deployments_deploying_created', table_name='deployments', postgresql_where=sa.text("status = 'DEPLOYING'"))
+    op.drop_index('ix_apps_tenant_active_created', table_name='applications', postgresql_where=sa.text('deleted_at IS NULL'))
@@ -0,0 +1,82 @@
+"""status_enums_to_varchar_with_check
+
+Revision ID: c6b8e2a4f913
+Revises: a1f7b3d9e254
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6b8e2a4f913'
+down_revision: Union[str, Sequence[str], None] = 'a1f7b3d9e254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# PostgreSQL enum type -> allowed values
+ENUM_TYPES = {
+    'applicationstatus': ('CREATING', 'RUNNING', 'STOPPED', 'FAILED', 'DELETING', 'DELETED'),
+    'deploymentstatus': ('PENDING', 'DEPLOYING', 'RUNNING', 'FAILED', 'ROLLED_BACK', 'DELETED'),
+    'stepstatus': ('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', 'SKIPPED'),
+    'healthstatus': ('UNKNOWN', 'HEALTHY', 'UNHEALTHY', 'STARTING'),
+}
+
+# (table, column, enum type, check constraint name)
+COLUMNS = [
+    ('applications', 'status', 'applicationstatus', 'ck_applications_status'),
+    ('applications', 'health_status', 'healthstatus', 'ck_applications_health_status'),
+    ('deployments', 'status', 'deploymentstatus', 'ck_deployments_status'),
+    ('deployment_step_executions', 'status', 'stepstatus', 'ck_deployment_step_executions_status'),
+    ('deployed_resources', 'health_status', 'healthstatus', 'ck_deployed_resources_health_status'),
+]
+
+
+def _in_list(values) -> str:
+    return ', '.join(f"'{v}'" for v in values)
+
+
+def _drop_deploying_index() -> None:
+    # Its predicate compares status to a typed literal, so it blocks ALTER TYPE
+    op.drop_index('ix_deployments_deploying_created', table_name='deployments')
+
+
+def _create_deploying_index() -> None:
+    op.create_index('ix_deployments_deploying_created', 'deployments', ['created_at'], unique=False, postgresql_where=sa.text("status = 'DEPLOYING'"))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _drop_deploying_index()
+    
+    for table, column, enum_type, constraint in COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.String(length=32),
+            existing_nullable=False,
+            postgresql_using=f'{column}::text',
+        )
+        op.create_check_constraint(constraint, table, f"{column} IN ({_in_list(ENUM_TYPES[enum_type])})")
+    
+    for enum_type in ENUM_TYPES:
+        op.execute(f'DROP TYPE {enum_type}')
+    
+    _create_deploying_index()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_deploying_index()
+    
+    for enum_type, values in ENUM_TYPES.items():
+        op.execute(f'CREATE TYPE {enum_type} AS ENUM ({_in_list(values)})')
+    
+    for table, column, enum_type, constraint in COLUMNS:
+        op.drop_constraint(constraint, table, type_='check')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_type} USING {column}::{enum_type}')
+    
+    _create_deploying_index()
@@ -0,0 +1,40 @@
+"""cover_app_listing_index
+
+Revision ID: d3e5f7a9b1c2
+Revises: c6b8e2a4f913
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3e5f7a9b1c2'
+down_revision: Union[str, Sequence[str], None] = 'c6b8e2a4f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_apps_tenant_active_created', table_name='applications', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index(
+        'ix_apps_tenant_active_created', 'applications',
+        ['tenant_id', sa.text('created_at DESC')],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+        postgresql_include=['application_id', 'name', 'status', 'health_status', 'public_url'],
+    )
+    
+    # Index-only scans need an up-to-date visibility map
+    with op.get_context().autocommit_block():
+        op.execute('VACUUM ANALYZE applications')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_apps_tenant_active_created', table_name='applications', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_apps_tenant_active_created', 'applications', ['tenant_id', sa.text('created_at DESC')], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
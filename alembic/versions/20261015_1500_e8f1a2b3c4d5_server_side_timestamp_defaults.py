@@ -0,0 +1,57 @@
+"""server_side_timestamp_defaults
+
+Revision ID: e8f1a2b3c4d5
+Revises: d3e5f7a9b1c2
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f1a2b3c4d5'
+down_revision: Union[str, Sequence[str], None] = 'd3e5f7a9b1c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Timestamp columns now defaulted by the database clock (naive UTC)
+COLUMNS = [
+    ('executions', 'created_at'),
+    ('application_templates', 'created_at'),
+    ('application_templates', 'updated_at'),
+    ('applications', 'created_at'),
+    ('applications', 'updated_at'),
+    ('deployments', 'created_at'),
+    ('deployed_resources', 'created_at'),
+    ('domains', 'created_at'),
+    ('domains', 'updated_at'),
+    ('provisioned_databases', 'created_at'),
+    ('infrastructure_nodes', 'created_at'),
+    ('infrastructure_nodes', 'registered_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in COLUMNS:
+        op.alter_column(
+            table, column,
+            server_default=sa.text("timezone('UTC', now())"),
+            existing_type=sa.DateTime(),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in COLUMNS:
+        op.alter_column(
+            table, column,
+            server_default=None,
+            existing_type=sa.DateTime(),
+            existing_nullable=False,
+        )
@@ -0,0 +1,45 @@
+"""jsonb_node_runtimes_and_placement_index
+
+Revision ID: f4a6c8e0b2d3
+Revises: e8f1a2b3c4d5
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a6c8e0b2d3'
+down_revision: Union[str, Sequence[str], None] = 'e8f1a2b3c4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'infrastructure_nodes', 'supported_runtimes',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using='supported_runtimes::jsonb',
+    )
+    op.create_index('ix_nodes_runtimes_gin', 'infrastructure_nodes', ['supported_runtimes'], unique=False, postgresql_using='gin')
+    op.create_index('ix_nodes_status_health_load', 'infrastructure_nodes', ['status', 'health_status', 'active_containers'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_nodes_status_health_load', table_name='infrastructure_nodes')
+    op.drop_index('ix_nodes_runtimes_gin', table_name='infrastructure_nodes', postgresql_using='gin')
+    op.alter_column(
+        'infrastructure_nodes', 'supported_runtimes',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using='supported_runtimes::json',
+    )
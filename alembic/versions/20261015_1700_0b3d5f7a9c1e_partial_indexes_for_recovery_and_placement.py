@@ -0,0 +1,38 @@
+"""partial_indexes_for_recovery_and_placement
+
+Revision ID: 0b3d5f7a9c1e
+Revises: f4a6c8e0b2d3
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b3d5f7a9c1e'
+down_revision: Union[str, Sequence[str], None] = 'f4a6c8e0b2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+RECOVERABLE_WHERE = sa.text("state = 'STARTED'")
+AVAILABLE_WHERE = sa.text("status = 'READY' AND health_status IN ('HEALTHY', 'UNKNOWN')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_executions_recoverable_lookup', table_name='executions', postgresql_where=RECOVERABLE_WHERE)
+    op.create_index('ix_executions_recoverable_lookup', 'executions', ['lease_expires_at'], unique=False, postgresql_where=RECOVERABLE_WHERE)
+    op.drop_index('ix_nodes_status_health_load', table_name='infrastructure_nodes')
+    op.create_index('ix_nodes_available', 'infrastructure_nodes', ['active_containers'], unique=False, postgresql_where=AVAILABLE_WHERE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_nodes_available', table_name='infrastructure_nodes', postgresql_where=AVAILABLE_WHERE)
+    op.create_index('ix_nodes_status_health_load', 'infrastructure_nodes', ['status', 'health_status', 'active_containers'], unique=False)
+    op.drop_index('ix_executions_recoverable_lookup', table_name='executions', postgresql_where=RECOVERABLE_WHERE)
+    op.create_index('ix_executions_recoverable_lookup', 'executions', ['state', 'lease_expires_at'], unique=False, postgresql_where=RECOVERABLE_WHERE)
@@ -0,0 +1,52 @@
+"""jsonb_node_labels_and_dns_records
+
+Revision ID: 2d4f6a8c0e13
+Revises: 0b3d5f7a9c1e
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d4f6a8c0e13'
+down_revision: Union[str, Sequence[str], None] = '0b3d5f7a9c1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, GIN index) stored as JSONB
+COLUMNS = [
+    ('infrastructure_nodes', 'labels', 'ix_nodes_labels_gin'),
+    ('domains', 'dns_records', 'ix_domains_dns_records_gin'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, index in COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            existing_nullable=False,
+            postgresql_using=f'{column}::jsonb',
+        )
+        op.create_index(index, table, [column], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, index in COLUMNS:
+        op.drop_index(index, table_name=table, postgresql_using='gin')
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=False,
+            postgresql_using=f'{column}::json',
+        )
@@ -0,0 +1,46 @@
+"""node_cpu_as_smallint_centicores
+
+Revision ID: 7e9a1c3e5f24
+Revises: 2d4f6a8c0e13
+Create Date: 2026-10-15 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e9a1c3e5f24'
+down_revision: Union[str, Sequence[str], None] = '2d4f6a8c0e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CPU columns stored as hundredths of a core
+COLUMNS = ['total_cpu', 'available_cpu']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COLUMNS:
+        op.alter_column(
+            'infrastructure_nodes', column,
+            type_=sa.SmallInteger(),
+            existing_type=sa.Float(),
+            existing_nullable=False,
+            postgresql_using=f'round({column} * 100)::smallint',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in COLUMNS:
+        op.alter_column(
+            'infrastructure_nodes', column,
+            type_=sa.Float(),
+            existing_type=sa.SmallInteger(),
+            existing_nullable=False,
+            postgresql_using=f'{column} / 100.0',
+        )
@@ -0,0 +1,44 @@
+"""notify_node_heartbeat
+
+Revision ID: 5c8e0a2b4d61
+Revises: 7e9a1c3e5f24
+Create Date: 2026-10-15 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c8e0a2b4d61'
+down_revision: Union[str, Sequence[str], None] = '7e9a1c3e5f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Push each node heartbeat to the node monitor instead of having it
+    # poll. Capacity/status writes don't touch last_heartbeat_at, so they
+    # don't fire.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_node_heartbeat() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('node_heartbeat', NEW.node_id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER infrastructure_nodes_heartbeat
+        AFTER INSERT OR UPDATE OF last_heartbeat_at ON infrastructure_nodes
+        FOR EACH ROW EXECUTE FUNCTION notify_node_heartbeat()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS infrastructure_nodes_heartbeat ON infrastructure_nodes")
+    op.execute("DROP FUNCTION IF EXISTS notify_node_heartbeat()")
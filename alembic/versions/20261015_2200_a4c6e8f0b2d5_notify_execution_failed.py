@@ -0,0 +1,45 @@
+"""notify_execution_failed
+
+Revision ID: a4c6e8f0b2d5
+Revises: 5c8e0a2b4d61
+Create Date: 2026-10-15 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c6e8f0b2d5'
+down_revision: Union[str, Sequence[str], None] = '5c8e0a2b4d61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Wake the retry worker when an execution fails instead of having it
+    # poll. Only FAILED transitions notify, so completions don't wake it.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_execution_failed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('execution_failed', NEW.execution_id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER executions_failed
+        AFTER UPDATE OF state ON executions
+        FOR EACH ROW
+        WHEN (NEW.state = 'FAILED' AND OLD.state IS DISTINCT FROM NEW.state)
+        EXECUTE FUNCTION notify_execution_failed()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS executions_failed ON executions")
+    op.execute("DROP FUNCTION IF EXISTS notify_execution_failed()")
@@ -0,0 +1,47 @@
+"""notify_deployment_events
+
+Revision ID: b7d9f1a3c5e6
+Revises: a4c6e8f0b2d5
+Create Date: 2026-10-15 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d9f1a3c5e6'
+down_revision: Union[str, Sequence[str], None] = 'a4c6e8f0b2d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tell the status updater which deployment to re-check. A deployment's
+    # status only moves when one of its executions completes or fails.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_deployment_event() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('deployment_events', NEW.deployment_id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER executions_deployment_events
+        AFTER UPDATE OF state ON executions
+        FOR EACH ROW
+        WHEN (NEW.deployment_id IS NOT NULL
+              AND NEW.state IN ('COMPLETED', 'FAILED')
+              AND OLD.state IS DISTINCT FROM NEW.state)
+        EXECUTE FUNCTION notify_deployment_event()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS executions_deployment_events ON executions")
+    op.execute("DROP FUNCTION IF EXISTS notify_deployment_event()")
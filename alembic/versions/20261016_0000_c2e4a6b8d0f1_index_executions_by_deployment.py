@@ -0,0 +1,31 @@
+"""index_executions_by_deployment
+
+Revision ID: c2e4a6b8d0f1
+Revises: b7d9f1a3c5e6
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e4a6b8d0f1'
+down_revision: Union[str, Sequence[str], None] = 'b7d9f1a3c5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+HAS_DEPLOYMENT_WHERE = sa.text("deployment_id IS NOT NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_executions_deployment', 'executions', ['deployment_id'], unique=False, postgresql_where=HAS_DEPLOYMENT_WHERE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_executions_deployment', table_name='executions', postgresql_where=HAS_DEPLOYMENT_WHERE)
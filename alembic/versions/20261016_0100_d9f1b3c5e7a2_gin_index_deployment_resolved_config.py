@@ -0,0 +1,28 @@
+"""gin_index_deployment_resolved_config
+
+Revision ID: d9f1b3c5e7a2
+Revises: c2e4a6b8d0f1
+Create Date: 2026-10-16 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f1b3c5e7a2'
+down_revision: Union[str, Sequence[str], None] = 'c2e4a6b8d0f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_deployments_resolved_config_gin', 'deployments', ['resolved_config'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deployments_resolved_config_gin', table_name='deployments', postgresql_using='gin')
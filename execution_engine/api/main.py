@@ -1,8 +1,25 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from execution_engine.api.routes.executions import router as executions_router
 from execution_engine.api.routes.nodes import router as nodes_router
+from execution_engine.infrastructure.postgres.database import request_session_scope, warm_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connect the pool up front instead of on the first requests
+    warm_pool()
+    yield
+
+
+app = FastAPI(title="Execution Engine API", lifespan=lifespan)
 
-app = FastAPI(title="Execution Engine API")
+@app.middleware("http")
+async def db_session_per_request(request: Request, call_next):
+    # Repository calls made while handling this request share one session
+    with request_session_scope():
+        return await call_next(request)
 
 @app.get("/health")
 def health():
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
-from uuid import uuid4
 from uuid import UUID
 
 from execution_engine.api.schemas.execution import (
     ExecutionCreateRequest,
     ExecutionResponse,
 )
+from execution_engine.core.ids import new_id
 from execution_engine.core.models import Execution
 from execution_engine.api.container import get_execution_service
 
@@ -18,7 +18,7 @@ def create_execution(
     service=Depends(get_execution_service),
 ):
     execution = Execution(
-        execution_id=uuid4(),
+        execution_id=new_id(),
         tenant_id=request.tenant_id,
         application_id=request.application_id,
         runtime_type=request.runtime_type,
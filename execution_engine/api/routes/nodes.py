@@ -4,12 +4,13 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from execution_engine.node_manager.models import (
     InfrastructureNode, NodeType, NodeStatus, NodeHealthStatus
 )
 from execution_engine.container import node_manager_service
+from execution_engine.core.ids import new_id
 
 router = APIRouter(prefix="/nodes", tags=["nodes"])
 
@@ -22,7 +23,7 @@ class RegisterNodeRequest(BaseModel):
     public_ip: Optional[str] = None
     runtime_agent_url: str
     supported_runtimes: List[str] = Field(default=["docker"])
-    total_cpu: float = Field(..., gt=0)
+    total_cpu: float = Field(..., gt=0, le=327)  # stored as SMALLINT hundredths
     total_memory: int = Field(..., gt=0)
     total_storage: int = Field(..., gt=0)
     max_containers: int = Field(default=50, gt=0)
@@ -55,13 +56,13 @@ async def register_node(request: RegisterNodeRequest):
     try:
         # Create node
         node = InfrastructureNode(
-            node_id=uuid4(),
+            node_id=new_id(),
             node_name=request.node_name,
             node_type=NodeType[request.node_type],
             internal_ip=request.internal_ip,
             public_ip=request.public_ip,
             runtime_agent_url=request.runtime_agent_url,
-            supported_runtimes=request.supported_runtimes,
+            supported_runtimes=frozenset(request.supported_runtimes),
             total_cpu=request.total_cpu,
             total_memory=request.total_memory,
             total_storage=request.total_storage,
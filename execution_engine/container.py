@@ -1,11 +1,14 @@
 # execution_engine/container.py
 """Dependency injection container - wires all services together."""
 
+import logging
+
 from execution_engine.infrastructure.postgres.repository import PostgresExecutionRepository
 from execution_engine.infrastructure.postgres.domain_repository import (
     ApplicationTemplateRepository,
     ApplicationRepository,
     DeploymentRepository,
+    DeployedResourceRepository,
 )
 from execution_engine.infrastructure.postgres.node_repository import NodeRepository
 
@@ -16,6 +19,19 @@ from execution_engine.domain.service import DomainService
 from execution_engine.node_manager.service import NodeManagerService
 
 
+# ============================================
+# LOGGING
+# ============================================
+
+# Configured once for every process that wires services through here; a
+# later basicConfig() call (run_* scripts) is a no-op. Module loggers
+# format lazily, so DEBUG lines cost nothing at this level.
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
 # ============================================
 # REPOSITORIES
 # ============================================
@@ -27,6 +43,7 @@ execution_repository = PostgresExecutionRepository()
 template_repository = ApplicationTemplateRepository()
 application_repository = ApplicationRepository()
 deployment_repository = DeploymentRepository()
+deployed_resource_repository = DeployedResourceRepository()
 
 # Node Manager
 node_repository = NodeRepository()
@@ -74,6 +91,7 @@ __all__ = [
     'template_repository',
     'application_repository',
     'deployment_repository',
+    'deployed_resource_repository',
     'node_repository',
     
     # Services
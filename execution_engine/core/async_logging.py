@@ -0,0 +1,56 @@
+#execution_engine\core\async_logging.py
+
+"""Hand log records to a background thread instead of writing them inline."""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+
+class _RootForwarder(logging.Handler):
+    """Pass drained records to whatever handlers the root logger has now."""
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        for handler in logging.getLogger().handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, so the record (args and all)
+        # can be passed as is; the stock prepare() formats it right here
+        return record
+
+
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener: Optional[QueueListener] = None
+
+
+def install_queue_handler(logger: logging.Logger) -> None:
+    """
+    Route a logger's records through an in-memory queue.
+    
+    The calling thread only appends to the queue; one shared listener
+    thread formats and drains it into the root logger's handlers (whatever
+    logging.basicConfig() set up, even if configured later). The logger
+    stops propagating so records are not written twice. Level checks
+    still happen on the caller, so disabled levels cost no queue traffic.
+    """
+    global _listener
+    
+    if any(isinstance(h, QueueHandler) for h in logger.handlers):
+        return
+    
+    logger.addHandler(_DeferredQueueHandler(_queue))
+    logger.propagate = False
+    
+    if _listener is None:
+        _listener = QueueListener(_queue, _RootForwarder())
+        _listener.start()
+        # Flush anything still queued on interpreter exit
+        atexit.register(_listener.stop)
@@ -1,8 +1,9 @@
 #execution_engine\core\factory.py
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 from typing import Dict, Any
 
+from execution_engine.core.ids import new_id
 from execution_engine.core.models import Execution
 from execution_engine.core.validation import validate_new_execution
 
@@ -17,7 +18,7 @@ class ExecutionFactory:
         spec: Dict[str, Any],
     ) -> Execution:
         execution = Execution(
-            execution_id=uuid4(),
+            execution_id=new_id(),
             tenant_id=tenant_id,
             application_id=application_id,
             runtime_type=runtime_type,
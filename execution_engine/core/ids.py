@@ -0,0 +1,28 @@
+#execution_engine\core\ids.py
+
+"""Identifier generation."""
+
+import os
+import time
+from uuid import UUID
+
+
+def new_id() -> UUID:
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The high 48 bits are the Unix time in milliseconds, so IDs created
+    close together sort close together. New rows then land on the
+    rightmost B-tree leaf pages instead of random ones, keeping primary
+    key and foreign key indexes compact and cache-friendly on insert.
+    Still a standard 16-byte UUID, so columns and APIs are unchanged.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76                          # version
+    value |= ((rand >> 62) & 0xFFF) << 64       # rand_a (12 bits)
+    value |= 0b10 << 62                         # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF       # rand_b (62 bits)
+    return UUID(int=value)
@@ -21,7 +21,7 @@ class ExecutionState(Enum):
     CANCELLED = "CANCELLED"
 
 
-@dataclass
+@dataclass(slots=True)
 class Execution:
     """Execution domain model with state transitions."""
     
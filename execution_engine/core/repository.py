@@ -1,7 +1,7 @@
 # execution/core/repository.py
 
 from abc import ABC, abstractmethod
-from typing import Optional, Iterable
+from typing import Optional, Iterable, List
 from uuid import UUID
 
 from execution_engine.core.models import Execution, ExecutionState
@@ -20,6 +20,14 @@ class ExecutionRepository(ABC):
         """
         raise NotImplementedError
 
+    def create_many(self, executions: List[Execution]) -> None:
+        """
+        Persist several new executions.
+        Implementations may override this with a single batched write.
+        """
+        for execution in executions:
+            self.create(execution)
+
     @abstractmethod
     def get(self, execution_id: UUID) -> Optional[Execution]:
         """
@@ -32,6 +32,24 @@ class ExecutionService:
             ExecutionEvent.execution_registered(execution)
         ])
     
+    def submit_executions(self, executions):
+        """
+        Register new executions directly in QUEUED state.
+        
+        Equivalent to register_execution() + queue_execution() for each,
+        but persisted with one batched write instead of two per execution.
+        """
+        for execution in executions:
+            execution.queue()
+        
+        self._repo.create_many(executions)
+        
+        events = []
+        for execution in executions:
+            events.append(ExecutionEvent.execution_registered(execution))
+            events.append(ExecutionEvent.execution_queued(execution))
+        self._emit(events)
+    
     # -------------------------
     # QUEUE
     # -------------------------
@@ -127,6 +127,7 @@ class ApplicationTemplate:
     
     icon_url: Optional[str] = None
     
+    # In execution order when loaded from the repository
     deployment_steps: List[DeploymentStepDefinition] = field(default_factory=list)
     
     database_required: bool = False
@@ -171,6 +172,9 @@ class Application:
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     deleted_at: Optional[datetime] = None
+    
+    # Optimistic concurrency (bumped by every update)
+    version: int = 0
 
 
 # ============================================
@@ -205,6 +209,9 @@ class Deployment:
     completed_at: Optional[datetime] = None
     
     metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    # Optimistic concurrency (bumped by every update)
+    version: int = 0
 
 
 @dataclass
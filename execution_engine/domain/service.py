@@ -2,8 +2,9 @@
 
 """Domain service - manages applications and deployments."""
 
+import logging
 from typing import Dict, Any, List, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 from datetime import datetime, timezone
 import re
 
@@ -15,6 +16,9 @@ from execution_engine.infrastructure.postgres.domain_repository import (
     ApplicationRepository, ApplicationTemplateRepository, DeploymentRepository
 )
 from execution_engine.core.errors import ExecutionValidationError
+from execution_engine.core.ids import new_id
+
+logger = logging.getLogger(__name__)
 
 
 class DomainService:
@@ -73,7 +77,7 @@ class DomainService:
         
         # Create application
         application = Application(
-            application_id=uuid4(),
+            application_id=new_id(),
             tenant_id=tenant_id,
             template_id=template.template_id,
             template_version=template.version,
@@ -86,7 +90,7 @@ class DomainService:
         
         self._app_repo.create(application)
         
-        print(f"[domain_service] created application {application.application_id} from template {template_id}")
+        logger.info("[domain_service] created application %s from template %s", application.application_id, template_id)
         
         return application
     
@@ -151,7 +155,7 @@ class DomainService:
         
         # Create deployment
         deployment = Deployment(
-            deployment_id=uuid4(),
+            deployment_id=new_id(),
             application_id=application.application_id,
             tenant_id=application.tenant_id,
             template_id=template.template_id,
@@ -168,7 +172,7 @@ class DomainService:
         application.status = ApplicationStatus.CREATING
         self._app_repo.update(application)
         
-        print(f"[domain_service] created deployment {deployment.deployment_id} for app {application_id}")
+        logger.info("[domain_service] created deployment %s for app %s", deployment.deployment_id, application_id)
         
         return deployment
     
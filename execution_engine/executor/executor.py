@@ -104,6 +104,17 @@ class Executor:
         if not slot:
             return
 
+        try:
+            self._claim_into_slot(slot)
+        except Exception:
+            # The slot is reserved until released; give it back unless an
+            # execution thread is now running in it
+            if slot.execution_id not in self._running:
+                slot.release()
+            raise
+
+    def _claim_into_slot(self, slot):
+        """Claim queued (else recoverable) work and run it in the reserved slot."""
         # Try to claim queued execution
         queued = self.repo.list_by_state(
             state=ExecutionState.QUEUED,
@@ -5,7 +5,7 @@ import time
 import logging
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 from execution_engine.core.models import Execution, ExecutionState
 from execution_engine.core.repository import ExecutionRepository
@@ -26,6 +26,19 @@ class RetryService:
     
     def __init__(self, repository: ExecutionRepository):
         self._repo = repository
+        # Earliest backoff deadline seen by the last find_retryable_executions()
+        self._next_retry_at: Optional[datetime] = None
+    
+    def seconds_until_next_retry(self) -> Optional[float]:
+        """
+        Time until the soonest retry still waiting out its backoff.
+        
+        Based on the last find_retryable_executions() call; None if no
+        retry was pending then.
+        """
+        if self._next_retry_at is None:
+            return None
+        return max((self._next_retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
     
     def find_retryable_executions(self, limit: int = 100) -> List[Execution]:
         """
@@ -51,6 +64,7 @@ class RetryService:
         
         retryable = []
         now = datetime.now(timezone.utc)
+        self._next_retry_at = None
         
         for execution in failed:
             # Check if can retry
@@ -66,10 +80,16 @@ class RetryService:
             
             # Check if retry delay has elapsed
             if execution.finished_at:
+                finished_at = execution.finished_at
+                if finished_at.tzinfo is None:
+                    # Stored as naive UTC
+                    finished_at = finished_at.replace(tzinfo=timezone.utc)
                 delay = execution.calculate_retry_delay()
-                retry_time = execution.finished_at + timedelta(seconds=delay)
+                retry_time = finished_at + timedelta(seconds=delay)
                 
                 if now < retry_time:
+                    if self._next_retry_at is None or retry_time < self._next_retry_at:
+                        self._next_retry_at = retry_time
                     remaining = (retry_time - now).total_seconds()
                     logger.debug(
                         f"[retry] {execution.execution_id} - retry in {int(remaining)}s"
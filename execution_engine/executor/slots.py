@@ -2,16 +2,23 @@
 
 """Slot manager for controlling executor concurrency."""
 
-from typing import Optional
+from collections import deque
+from typing import Callable, Optional
 from uuid import UUID
 
 
 class Slot:
     """Represents a single execution slot."""
     
-    def __init__(self, slot_id: int):
+    def __init__(self, slot_id: int, on_release: Optional[Callable[[int], None]] = None):
         self.slot_id = slot_id
         self.execution_id: Optional[UUID] = None
+        
+        # Hand-out token: holds one entry while the slot is checked out of
+        # its manager. list.append/pop are atomic under the GIL, so only one
+        # of several concurrent release() calls can return the slot.
+        self._on_release = on_release
+        self._checked_out: list = []
     
     def is_free(self) -> bool:
         """Check if slot is available."""
@@ -24,8 +31,22 @@ class Slot:
         self.execution_id = execution_id
     
     def release(self) -> None:
-        """Release slot."""
+        """Release slot (and return it to its manager's free list)."""
         self.execution_id = None
+        
+        if self._on_release is None:
+            return
+        
+        try:
+            self._checked_out.pop()
+        except IndexError:
+            return  # Already returned
+        
+        self._on_release(self.slot_id)
+    
+    def _check_out(self) -> None:
+        """Mark slot as handed out by its manager."""
+        self._checked_out.append(True)
     
     def __repr__(self) -> str:
         status = "free" if self.is_free() else f"occupied({self.execution_id})"
@@ -33,20 +54,35 @@ class Slot:
 
 
 class SlotManager:
-    """Manages execution slots for an executor."""
+    """
+    Manages execution slots for an executor.
+    
+    Free slot IDs are kept in a LIFO stack (deque). deque.append/pop are
+    atomic under the GIL, so acquire/release are O(1) and need no lock.
+    LIFO order hands the most recently released slot out first.
+    """
     
     def __init__(self, max_slots: int):
         if max_slots < 1:
             raise ValueError("max_slots must be at least 1")
         
-        self._slots = [Slot(i) for i in range(max_slots)]
+        self._free: deque = deque(reversed(range(max_slots)))
+        self._slots = [Slot(i, on_release=self._free.append) for i in range(max_slots)]
     
     def acquire_free_slot(self) -> Optional[Slot]:
-        """Get a free slot if available."""
-        for slot in self._slots:
-            if slot.is_free():
-                return slot
-        return None
+        """
+        Take a free slot off the stack if available.
+        
+        The slot stays reserved for the caller until slot.release().
+        """
+        try:
+            slot_id = self._free.pop()
+        except IndexError:
+            return None
+        
+        slot = self._slots[slot_id]
+        slot._check_out()
+        return slot
     
     def active_slots(self) -> list[Slot]:
         """Get all occupied slots."""
@@ -65,7 +101,7 @@ class SlotManager:
     
     def free_slots(self) -> int:
         """Get number of free slots."""
-        return sum(1 for s in self._slots if s.is_free())
+        return len(self._free)
     
     def __repr__(self) -> str:
         return (
@@ -9,14 +9,22 @@ import time
 import logging
 import signal
 import sys
+import errno
 import requests
+import selectors
 import socket
+import threading
 from datetime import datetime, timezone
+from http.cookiejar import DefaultCookiePolicy
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
+from psycopg2.extras import execute_values
+from requests.adapters import HTTPAdapter
+
 from execution_engine.domain.models import HealthStatus, ResourceType
 from execution_engine.infrastructure.postgres.database import engine
+from execution_engine.infrastructure.postgres.notify import NotificationListener
 from sqlalchemy import text
 
 # Setup logging
@@ -26,6 +34,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# NOTIFY channel raised when deployed_resources rows are added or change status
+HEALTH_DIRTY_CHANNEL = "health_dirty"
+
+# Upper bound for the idle back-off between empty check cycles (seconds)
+MAX_IDLE_INTERVAL = 60
+
+# How long the cached node_id -> runtime_agent_url map stays fresh (seconds)
+NODE_URL_CACHE_TTL = 300
+
+
+def _build_port_map(ports: Dict[Any, Any]) -> Dict[tuple, int]:
+    """
+    Normalize container port mappings.
+    
+    Accepts keys like "80/tcp", "80" or 80 and returns
+    {(80, "tcp"): host_port}.
+    
+    Args:
+        ports: Port mappings from deployment result
+        
+    Returns:
+        Dict of (container_port, protocol) -> host_port
+    """
+    port_map = {}
+    
+    for key, host_port in ports.items():
+        port, _, proto = str(key).partition('/')
+        try:
+            port_map[(int(port), proto or 'tcp')] = int(host_port)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed port mapping {key!r}: {host_port!r}")
+    
+    return port_map
+
 
 class HealthChecker:
     """
@@ -33,9 +75,9 @@ class HealthChecker:
     
     Architecture:
     - Runs as separate process (not thread)
-    - Checks every 10 seconds
+    - Checks every 10 seconds, or immediately on NOTIFY health_dirty
     - Marks UNHEALTHY after 3 consecutive failures
-    - Auto-restarts after 60 second delay
+    - Auto-restarts after 60 second delay (scheduled, does not block checks)
     """
     
     def __init__(
@@ -56,6 +98,31 @@ class HealthChecker:
         self.failure_threshold = failure_threshold
         self.restart_delay = restart_delay
         self._stop_requested = False
+        self._consecutive_empty_cycles = 0
+        
+        # Delayed restarts in flight: {resource_id: timer}
+        self._pending_restarts: Dict[UUID, threading.Timer] = {}
+        
+        # Health status rows buffered during a cycle:
+        # (resource_id, status, failures, checked_at)
+        self._pending_health_updates: List[tuple] = []
+        
+        # Runtime agent URLs by node: {node_id: runtime_agent_url}
+        self._node_urls: Dict[UUID, str] = {}
+        self._node_urls_loaded_at: Optional[float] = None
+        
+        # Wakes the loop early when deployed resources change
+        self._listener = NotificationListener([HEALTH_DIRTY_CHANNEL])
+        
+        # HTTP session for the check loop: keep-alive connections are reused
+        # across probes. Probes hit many tenants' containers, so no cookies
+        # are stored or sent. Restart timers run on other threads and do
+        # not use it.
+        self._session = requests.Session()
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=128, pool_maxsize=128, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
         
         logger.info("Health Checker initialized")
         logger.info(f"Check interval: {check_interval}s")
@@ -78,49 +145,93 @@ class HealthChecker:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
+        # LISTEN before the first cycle, so resources changing during it
+        # are not left to the idle back-off
+        self._listener.listen()
+        
         # Main loop
         while not self._stop_requested:
             try:
-                self._check_cycle()
+                checked = self._check_cycle()
             except Exception as e:
                 logger.error(f"Error in check cycle: {e}", exc_info=True)
+                checked = None
+            
+            # Back off while there is nothing to check (NOTIFY still wakes us)
+            if checked == 0:
+                self._consecutive_empty_cycles = min(self._consecutive_empty_cycles + 1, 16)
+            else:
+                self._consecutive_empty_cycles = 0
             
-            # Wait before next cycle
+            # Wait for next cycle (or until deployed resources change)
             if not self._stop_requested:
-                time.sleep(self.check_interval)
+                if self._listener.wait(self._next_wait_interval()):
+                    logger.debug("Woken by deployed resource change")
+        
+        self._listener.close()
         
+        for timer in list(self._pending_restarts.values()):
+            timer.cancel()
+        
+        self._session.close()
         logger.info("Health Checker stopped")
     
+    def _next_wait_interval(self) -> float:
+        """
+        Get wait time before the next cycle.
+        
+        Doubles check_interval for each consecutive empty cycle,
+        capped at MAX_IDLE_INTERVAL.
+        """
+        if not self._consecutive_empty_cycles:
+            return self.check_interval
+        
+        return min(
+            self.check_interval * 2 ** self._consecutive_empty_cycles,
+            max(self.check_interval, MAX_IDLE_INTERVAL)
+        )
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         logger.info(f"Received signal {signum}, stopping...")
         self._stop_requested = True
     
-    def _check_cycle(self):
+    def _check_cycle(self) -> int:
         """
         Single health check cycle.
         
         1. Find all deployed containers
         2. For each container, perform health check
-        3. Update health status
+        3. Update health status (one batched write per cycle)
         4. Restart if unhealthy
+        
+        Returns:
+            Number of containers checked
         """
         # Find containers to check
         containers = self._find_containers_to_check()
         
         if not containers:
             logger.debug("No containers to check")
-            return
+            return 0
         
         logger.info(f"Checking health of {len(containers)} container(s)")
         
-        for container in containers:
-            try:
-                self._check_container_health(container)
-            except Exception as e:
-                logger.error(
-                    f"Error checking container {container['resource_id']}: {e}"
-                )
+        # Probe all TCP health checks together in one selector pass
+        tcp_results = self._check_tcp_batch(containers)
+        
+        try:
+            for container in containers:
+                try:
+                    self._check_container_health(container, tcp_results)
+                except Exception as e:
+                    logger.error(
+                        f"Error checking container {container['resource_id']}: {e}"
+                    )
+        finally:
+            self._flush_health_updates()
+        
+        return len(containers)
     
     def _find_containers_to_check(self) -> List[Dict[str, Any]]:
         """
@@ -132,53 +243,96 @@ class HealthChecker:
         with engine.connect() as conn:
             result = conn.execute(text("""
                 SELECT 
-                    dr.resource_id,
-                    dr.deployment_id,
-                    dr.external_id,
-                    dr.name,
-                    dr.spec,
-                    dr.node_id,
-                    dr.health_status,
-                    dr.consecutive_health_failures,
-                    dr.last_health_check_at,
-                    n.runtime_agent_url
-                FROM deployed_resources dr
-                JOIN infrastructure_nodes n ON dr.node_id = n.node_id
-                WHERE dr.resource_type = 'CONTAINER'
-                AND dr.status = 'running'
-                AND dr.external_id != 'pending'  -- ✅ ADD: Exclude pending
-                ORDER BY dr.last_health_check_at ASC NULLS FIRST
+                    resource_id,
+                    deployment_id,
+                    external_id,
+                    name,
+                    spec,
+                    node_id,
+                    health_status,
+                    consecutive_health_failures,
+                    last_health_check_at
+                FROM deployed_resources
+                WHERE resource_type = 'CONTAINER'
+                AND status = 'running'
+                AND external_id != 'pending'  -- ✅ ADD: Exclude pending
             """))
+            rows = result.fetchall()
+        
+        self._ensure_node_urls({row[5] for row in rows if row[5] is not None})
+        
+        containers = []
+        for row in rows:
+            # Skip rows whose node is gone (the old JOIN dropped them too)
+            runtime_agent_url = self._node_urls.get(row[5])
+            if runtime_agent_url is None:
+                continue
             
-            containers = []
-            for row in result:
-                # ✅ FIX: Parse spec if it's a string
-                spec = row[4]
-                if isinstance(spec, str):
-                    import json
-                    spec = json.loads(spec)
-                
-                containers.append({
-                    'resource_id': row[0],
-                    'deployment_id': row[1],
-                    'external_id': row[2],
-                    'name': row[3],
-                    'spec': spec,
-                    'node_id': row[5],
-                    'health_status': row[6],
-                    'consecutive_failures': row[7],
-                    'last_check_at': row[8],
-                    'runtime_agent_url': row[9],
-                })
+            # ✅ FIX: Parse spec if it's a string
+            spec = row[4]
+            if isinstance(spec, str):
+                import json
+                spec = json.loads(spec)
             
-            return containers
+            containers.append({
+                'resource_id': row[0],
+                'deployment_id': row[1],
+                'external_id': row[2],
+                'name': row[3],
+                'spec': spec,
+                'node_id': row[5],
+                'health_status': row[6],
+                'consecutive_failures': row[7],
+                'last_check_at': row[8],
+                'runtime_agent_url': runtime_agent_url,
+                'port_map': _build_port_map(
+                    (spec.get('deployment_result') or {}).get('ports') or {}
+                ),
+            })
+        
+        return containers
+    
+    def _ensure_node_urls(self, node_ids: set):
+        """
+        Make sure the runtime agent URL cache covers the given nodes.
+        
+        The cache is reloaded (at most once per call) when it is older
+        than NODE_URL_CACHE_TTL or a node is missing (e.g. newly registered).
+        
+        Args:
+            node_ids: Nodes referenced by this cycle's containers
+        """
+        stale = (
+            self._node_urls_loaded_at is None
+            or time.monotonic() - self._node_urls_loaded_at > NODE_URL_CACHE_TTL
+        )
+        
+        if stale or not node_ids <= self._node_urls.keys():
+            self._refresh_node_urls()
+    
+    def _refresh_node_urls(self):
+        """Reload the node_id -> runtime_agent_url map."""
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT node_id, runtime_agent_url
+                FROM infrastructure_nodes
+            """))
+            self._node_urls = {row[0]: row[1] for row in result}
+        
+        self._node_urls_loaded_at = time.monotonic()
+        logger.debug(f"Loaded runtime agent URLs for {len(self._node_urls)} node(s)")
     
-    def _check_container_health(self, container: Dict[str, Any]):
+    def _check_container_health(
+        self,
+        container: Dict[str, Any],
+        tcp_results: Optional[Dict[UUID, bool]] = None
+    ):
         """
         Check health of a single container.
         
         Args:
             container: Container record
+            tcp_results: Pre-computed TCP probe results by resource_id
         """
         resource_id = container['resource_id']
         container_id = container['external_id']
@@ -205,7 +359,10 @@ class HealthChecker:
             if check_type == 'http':
                 is_healthy = self._check_http_health(container, health_check)
             elif check_type == 'tcp':
-                is_healthy = self._check_tcp_health(container, health_check)
+                if tcp_results is not None and resource_id in tcp_results:
+                    is_healthy = tcp_results[resource_id]
+                else:
+                    is_healthy = self._check_tcp_health(container, health_check)
             elif check_type == 'command':
                 is_healthy = self._check_command_health(container, health_check)
             else:
@@ -249,31 +406,16 @@ class HealthChecker:
         Returns:
             True if healthy, False otherwise
         """
-        # ✅ FIX: Get deployment result correctly
-        spec = container['spec']
-        deployment_result = spec.get('deployment_result', {})
-        
-        # ✅ FIX: Port mapping structure is different
-        # deployment_result has: {"ports": {"80/tcp": 8080}}
-        ports = deployment_result.get('ports', {})
-        
         # Get the port from health check config
         internal_port = health_check.get('port', 80)
+        host_port = container['port_map'].get((int(internal_port), 'tcp'))
         
-        # ✅ FIX: Try different port key formats
-        port_key = f"{internal_port}/tcp"
-        
-        if port_key in ports:
-            host_port = ports[port_key]
-        else:
-            # Try as integer key
-            if internal_port in ports:
-                host_port = ports[internal_port]
-            else:
-                logger.warning(
-                    f"[{container['resource_id']}] Port {internal_port} not found in mappings: {ports}"
-                )
-                return False
+        if host_port is None:
+            logger.warning(
+                f"[{container['resource_id']}] Port {internal_port} not found in mappings: "
+                f"{container['port_map']}"
+            )
+            return False
         
         path = health_check.get('path', '/')
         
@@ -283,7 +425,7 @@ class HealthChecker:
         timeout = health_check.get('timeout_seconds', 5)
         
         try:
-            response = requests.get(url, timeout=timeout)
+            response = self._session.get(url, timeout=timeout)
             is_healthy = 200 <= response.status_code < 400
             
             if is_healthy:
@@ -315,44 +457,117 @@ class HealthChecker:
         Returns:
             True if healthy, False otherwise
         """
-        # Get port mapping
-        deployment_result = container['spec'].get('deployment_result', {})
-        ports = deployment_result.get('ports', {})
-        
-        internal_port = health_check.get('port', 80)
-        port_key = f"{internal_port}/tcp"
+        results = self._check_tcp_batch([container])
+        return results.get(container['resource_id'], False)
+    
+    def _check_tcp_batch(self, containers: List[Dict[str, Any]]) -> Dict[UUID, bool]:
+        """
+        Perform TCP health checks for many containers in one pass.
         
-        if port_key not in ports:
-            logger.warning(f"Port {internal_port} not found in port mappings")
-            return False
+        All connects are started non-blocking and multiplexed through a
+        single selector, so the probe phase takes roughly the slowest
+        handshake instead of the sum of all of them.
         
-        host_port = ports[port_key]
-        timeout = health_check.get('timeout_seconds', 5)
+        Args:
+            containers: Container records (non-TCP checks are ignored)
+            
+        Returns:
+            Dict of resource_id -> True if healthy, False otherwise
+        """
+        results: Dict[UUID, bool] = {}
+        pending: Dict[socket.socket, tuple] = {}
+        selector = selectors.DefaultSelector()
+        now = time.monotonic()
         
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            result = sock.connect_ex(('localhost', host_port))
-            sock.close()
-            
-            is_healthy = result == 0
-            
-            if is_healthy:
-                logger.debug(
-                    f"[{container['resource_id']}] TCP check OK: "
-                    f"localhost:{host_port}"
-                )
-            else:
-                logger.warning(
-                    f"[{container['resource_id']}] TCP check FAIL: "
-                    f"localhost:{host_port}"
-                )
-            
-            return is_healthy
+            for container in containers:
+                health_check = container['spec'].get('health_check')
+                if not health_check or health_check.get('type', 'http') != 'tcp':
+                    continue
+                
+                resource_id = container['resource_id']
+                
+                # Get port mapping; a bad port fails this container only
+                internal_port = health_check.get('port', 80)
+                try:
+                    host_port = container['port_map'].get((int(internal_port), 'tcp'))
+                except (TypeError, ValueError):
+                    logger.warning(f"[{resource_id}] Invalid health check port: {internal_port!r}")
+                    results[resource_id] = False
+                    continue
+                
+                if host_port is None:
+                    logger.warning(f"Port {internal_port} not found in port mappings")
+                    results[resource_id] = False
+                    continue
+                
+                deadline = now + health_check.get('timeout_seconds', 5)
+                
+                sock = None
+                try:
+                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                    sock.setblocking(False)
+                    result = sock.connect_ex(('localhost', host_port))
+                except Exception as e:
+                    logger.warning(f"[{resource_id}] TCP check error: {e}")
+                    if sock is not None:
+                        sock.close()
+                    results[resource_id] = False
+                    continue
+                
+                if result in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    selector.register(sock, selectors.EVENT_WRITE)
+                    pending[sock] = (container, host_port, deadline)
+                else:
+                    sock.close()
+                    self._record_tcp_result(results, container, host_port, result == 0)
             
-        except Exception as e:
-            logger.warning(f"[{container['resource_id']}] TCP check error: {e}")
-            return False
+            # Collect completions until every probe finished or timed out
+            while pending:
+                timeout = max(0.0, min(d for _, _, d in pending.values()) - time.monotonic())
+                
+                for key, _ in selector.select(timeout):
+                    sock = key.fileobj
+                    container, host_port, _ = pending.pop(sock)
+                    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    selector.unregister(sock)
+                    sock.close()
+                    self._record_tcp_result(results, container, host_port, error == 0)
+                
+                now = time.monotonic()
+                for sock, (container, host_port, deadline) in list(pending.items()):
+                    if deadline <= now:
+                        del pending[sock]
+                        selector.unregister(sock)
+                        sock.close()
+                        self._record_tcp_result(results, container, host_port, False)
+        finally:
+            for sock in pending:
+                sock.close()
+            selector.close()
+        
+        return results
+    
+    def _record_tcp_result(
+        self,
+        results: Dict[UUID, bool],
+        container: Dict[str, Any],
+        host_port: int,
+        is_healthy: bool
+    ) -> None:
+        """Store and log a single TCP probe outcome."""
+        results[container['resource_id']] = is_healthy
+        
+        if is_healthy:
+            logger.debug(
+                f"[{container['resource_id']}] TCP check OK: "
+                f"localhost:{host_port}"
+            )
+        else:
+            logger.warning(
+                f"[{container['resource_id']}] TCP check FAIL: "
+                f"localhost:{host_port}"
+            )
     
     def _check_command_health(
         self,
@@ -380,7 +595,7 @@ class HealthChecker:
         
         try:
             # Call Runtime Agent to exec command
-            response = requests.post(
+            response = self._session.post(
                 f"{runtime_agent_url}/containers/{container_id}/exec",
                 json={"command": command},
                 timeout=health_check.get('timeout_seconds', 5)
@@ -421,7 +636,7 @@ class HealthChecker:
         current_failures: int
     ):
         """
-        Update container health status in database.
+        Compute new health status and buffer it for the end-of-cycle write.
         
         Args:
             resource_id: Resource ID
@@ -447,23 +662,43 @@ class HealthChecker:
             else:
                 new_status = HealthStatus.HEALTHY  # Still healthy, but tracking failures
         
-        with engine.connect() as conn:
-            conn.execute(
-                text("""
-                    UPDATE deployed_resources
-                    SET health_status = :status,
-                        consecutive_health_failures = :failures,
-                        last_health_check_at = :checked_at
-                    WHERE resource_id = :resource_id
-                """),
-                {
-                    'status': new_status.value,
-                    'failures': new_failures,
-                    'checked_at': now,
-                    'resource_id': resource_id
-                }
+        self._pending_health_updates.append(
+            (str(resource_id), new_status.value, new_failures, now)
+        )
+    
+    def _flush_health_updates(self):
+        """
+        Write all buffered health status rows in a single UPDATE ... FROM VALUES.
+        """
+        rows = self._pending_health_updates
+        if not rows:
+            return
+        
+        self._pending_health_updates = []
+        
+        raw_conn = engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            execute_values(
+                cursor,
+                """
+                    UPDATE deployed_resources AS dr
+                    SET health_status = v.status,
+                        consecutive_health_failures = v.failures,
+                        last_health_check_at = v.checked_at
+                    FROM (VALUES %s) AS v(resource_id, status, failures, checked_at)
+                    WHERE dr.resource_id = v.resource_id::uuid
+                """,
+                rows,
+                template="(%s, %s, %s, %s)"
             )
-            conn.commit()
+            cursor.close()
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
     
     def _handle_unhealthy_container(self, container: Dict[str, Any]):
         """
@@ -477,16 +712,36 @@ class HealthChecker:
         
         # Only restart if we just crossed threshold
         if failures + 1 == self.failure_threshold:
+            if resource_id in self._pending_restarts:
+                logger.debug(f"[{resource_id}] Restart already scheduled")
+                return
+            
             logger.warning(
                 f"[{resource_id}] Container unhealthy, scheduling restart "
                 f"in {self.restart_delay}s"
             )
             
-            # Wait before restarting (avoid restart loops)
-            time.sleep(self.restart_delay)
-            
-            # Restart container via Runtime Agent
+            # Delay restart (avoid restart loops) without blocking the check loop
+            timer = threading.Timer(
+                self.restart_delay,
+                self._run_scheduled_restart,
+                args=(container,)
+            )
+            timer.daemon = True
+            self._pending_restarts[resource_id] = timer
+            timer.start()
+    
+    def _run_scheduled_restart(self, container: Dict[str, Any]):
+        """
+        Timer callback - restart container and clear its pending entry.
+        
+        Args:
+            container: Container record
+        """
+        try:
             self._restart_container(container)
+        finally:
+            self._pending_restarts.pop(container['resource_id'], None)
     
     def _restart_container(self, container: Dict[str, Any]):
         """
@@ -502,7 +757,7 @@ class HealthChecker:
         logger.info(f"[{resource_id}] Restarting container {container_id}")
         
         try:
-            # Call Runtime Agent to restart
+            # Call Runtime Agent to restart (timer thread: not the loop's session)
             response = requests.post(
                 f"{runtime_agent_url}/containers/{container_id}/restart",
                 timeout=30
@@ -1,5 +1,8 @@
 #execution_engine\infrastructure\postgres\config.py
 
+from functools import cached_property
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -20,8 +23,14 @@ class DatabaseSettings(BaseSettings):
     postgres_port: int
     postgres_db: str
 
+    # PgBouncer in transaction-pool mode (optional). When set, the app
+    # connects through it; LISTEN/NOTIFY and migrations go direct.
+    pgbouncer_host: Optional[str] = None
+    pgbouncer_port: int = 6432
+
     # Connection pool
     pool_size: int = 10
+    pool_min_size: int = 4  # Opened at service start (see warm_pool)
     max_overflow: int = 20
     pool_timeout: int = 30
     pool_recycle: int = 3600
@@ -30,13 +39,27 @@ class DatabaseSettings(BaseSettings):
     echo_sql: bool = False
 
     @property
-    def database_url(self) -> str:
+    def use_pgbouncer(self) -> bool:
+        return self.pgbouncer_host is not None
+
+    @cached_property
+    def direct_database_url(self) -> str:
+        """URL of PostgreSQL itself, bypassing PgBouncer."""
         return (
             f"postgresql://{self.postgres_user}:{self.postgres_password}"
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
-    @property
+    @cached_property
+    def database_url(self) -> str:
+        if not self.use_pgbouncer:
+            return self.direct_database_url
+        return (
+            f"postgresql://{self.postgres_user}:{self.postgres_password}"
+            f"@{self.pgbouncer_host}:{self.pgbouncer_port}/{self.postgres_db}"
+        )
+
+    @cached_property
     def async_database_url(self) -> str:
         return (
             f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
@@ -0,0 +1,45 @@
+#execution_engine\infrastructure\postgres\converters.py
+
+"""Generated ORM <-> domain converters."""
+
+from dataclasses import fields
+from typing import Callable
+
+
+def build_to_domain(domain_cls: type, name: str) -> Callable:
+    """
+    Generate a function building domain_cls from an ORM object.
+
+    Every dataclass field is read from the ORM attribute of the same name
+    and passed positionally, so the generated body is one straight run of
+    attribute loads - no per-call keyword dict or getattr() lookups.
+
+    Args:
+        domain_cls: Dataclass to build; its field names must be ORM attributes
+        name: Name of the generated function (shows up in tracebacks)
+    """
+    args = ", ".join(f"orm.{f.name}" for f in fields(domain_cls))
+    source = f"def {name}(orm):\n    return cls({args})\n"
+    return _compile(source, name, domain_cls, domain_cls)
+
+
+def build_to_orm(domain_cls: type, orm_cls: type, name: str) -> Callable:
+    """
+    Generate a function building an orm_cls instance from a domain object.
+
+    Args:
+        domain_cls: Source dataclass; its field names must be ORM attributes
+        orm_cls: ORM class to instantiate
+        name: Name of the generated function (shows up in tracebacks)
+    """
+    args = ", ".join(f"{f.name}=obj.{f.name}" for f in fields(domain_cls))
+    source = f"def {name}(obj):\n    return cls({args})\n"
+    return _compile(source, name, orm_cls, domain_cls)
+
+
+def _compile(source: str, name: str, cls: type, domain_cls: type) -> Callable:
+    namespace = {"cls": cls}
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    func = namespace[name]
+    func.__doc__ = f"Generated converter for {domain_cls.__name__}."
+    return func
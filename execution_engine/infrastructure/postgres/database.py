@@ -2,12 +2,14 @@
 
 """SQLAlchemy database setup and session management."""
 
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Generator, Optional
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker, Session
 from sqlalchemy.pool import NullPool, QueuePool
 
 from execution_engine.infrastructure.postgres.config import settings
@@ -27,31 +29,34 @@ def create_db_engine(database_url: Optional[str] = None) -> Engine:
     
     url = database_url or settings.database_url
     
-    engine = create_engine(
+    # PgBouncer hands each transaction whichever backend is free, so
+    # per-connection setup would not stick
+    via_pgbouncer = database_url is None and settings.use_pgbouncer
+    
+    # Default schema travels in the startup packet - no SET round trip.
+    # Behind PgBouncer it comes from the server default instead.
+    connect_args = {} if via_pgbouncer else {"options": "-c search_path=public"}
+    
+    return create_engine(
         url,
         echo=settings.echo_sql,
-        pool_pre_ping=True,  # Verify connections before using
+        # Verify connections before using - also behind PgBouncer, whose
+        # restarts and idle timeouts close the client-side socket
+        pool_pre_ping=True,
         pool_size=settings.pool_size,
         max_overflow=settings.max_overflow,
         pool_timeout=settings.pool_timeout,
         pool_recycle=settings.pool_recycle,
+        connect_args=connect_args,
     )
-    
-    # Set PostgreSQL-specific settings
-    @event.listens_for(engine, "connect")
-    def set_search_path(dbapi_conn, connection_record):
-        """Set default schema on connect."""
-        cursor = dbapi_conn.cursor()
-        cursor.execute("SET search_path TO public")
-        cursor.close()
-    
-    return engine
 
 
 # Global engine instance (for production use)
 engine = create_db_engine()
 
-# Session factory (for production use)
+# Session factory (for production use). Repository calls commit right away,
+# so autoflush would only add identity-map walks before each query, and
+# expiring on commit would cost a SELECT on the next attribute access.
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -60,6 +65,140 @@ SessionLocal = sessionmaker(
 )
 
 
+def warm_pool(engine_instance: Optional[Engine] = None, size: Optional[int] = None) -> None:
+    """
+    Open pooled connections ahead of the first requests.
+    
+    QueuePool connects lazily, so without this the first requests after
+    start-up each pay the TCP/auth handshake. Connections are checked out
+    together (forcing distinct ones) and returned to the pool.
+    
+    Args:
+        engine_instance: Engine whose pool to fill (defaults to the global engine)
+        size: Connections to open (defaults to settings.pool_min_size,
+            capped at the pool size)
+    """
+    if engine_instance is None:
+        engine_instance = engine
+    if size is None:
+        size = min(settings.pool_min_size, settings.pool_size)
+    
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(engine_instance.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+# ============================================
+# Request-scoped sessions
+# ============================================
+# Set for the duration of an API request; None in background threads
+_request_scope: ContextVar[Optional[object]] = ContextVar("db_request_scope", default=None)
+
+# Session of the enclosing shared_transaction() block, if any
+_shared_session: ContextVar[Optional[Session]] = ContextVar("db_shared_session", default=None)
+
+
+def _session_scope_key():
+    """Key sessions by the active request, or by thread outside a request."""
+    scope = _request_scope.get()
+    if scope is not None:
+        return scope
+    return threading.get_ident()
+
+
+# Repository calls within one request share a session (and its connection).
+# The identity map holds clean objects weakly, so rows a repository has
+# already converted to domain objects are freed before the request ends.
+ScopedSession = scoped_session(SessionLocal, scopefunc=_session_scope_key)
+
+
+@contextmanager
+def request_session_scope() -> Generator[None, None, None]:
+    """
+    Share one ScopedSession across everything run inside the block.
+    
+    Used by the API middleware around each request; the session is
+    closed and discarded when the block exits.
+    """
+    token = _request_scope.set(object())
+    try:
+        yield
+    finally:
+        ScopedSession.remove()
+        _request_scope.reset(token)
+
+
+@contextmanager
+def shared_transaction(engine_instance: Optional[Engine] = None) -> Generator[None, None, None]:
+    """
+    Run the repository calls inside the block as one database transaction.
+    
+    For the block, ScopedSession hands out a session joined to an outer
+    transaction on a single connection ("rollback_only"): a repository's
+    commit() only flushes, its rollback() aborts the whole block, and the
+    block commits once on exit. Nested blocks join the outer one.
+    
+    Usage:
+        with shared_transaction():
+            resource_repo.create_many(resources)
+            execution_repo.create_many(executions)
+    """
+    if _shared_session.get() is not None:
+        yield
+        return
+    
+    if engine_instance is None:
+        engine_instance = engine
+    
+    previous = ScopedSession.registry() if ScopedSession.registry.has() else None
+    connection = engine_instance.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        expire_on_commit=False,
+        join_transaction_mode="rollback_only",
+    )
+    ScopedSession.registry.set(session)
+    token = _shared_session.set(session)
+    try:
+        yield
+        # Raises if a repository already rolled the transaction back
+        transaction.commit()
+    except BaseException:
+        if transaction.is_active:
+            transaction.rollback()
+        raise
+    finally:
+        _shared_session.reset(token)
+        session.close()
+        connection.close()
+        if previous is not None:
+            ScopedSession.registry.set(previous)
+        else:
+            ScopedSession.registry.clear()
+
+
+def release_session(session: Session) -> None:
+    """
+    Release a session obtained by a repository method.
+    
+    The request's scoped session is left open so later repository calls
+    reuse it; request_session_scope() closes it, and shared_transaction()
+    closes its own. Outside those the thread's scoped session is removed,
+    and any other session is closed.
+    """
+    if ScopedSession.registry.has() and ScopedSession.registry() is session:
+        if _request_scope.get() is None and _shared_session.get() is None:
+            ScopedSession.remove()
+        return
+    session.close()
+
+
 # ============================================
 # Session factory function
 # ============================================
@@ -116,15 +255,39 @@ def get_session() -> Session:
 # ============================================
 # Database initialization
 # ============================================
+# Databases already initialized in this process (keyed by URL)
+_initialized_engines: set[str] = set()
+
+
 def init_db(engine_instance: Optional[Engine] = None) -> None:
-    """Create all tables (for testing only - use Alembic in production)."""
+    """
+    Create all tables (for testing only - use Alembic in production).
+    
+    Repeat calls for the same database are no-ops, skipping create_all's
+    catalog introspection. Use force_init_db() to re-check the schema.
+    """
+    if engine_instance is None:
+        engine_instance = engine
+    if _engine_key(engine_instance) in _initialized_engines:
+        return
+    force_init_db(engine_instance)
+
+
+def force_init_db(engine_instance: Optional[Engine] = None) -> None:
+    """Create any missing tables, even if init_db() already ran."""
     if engine_instance is None:
         engine_instance = engine
     Base.metadata.create_all(bind=engine_instance)
+    _initialized_engines.add(_engine_key(engine_instance))
 
 
 def drop_db(engine_instance: Optional[Engine] = None) -> None:
     """Drop all tables (for testing only)."""
     if engine_instance is None:
         engine_instance = engine
-    Base.metadata.drop_all(bind=engine_instance)
\ No newline at end of file
+    Base.metadata.drop_all(bind=engine_instance)
+    _initialized_engines.discard(_engine_key(engine_instance))
+
+
+def _engine_key(engine_instance: Engine) -> str:
+    return engine_instance.url.render_as_string(hide_password=False)
\ No newline at end of file
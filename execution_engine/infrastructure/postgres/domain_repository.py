@@ -2,17 +2,23 @@
 
 """Domain repository implementations."""
 
-from typing import List, Optional
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import inspect, insert, lambda_stmt, select, update
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from execution_engine.domain.models import (
     Application, ApplicationTemplate, Deployment, DeploymentStepExecution,
-    DeployedResource, Domain, ProvisionedDatabase
+    DeployedResource, Domain, ProvisionedDatabase, DeploymentStepDefinition,
+    TemplateInputField, ResourceLimits, HealthCheckDefinition
 )
-from execution_engine.infrastructure.postgres.database import SessionLocal
+from execution_engine.infrastructure.postgres.database import ScopedSession, release_session
 from execution_engine.infrastructure.postgres.models import (
     ApplicationORM, ApplicationTemplateORM, DeploymentORM,
     DeploymentStepExecutionORM, DeployedResourceORM, DomainORM,
@@ -20,6 +26,8 @@ from execution_engine.infrastructure.postgres.models import (
 )
 from execution_engine.core.errors import ExecutionConcurrencyError
 
+logger = logging.getLogger(__name__)
+
 
 # ============================================
 # MAPPING FUNCTIONS
@@ -82,6 +90,45 @@ def template_to_orm(template: ApplicationTemplate) -> ApplicationTemplateORM:
     )
 
 
+def orm_to_template(orm: ApplicationTemplateORM) -> ApplicationTemplate:
+    """Convert template ORM to domain model."""
+    return ApplicationTemplate(
+        template_id=orm.template_id,
+        name=orm.name,
+        description=orm.description,
+        version=orm.version,
+        category=orm.category,
+        icon_url=orm.icon_url,
+        deployment_steps=[
+            DeploymentStepDefinition(
+                step_id=step["step_id"],
+                step_name=step["step_name"],
+                step_type=step["step_type"],
+                order=step["order"],
+                depends_on=step.get("depends_on", []),
+                spec_template=step.get("spec_template", {}),
+                health_check=HealthCheckDefinition(**step["health_check"]) if step.get("health_check") else None,
+                timeout_seconds=step.get("timeout_seconds", 300),
+                retry_on_failure=step.get("retry_on_failure", True),
+                max_retries=step.get("max_retries", 3),
+                cleanup_on_failure=step.get("cleanup_on_failure", True),
+            )
+            # Sorted once here; the converted template is cached and reused
+            for step in sorted(orm.deployment_steps, key=lambda s: s["order"])
+        ],
+        database_required=orm.database_required,
+        database_type=orm.database_type,
+        required_inputs=[
+            TemplateInputField(**field)
+            for field in orm.required_inputs
+        ],
+        default_resources=ResourceLimits(**orm.default_resources) if orm.default_resources else None,
+        created_at=orm.created_at,
+        updated_at=orm.updated_at,
+        is_active=orm.is_active,
+    )
+
+
 def application_to_orm(app: Application) -> ApplicationORM:
     """Convert application domain model to ORM."""
     return ApplicationORM(
@@ -106,6 +153,31 @@ def application_to_orm(app: Application) -> ApplicationORM:
         created_at=app.created_at,
         updated_at=app.updated_at,
         deleted_at=app.deleted_at,
+        version=app.version,
+    )
+
+
+def orm_to_application(orm: ApplicationORM) -> Application:
+    """Convert application ORM to domain model."""
+    return Application(
+        application_id=orm.application_id,
+        tenant_id=orm.tenant_id,
+        template_id=orm.template_id,
+        template_version=orm.template_version,
+        name=orm.name,
+        description=orm.description,
+        user_inputs=orm.user_inputs,
+        current_deployment_id=orm.current_deployment_id,
+        status=orm.status,
+        health_status=orm.health_status,
+        domain=orm.domain,
+        public_url=orm.public_url,
+        ssl_enabled=orm.ssl_enabled,
+        resource_limits=ResourceLimits(**orm.resource_limits) if orm.resource_limits else None,
+        created_at=orm.created_at,
+        updated_at=orm.updated_at,
+        deleted_at=orm.deleted_at,
+        version=orm.version,
     )
 
 
@@ -128,10 +200,43 @@ def deployment_to_orm(deployment: Deployment) -> DeploymentORM:
         created_at=deployment.created_at,
         started_at=deployment.started_at,
         completed_at=deployment.completed_at,
-        metadata=deployment.metadata,
+        deployment_metadata=deployment.metadata,
+        version=deployment.version,
+    )
+
+
+def resource_to_orm(resource: DeployedResource) -> DeployedResourceORM:
+    """Convert deployed resource domain model to ORM."""
+    return DeployedResourceORM(
+        resource_id=resource.resource_id,
+        deployment_id=resource.deployment_id,
+        resource_type=resource.resource_type,
+        external_id=resource.external_id,
+        node_id=resource.node_id,
+        name=resource.name,
+        spec=resource.spec,
+        status=resource.status,
+        health_status=resource.health_status,
+        consecutive_health_failures=resource.consecutive_health_failures,
+        last_health_check_at=resource.last_health_check_at,
+        created_at=resource.created_at,
     )
 
 
+def _orm_to_row(orm) -> dict:
+    """
+    Column values set on a transient ORM object, for bulk INSERT.
+    
+    IDs and timestamps come from the domain objects (client-side), so
+    creates need no RETURNING or follow-up SELECT to fill them in.
+    """
+    return {
+        attr.key: orm.__dict__[attr.key]
+        for attr in inspect(orm).mapper.column_attrs
+        if attr.key in orm.__dict__
+    }
+
+
 # ============================================
 # TEMPLATE REPOSITORY
 # ============================================
@@ -139,100 +244,93 @@ def deployment_to_orm(deployment: Deployment) -> DeploymentORM:
 class ApplicationTemplateRepository:
     """Repository for application templates."""
     
-    def __init__(self, session_factory: Optional[sessionmaker] = None):
-        self._session_factory = session_factory or SessionLocal
+    # Converted templates kept per repository, least recently used evicted first
+    TEMPLATE_CACHE_SIZE = 512
+    
+    def __init__(self, session_factory: Optional[sessionmaker | scoped_session] = None):
+        self._session_factory = session_factory or ScopedSession
+        
+        # {(template_id, updated_at): ApplicationTemplate}
+        self._template_cache: OrderedDict[Tuple[str, datetime], ApplicationTemplate] = OrderedDict()
+        self._template_cache_lock = threading.Lock()
     
     def _get_session(self):
         return self._session_factory()
     
     def create(self, template: ApplicationTemplate) -> None:
         """Create a new template."""
+        self.create_many([template])
+    
+    def create_many(self, templates: List[ApplicationTemplate]) -> None:
+        """Create templates in a single INSERT statement."""
+        if not templates:
+            return
+        
         session = self._get_session()
         try:
-            orm = template_to_orm(template)
-            session.add(orm)
+            rows = [_orm_to_row(template_to_orm(t)) for t in templates]
+            session.execute(insert(ApplicationTemplateORM), rows)
             session.commit()
-            print(f"[template_repo] created template {template.template_id}")
+            logger.debug("[template_repo] created %s template(s)", len(templates))
         except IntegrityError as e:
             session.rollback()
-            raise ExecutionConcurrencyError(f"Template {template.template_id} already exists") from e
+            ids = ', '.join(t.template_id for t in templates)
+            raise ExecutionConcurrencyError(f"Template {ids} already exists") from e
         finally:
-            session.close()
+            release_session(session)
     
     def get(self, template_id: str) -> Optional[ApplicationTemplate]:
         """Get template by ID."""
         session = self._get_session()
         try:
+            # Cheap key lookup first; updated_at changes on every write
+            updated_at = session.execute(lambda_stmt(
+                lambda: select(ApplicationTemplateORM.updated_at)
+                .where(ApplicationTemplateORM.template_id == template_id)
+            )).scalar_one_or_none()
+            if updated_at is None:
+                return None
+            
+            key = (template_id, updated_at)
+            with self._template_cache_lock:
+                template = self._template_cache.get(key)
+                if template is not None:
+                    self._template_cache.move_to_end(key)
+                    return template
+            
             orm = session.get(ApplicationTemplateORM, template_id)
             if not orm:
                 return None
             
-            # Convert ORM to domain (simplified - you'd want proper conversion)
-            from execution_engine.domain.models import (
-                ApplicationTemplate, DeploymentStepDefinition,
-                TemplateInputField, ResourceLimits, HealthCheckDefinition
-            )
+            template = orm_to_template(orm)
+            with self._template_cache_lock:
+                self._template_cache[key] = template
+                self._template_cache.move_to_end(key)
+                while len(self._template_cache) > self.TEMPLATE_CACHE_SIZE:
+                    self._template_cache.popitem(last=False)
             
-            return ApplicationTemplate(
-                template_id=orm.template_id,
-                name=orm.name,
-                description=orm.description,
-                version=orm.version,
-                category=orm.category,
-                icon_url=orm.icon_url,
-                deployment_steps=[
-                    DeploymentStepDefinition(
-                        step_id=step["step_id"],
-                        step_name=step["step_name"],
-                        step_type=step["step_type"],
-                        order=step["order"],
-                        depends_on=step.get("depends_on", []),
-                        spec_template=step.get("spec_template", {}),
-                        health_check=HealthCheckDefinition(**step["health_check"]) if step.get("health_check") else None,
-                        timeout_seconds=step.get("timeout_seconds", 300),
-                        retry_on_failure=step.get("retry_on_failure", True),
-                        max_retries=step.get("max_retries", 3),
-                        cleanup_on_failure=step.get("cleanup_on_failure", True),
-                    )
-                    for step in orm.deployment_steps
-                ],
-                database_required=orm.database_required,
-                database_type=orm.database_type,
-                required_inputs=[
-                    TemplateInputField(**field)
-                    for field in orm.required_inputs
-                ],
-                default_resources=ResourceLimits(**orm.default_resources) if orm.default_resources else None,
-                created_at=orm.created_at,
-                updated_at=orm.updated_at,
-                is_active=orm.is_active,
-            )
+            return template
         finally:
-            session.close()
+            release_session(session)
     
     def list_active(self, category: Optional[str] = None) -> List[ApplicationTemplate]:
         """List active templates."""
         session = self._get_session()
         try:
-            query = session.query(ApplicationTemplateORM).filter(
+            # lambda_stmt: statement built and cache-keyed once per variant
+            stmt = lambda_stmt(lambda: select(ApplicationTemplateORM).where(
                 ApplicationTemplateORM.is_active == True
-            )
+            ))
             
             if category:
-                query = query.filter(ApplicationTemplateORM.category == category)
-            
-            orms = query.all()
+                stmt += lambda s: s.where(ApplicationTemplateORM.category == category)
             
-            # Convert each ORM to domain model
-            templates = []
-            for orm in orms:
-                template = self.get(orm.template_id)  # Reuse get() for conversion
-                if template:
-                    templates.append(template)
+            orms = session.execute(stmt).scalars().all()
             
-            return templates
+            # Convert in this session - no per-row get() round trip
+            return [orm_to_template(orm) for orm in orms]
         finally:
-            session.close()
+            release_session(session)
 
 
 # ============================================
@@ -242,25 +340,32 @@ class ApplicationTemplateRepository:
 class ApplicationRepository:
     """Repository for applications."""
     
-    def __init__(self, session_factory: Optional[sessionmaker] = None):
-        self._session_factory = session_factory or SessionLocal
+    def __init__(self, session_factory: Optional[sessionmaker | scoped_session] = None):
+        self._session_factory = session_factory or ScopedSession
     
     def _get_session(self):
         return self._session_factory()
     
     def create(self, application: Application) -> None:
         """Create a new application."""
+        self.create_many([application])
+    
+    def create_many(self, applications: List[Application]) -> None:
+        """Create applications in a single INSERT statement."""
+        if not applications:
+            return
+        
         session = self._get_session()
         try:
-            orm = application_to_orm(application)
-            session.add(orm)
+            rows = [_orm_to_row(application_to_orm(a)) for a in applications]
+            session.execute(insert(ApplicationORM), rows)
             session.commit()
-            print(f"[app_repo] created application {application.application_id}")
+            logger.debug("[app_repo] created %s application(s)", len(applications))
         except SQLAlchemyError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to create application: {e}") from e
         finally:
-            session.close()
+            release_session(session)
     
     def get(self, application_id: UUID) -> Optional[Application]:
         """Get application by ID."""
@@ -270,72 +375,62 @@ class ApplicationRepository:
             if not orm:
                 return None
             
-            from execution_engine.domain.models import Application, ResourceLimits
-            
-            return Application(
-                application_id=orm.application_id,
-                tenant_id=orm.tenant_id,
-                template_id=orm.template_id,
-                template_version=orm.template_version,
-                name=orm.name,
-                description=orm.description,
-                user_inputs=orm.user_inputs,
-                current_deployment_id=orm.current_deployment_id,
-                status=orm.status,
-                health_status=orm.health_status,
-                domain=orm.domain,
-                public_url=orm.public_url,
-                ssl_enabled=orm.ssl_enabled,
-                resource_limits=ResourceLimits(**orm.resource_limits) if orm.resource_limits else None,
-                created_at=orm.created_at,
-                updated_at=orm.updated_at,
-                deleted_at=orm.deleted_at,
-            )
+            return orm_to_application(orm)
         finally:
-            session.close()
+            release_session(session)
     
     def update(self, application: Application) -> None:
         """Update application."""
         session = self._get_session()
         try:
-            orm = session.get(ApplicationORM, application.application_id)
-            if not orm:
-                raise ExecutionConcurrencyError(f"Application {application.application_id} not found")
-            
-            # Update fields
-            orm.status = application.status
-            orm.health_status = application.health_status
-            orm.current_deployment_id = application.current_deployment_id
-            orm.public_url = application.public_url
-            orm.domain = application.domain
-            orm.ssl_enabled = application.ssl_enabled
-            orm.deleted_at = application.deleted_at
+            # Single UPDATE - no SELECT to load the row first
+            result = session.execute(
+                update(ApplicationORM)
+                .where(ApplicationORM.application_id == application.application_id)
+                .where(ApplicationORM.version == application.version)
+                .values(
+                    version=ApplicationORM.version + 1,
+                    status=application.status,
+                    health_status=application.health_status,
+                    current_deployment_id=application.current_deployment_id,
+                    public_url=application.public_url,
+                    domain=application.domain,
+                    ssl_enabled=application.ssl_enabled,
+                    deleted_at=application.deleted_at,
+                )
+            )
+            if result.rowcount == 0:
+                raise ExecutionConcurrencyError(
+                    f"Application {application.application_id} not found or modified concurrently"
+                )
             
             session.commit()
-            print(f"[app_repo] updated application {application.application_id}")
+            application.version += 1
+            logger.debug("[app_repo] updated application %s", application.application_id)
         except SQLAlchemyError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to update application: {e}") from e
         finally:
-            session.close()
+            release_session(session)
     
     def list_by_tenant(self, tenant_id: UUID, include_deleted: bool = False) -> List[Application]:
         """List applications by tenant."""
         session = self._get_session()
         try:
-            query = session.query(ApplicationORM).filter(
+            # lambda_stmt: statement built and cache-keyed once per variant
+            stmt = lambda_stmt(lambda: select(ApplicationORM).where(
                 ApplicationORM.tenant_id == tenant_id
-            )
+            ))
             
             if not include_deleted:
-                query = query.filter(ApplicationORM.deleted_at.is_(None))
+                stmt += lambda s: s.where(ApplicationORM.deleted_at.is_(None))
             
-            query = query.order_by(ApplicationORM.created_at.desc())
+            stmt += lambda s: s.order_by(ApplicationORM.created_at.desc())
             
-            orms = query.all()
-            return [self.get(orm.application_id) for orm in orms if self.get(orm.application_id)]
+            orms = session.execute(stmt).scalars().all()
+            return [orm_to_application(orm) for orm in orms]
         finally:
-            session.close()
+            release_session(session)
 
 
 # ============================================
@@ -345,8 +440,8 @@ class ApplicationRepository:
 class DeploymentRepository:
     """Repository for deployments."""
     
-    def __init__(self, session_factory: Optional[sessionmaker] = None):
-        self._session_factory = session_factory or SessionLocal
+    def __init__(self, session_factory: Optional[sessionmaker | scoped_session] = None):
+        self._session_factory = session_factory or ScopedSession
     
     def _get_session(self):
         return self._session_factory()
@@ -358,12 +453,12 @@ class DeploymentRepository:
             orm = deployment_to_orm(deployment)
             session.add(orm)
             session.commit()
-            print(f"[deployment_repo] created deployment {deployment.deployment_id}")
+            logger.debug("[deployment_repo] created deployment %s", deployment.deployment_id)
         except SQLAlchemyError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to create deployment: {e}") from e
         finally:
-            session.close()
+            release_session(session)
     
     def get(self, deployment_id: UUID) -> Optional[Deployment]:
         """Get deployment by ID."""
@@ -392,34 +487,45 @@ class DeploymentRepository:
                 created_at=orm.created_at,
                 started_at=orm.started_at,
                 completed_at=orm.completed_at,
-                metadata=orm.metadata,
+                metadata=orm.deployment_metadata,
+                version=orm.version,
             )
         finally:
-            session.close()
+            release_session(session)
     
     def update(self, deployment: Deployment) -> None:
         """Update deployment."""
         session = self._get_session()
         try:
-            orm = session.get(DeploymentORM, deployment.deployment_id)
-            if not orm:
-                raise ExecutionConcurrencyError(f"Deployment {deployment.deployment_id} not found")
-            
-            orm.status = deployment.status
-            orm.current_step_index = deployment.current_step_index
-            orm.public_url = deployment.public_url
-            orm.internal_endpoints = deployment.internal_endpoints
-            orm.error_message = deployment.error_message
-            orm.started_at = deployment.started_at
-            orm.completed_at = deployment.completed_at
+            # Single UPDATE - no SELECT to load the row first
+            result = session.execute(
+                update(DeploymentORM)
+                .where(DeploymentORM.deployment_id == deployment.deployment_id)
+                .where(DeploymentORM.version == deployment.version)
+                .values(
+                    version=DeploymentORM.version + 1,
+                    status=deployment.status,
+                    current_step_index=deployment.current_step_index,
+                    public_url=deployment.public_url,
+                    internal_endpoints=deployment.internal_endpoints,
+                    error_message=deployment.error_message,
+                    started_at=deployment.started_at,
+                    completed_at=deployment.completed_at,
+                )
+            )
+            if result.rowcount == 0:
+                raise ExecutionConcurrencyError(
+                    f"Deployment {deployment.deployment_id} not found or modified concurrently"
+                )
             
             session.commit()
-            print(f"[deployment_repo] updated deployment {deployment.deployment_id}")
+            deployment.version += 1
+            logger.debug("[deployment_repo] updated deployment %s", deployment.deployment_id)
         except SQLAlchemyError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to update deployment: {e}") from e
         finally:
-            session.close()
+            release_session(session)
 
 # ============================================
 # DEPLOYED RESOURCES REPOSITORY
@@ -428,41 +534,38 @@ class DeploymentRepository:
 class DeployedResourceRepository:
     """Repository for deployed resources."""
     
-    def __init__(self, session_factory: Optional[sessionmaker] = None):
-        self._session_factory = session_factory or SessionLocal
+    def __init__(self, session_factory: Optional[sessionmaker | scoped_session] = None):
+        self._session_factory = session_factory or ScopedSession
     
     def _get_session(self):
         return self._session_factory()
     
     def create(self, resource: DeployedResource) -> None:
         """Create a new deployed resource."""
+        self.create_many([resource])
+    
+    def create_many(self, resources: List[DeployedResource]) -> None:
+        """
+        Create deployed resources in a single INSERT statement.
+        
+        The rows go out as one executemany, which the psycopg2 dialect
+        batches into multi-row VALUES (insertmanyvalues) rather than one
+        round trip per resource.
+        """
+        if not resources:
+            return
+        
         session = self._get_session()
         try:
-            from execution_engine.infrastructure.postgres.models import DeployedResourceORM
-            
-            orm = DeployedResourceORM(
-                resource_id=resource.resource_id,
-                deployment_id=resource.deployment_id,
-                resource_type=resource.resource_type,
-                external_id=resource.external_id,
-                node_id=resource.node_id,
-                name=resource.name,
-                spec=resource.spec,
-                status=resource.status,
-                health_status=resource.health_status,
-                consecutive_health_failures=resource.consecutive_health_failures,
-                last_health_check_at=resource.last_health_check_at,
-                created_at=resource.created_at,
-            )
-            
-            session.add(orm)
+            rows = [_orm_to_row(resource_to_orm(r)) for r in resources]
+            session.execute(insert(DeployedResourceORM), rows)
             session.commit()
-            print(f"[resource_repo] created resource {resource.resource_id}")
+            logger.debug("[resource_repo] created %s resource(s)", len(resources))
         except SQLAlchemyError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to create resource: {e}") from e
         finally:
-            session.close()
+            release_session(session)
     
     def get(self, resource_id: UUID) -> Optional[DeployedResource]:
         """Get resource by ID."""
@@ -489,7 +592,7 @@ class DeployedResourceRepository:
                 created_at=orm.created_at,
             )
         finally:
-            session.close()
+            release_session(session)
     
     def update(self, resource: DeployedResource) -> None:
         """Update resource."""
@@ -509,9 +612,9 @@ class DeployedResourceRepository:
             orm.spec = resource.spec
             
             session.commit()
-            print(f"[resource_repo] updated resource {resource.resource_id}")
+            logger.debug("[resource_repo] updated resource %s", resource.resource_id)
         except SQLAlchemyError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to update resource: {e}") from e
         finally:
-            session.close()
\ No newline at end of file
+            release_session(session)
\ No newline at end of file
@@ -1,14 +1,13 @@
 #execution_engine\infrastructure\postgres\models.py
 """SQLAlchemy ORM models for database tables."""
 
-from datetime import datetime
-from uuid import uuid4
-
 from sqlalchemy import (
-    Column, String, Integer, DateTime, JSON, Enum as SQLEnum, Index, Text, Boolean, Float, ForeignKey, LargeBinary
+    func, Column, String, Integer, SmallInteger, DateTime, JSON, Enum as SQLEnum, Index, Text, Boolean, Float,
+    ForeignKey, LargeBinary, TypeDecorator
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
+from execution_engine.core.ids import new_id
 from execution_engine.core.models import ExecutionState
 from execution_engine.infrastructure.postgres.database import Base
 from execution_engine.domain.models import (
@@ -17,6 +16,82 @@ from execution_engine.domain.models import (
 from execution_engine.node_manager.models import NodeType, NodeStatus, NodeHealthStatus
 
 
+def utcnow_sql():
+    """
+    Current UTC time from the database clock.
+    
+    Naive timestamp, matching the datetime.utcnow() values used elsewhere.
+    """
+    return func.timezone('UTC', func.now())
+
+
+def _string_enum(enum_cls, name: str) -> SQLEnum:
+    """
+    Enum column stored as VARCHAR(32) with a CHECK constraint.
+    
+    Avoids a PostgreSQL enum type, so adding a value is a constraint
+    swap instead of ALTER TYPE. Values still map to/from enum_cls.
+    
+    Args:
+        enum_cls: Python Enum class
+        name: CHECK constraint name
+    """
+    return SQLEnum(enum_cls, name=name, native_enum=False, create_constraint=True, length=32)
+
+
+class CentiCores(TypeDecorator):
+    """
+    CPU cores stored as SMALLINT hundredths (2 bytes instead of 8).
+    
+    Reads and writes plain float cores, so domain code is unaffected.
+    Range is 0-327.67 cores at 0.01 core resolution.
+    """
+    
+    impl = SmallInteger
+    cache_ok = True
+    
+    # Stored units per core
+    SCALE = 100
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(round(value * self.SCALE))
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return value / self.SCALE
+
+
+class StringSet(TypeDecorator):
+    """
+    frozenset of strings stored as a sorted JSONB array.
+    
+    Keeps JSONB operators (? key-exists, GIN indexing) in SQL while domain
+    code gets O(1) membership tests.
+    """
+    
+    impl = JSONB
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return sorted(value)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return frozenset(value)
+    
+    def coerce_compared_value(self, op, value):
+        # Element operands (has_key) bind as plain text, not as a set
+        if isinstance(value, str):
+            return String()
+        return self
+
+
 class ExecutionORM(Base):
     """
     Execution table - stores execution state.
@@ -34,7 +109,7 @@ class ExecutionORM(Base):
     execution_id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=new_id,
         nullable=False
     )
     
@@ -61,7 +136,7 @@ class ExecutionORM(Base):
     )
     
     # Lifecycle timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow_sql())
     queued_at = Column(DateTime, nullable=True)
     claimed_at = Column(DateTime, nullable=True)
     started_at = Column(DateTime, nullable=True, index=True)
@@ -95,10 +170,10 @@ class ExecutionORM(Base):
             'created_at',
             postgresql_where=(state == ExecutionState.QUEUED.value)
         ),
-        # Index for finding recoverable executions
+        # Index for finding recoverable executions (state is fixed by the
+        # predicate, so only the lease deadline is keyed)
         Index(
             'ix_executions_recoverable_lookup',
-            'state',
             'lease_expires_at',
             postgresql_where=(state == ExecutionState.STARTED.value)
         ),
@@ -106,6 +181,12 @@ class ExecutionORM(Base):
         Index('ix_executions_tenant_state', 'tenant_id', 'state'),
         # Index for application-scoped queries
         Index('ix_executions_app_state', 'application_id', 'state'),
+        # Index for a deployment's executions (status updater)
+        Index(
+            'ix_executions_deployment',
+            'deployment_id',
+            postgresql_where=(deployment_id.isnot(None))
+        ),
     )
     
     def __repr__(self) -> str:
@@ -132,18 +213,21 @@ class ApplicationTemplateORM(Base):
     
     icon_url = Column(String(500), nullable=True)
     
-    deployment_steps = Column(JSON, nullable=False)  # List of step definitions
+    deployment_steps = Column(JSONB, nullable=False)  # List of step definitions
     
     database_required = Column(Boolean, nullable=False, default=False)
     database_type = Column(String(50), nullable=True)
     
-    required_inputs = Column(JSON, nullable=False)  # List of input field definitions
+    required_inputs = Column(JSONB, nullable=False)  # List of input field definitions
     default_resources = Column(JSON, nullable=True)
     
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow_sql())
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow_sql(), onupdate=utcnow_sql())
     is_active = Column(Boolean, nullable=False, default=True)
     
+    # Relationships (never lazy-loaded; use selectinload() where needed)
+    applications = relationship("ApplicationORM", back_populates="template", lazy="raise")
+    
     __table_args__ = (
         Index('ix_templates_category', 'category'),
         Index('ix_templates_active', 'is_active'),
@@ -159,7 +243,7 @@ class ApplicationORM(Base):
     
     __tablename__ = "applications"
     
-    application_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    application_id = Column(UUID(as_uuid=True), primary_key=True, default=new_id)
     tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     
     template_id = Column(String(100), ForeignKey('application_templates.template_id'), nullable=False)
@@ -167,12 +251,12 @@ class ApplicationORM(Base):
     
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    user_inputs = Column(JSON, nullable=False)
+    user_inputs = Column(JSONB, nullable=False)
     
     current_deployment_id = Column(UUID(as_uuid=True), nullable=True)
     
-    status = Column(SQLEnum(ApplicationStatus), nullable=False, default=ApplicationStatus.CREATING, index=True)
-    health_status = Column(SQLEnum(HealthStatus), nullable=False, default=HealthStatus.UNKNOWN)
+    status = Column(_string_enum(ApplicationStatus, "ck_applications_status"), nullable=False, default=ApplicationStatus.CREATING, index=True)
+    health_status = Column(_string_enum(HealthStatus, "ck_applications_health_status"), nullable=False, default=HealthStatus.UNKNOWN)
     
     domain = Column(String(255), nullable=True)
     public_url = Column(String(500), nullable=True)
@@ -180,16 +264,34 @@ class ApplicationORM(Base):
     
     resource_limits = Column(JSON, nullable=True)
     
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow_sql(), index=True)
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow_sql(), onupdate=utcnow_sql())
     deleted_at = Column(DateTime, nullable=True)
     
-    # Relationships
-    template = relationship("ApplicationTemplateORM", backref="applications")
+    # Optimistic concurrency
+    version = Column(Integer, nullable=False, default=0)
+    
+    # Relationships (never lazy-loaded; use selectinload() where needed)
+    template = relationship("ApplicationTemplateORM", back_populates="applications", lazy="raise")
+    deployments = relationship("DeploymentORM", back_populates="application", lazy="raise")
+    domains = relationship("DomainORM", back_populates="application", lazy="raise")
+    databases = relationship("ProvisionedDatabaseORM", back_populates="application", lazy="raise")
     
     __table_args__ = (
         Index('ix_applications_tenant_status', 'tenant_id', 'status'),
         Index('ix_applications_tenant_created', 'tenant_id', 'created_at'),
+        # Index for list_by_tenant (live apps, newest first); carries the
+        # summary columns so id/name/status listings can be index-only
+        Index(
+            'ix_apps_tenant_active_created',
+            'tenant_id',
+            'created_at',
+            postgresql_where=(deleted_at.is_(None)),
+            postgresql_ops={'created_at': 'DESC'},
+            postgresql_include=['application_id', 'name', 'status', 'health_status', 'public_url']
+        ),
+        # Containment (@>) lookups on user inputs
+        Index('ix_apps_user_inputs_gin', 'user_inputs', postgresql_using='gin'),
     )
 
 
@@ -202,16 +304,16 @@ class DeploymentORM(Base):
     
     __tablename__ = "deployments"
     
-    deployment_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    deployment_id = Column(UUID(as_uuid=True), primary_key=True, default=new_id)
     application_id = Column(UUID(as_uuid=True), ForeignKey('applications.application_id'), nullable=False, index=True)
     tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     
     template_id = Column(String(100), nullable=False)
     template_version = Column(String(50), nullable=False)
     
-    resolved_config = Column(JSON, nullable=False)
+    resolved_config = Column(JSONB, nullable=False)
     
-    status = Column(SQLEnum(DeploymentStatus), nullable=False, default=DeploymentStatus.PENDING, index=True)
+    status = Column(_string_enum(DeploymentStatus, "ck_deployments_status"), nullable=False, default=DeploymentStatus.PENDING, index=True)
     
     current_step_index = Column(Integer, nullable=False, default=0)
     total_steps = Column(Integer, nullable=False, default=0)
@@ -222,18 +324,30 @@ class DeploymentORM(Base):
     error_message = Column(Text, nullable=True)
     rollback_on_failure = Column(Boolean, nullable=False, default=True)
     
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow_sql(), index=True)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     
     deployment_metadata = Column(JSON, nullable=False, default={})
     
-    # Relationships
-    application = relationship("ApplicationORM", backref="deployments")
+    # Optimistic concurrency
+    version = Column(Integer, nullable=False, default=0)
+    
+    # Relationships (never lazy-loaded; use selectinload() where needed)
+    application = relationship("ApplicationORM", back_populates="deployments", lazy="raise")
+    resources = relationship("DeployedResourceORM", back_populates="deployment", lazy="raise")
     
     __table_args__ = (
         Index('ix_deployments_app_created', 'application_id', 'created_at'),
+        # Index for the status updater's DEPLOYING scan (oldest first)
+        Index(
+            'ix_deployments_deploying_created',
+            'created_at',
+            postgresql_where=(status == DeploymentStatus.DEPLOYING.name)
+        ),
         Index('ix_deployments_status', 'status'),
+        # Containment (@>) lookups on resolved config
+        Index('ix_deployments_resolved_config_gin', 'resolved_config', postgresql_using='gin'),
     )
 
 
@@ -246,14 +360,14 @@ class DeploymentStepExecutionORM(Base):
     
     __tablename__ = "deployment_step_executions"
     
-    step_execution_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    step_execution_id = Column(UUID(as_uuid=True), primary_key=True, default=new_id)
     deployment_id = Column(UUID(as_uuid=True), ForeignKey('deployments.deployment_id'), nullable=False, index=True)
     step_id = Column(String(100), nullable=False)
     step_name = Column(String(255), nullable=False)
     
     execution_id = Column(UUID(as_uuid=True), ForeignKey('executions.execution_id'), nullable=True)
     
-    status = Column(SQLEnum(StepStatus), nullable=False, default=StepStatus.PENDING, index=True)
+    status = Column(_string_enum(StepStatus, "ck_deployment_step_executions_status"), nullable=False, default=StepStatus.PENDING, index=True)
     
     result = Column(JSON, nullable=False, default={})
     error_message = Column(Text, nullable=True)
@@ -281,7 +395,7 @@ class DeployedResourceORM(Base):
     
     __tablename__ = "deployed_resources"
     
-    resource_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    resource_id = Column(UUID(as_uuid=True), primary_key=True, default=new_id)
     deployment_id = Column(UUID(as_uuid=True), ForeignKey('deployments.deployment_id'), nullable=False, index=True)
     resource_type = Column(SQLEnum(ResourceType), nullable=False)
     
@@ -294,14 +408,14 @@ class DeployedResourceORM(Base):
     status = Column(String(50), nullable=False, default="unknown")
     
     # ✅ ADD health tracking
-    health_status = Column(SQLEnum(HealthStatus), nullable=False, default=HealthStatus.UNKNOWN)
+    health_status = Column(_string_enum(HealthStatus, "ck_deployed_resources_health_status"), nullable=False, default=HealthStatus.UNKNOWN)
     consecutive_health_failures = Column(Integer, nullable=False, default=0)
     last_health_check_at = Column(DateTime, nullable=True)
     
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow_sql())
     
-    # Relationships
-    deployment = relationship("DeploymentORM", backref="resources")
+    # Relationships (never lazy-loaded; use selectinload() where needed)
+    deployment = relationship("DeploymentORM", back_populates="resources", lazy="raise")
     
     __table_args__ = (
         Index('ix_resources_deployment', 'deployment_id'),
@@ -319,7 +433,7 @@ class DomainORM(Base):
     
     __tablename__ = "domains"
     
-    domain_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    domain_id = Column(UUID(as_uuid=True), primary_key=True, default=new_id)
     application_id = Column(UUID(as_uuid=True), ForeignKey('applications.application_id'), nullable=False, index=True)
     tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     
@@ -329,7 +443,7 @@ class DomainORM(Base):
     
     dns_verified = Column(Boolean, nullable=False, default=False)
     dns_verified_at = Column(DateTime, nullable=True)
-    dns_records = Column(JSON, nullable=False, default=[])
+    dns_records = Column(JSONB, nullable=False, default=[])
     
     ssl_enabled = Column(Boolean, nullable=False, default=False)
     ssl_provider = Column(String(50), nullable=False, default="letsencrypt")
@@ -342,15 +456,17 @@ class DomainORM(Base):
     
     status = Column(String(50), nullable=False, default="pending")
     
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow_sql())
+    updated_at = Column(DateTime, nullable=False, server_default=utcnow_sql(), onupdate=utcnow_sql())
     
-    # Relationships
-    application = relationship("ApplicationORM", backref="domains")
+    # Relationships (never lazy-loaded; use selectinload() where needed)
+    application = relationship("ApplicationORM", back_populates="domains", lazy="raise")
     
     __table_args__ = (
         Index('ix_domains_app', 'application_id'),
         Index('ix_domains_tenant', 'tenant_id'),
+        # Containment (@>) lookups on DNS records
+        Index('ix_domains_dns_records_gin', 'dns_records', postgresql_using='gin'),
     )
 
 
@@ -363,7 +479,7 @@ class ProvisionedDatabaseORM(Base):
     
     __tablename__ = "provisioned_databases"
     
-    database_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    database_id = Column(UUID(as_uuid=True), primary_key=True, default=new_id)
     application_id = Column(UUID(as_uuid=True), ForeignKey('applications.application_id'), nullable=False, index=True)
     tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     
@@ -383,11 +499,11 @@ class ProvisionedDatabaseORM(Base):
     last_backup_at = Column(DateTime, nullable=True)
     backup_retention_days = Column(Integer, nullable=False, default=7)
     
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow_sql())
     deleted_at = Column(DateTime, nullable=True)
     
-    # Relationships
-    application = relationship("ApplicationORM", backref="databases")
+    # Relationships (never lazy-loaded; use selectinload() where needed)
+    application = relationship("ApplicationORM", back_populates="databases", lazy="raise")
     
     __table_args__ = (
         Index('ix_provisioned_dbs_app', 'application_id'),
@@ -405,7 +521,7 @@ class InfrastructureNodeORM(Base):
     
     __tablename__ = "infrastructure_nodes"
     
-    node_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    node_id = Column(UUID(as_uuid=True), primary_key=True, default=new_id)
     node_name = Column(String(255), nullable=False, unique=True)
     node_type = Column(SQLEnum(NodeType), nullable=False, index=True)
     
@@ -413,13 +529,13 @@ class InfrastructureNodeORM(Base):
     public_ip = Column(String(50), nullable=True)
     
     runtime_agent_url = Column(String(500), nullable=False)
-    supported_runtimes = Column(JSON, nullable=False, default=["docker"])
+    supported_runtimes = Column(StringSet, nullable=False, default=frozenset({"docker"}))
     
-    total_cpu = Column(Float, nullable=False, default=0.0)
+    total_cpu = Column(CentiCores, nullable=False, default=0.0)
     total_memory = Column(Integer, nullable=False, default=0)
     total_storage = Column(Integer, nullable=False, default=0)
     
-    available_cpu = Column(Float, nullable=False, default=0.0)
+    available_cpu = Column(CentiCores, nullable=False, default=0.0)
     available_memory = Column(Integer, nullable=False, default=0)
     available_storage = Column(Integer, nullable=False, default=0)
     
@@ -431,14 +547,28 @@ class InfrastructureNodeORM(Base):
     
     last_heartbeat_at = Column(DateTime, nullable=True)
     
-    labels = Column(JSON, nullable=False, default={})
+    labels = Column(JSONB, nullable=False, default={})
     
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    registered_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=utcnow_sql())
+    registered_at = Column(DateTime, nullable=False, server_default=utcnow_sql())
     
     __table_args__ = (
         Index('ix_nodes_type_status', 'node_type', 'status'),
         Index('ix_nodes_status', 'status'),
         Index('ix_nodes_heartbeat', 'last_heartbeat_at'),
+        # Placement scan (list_available): only schedulable nodes, already
+        # in least-loaded order
+        Index(
+            'ix_nodes_available',
+            'active_containers',
+            postgresql_where=(
+                (status == NodeStatus.READY.name)
+                & health_status.in_([NodeHealthStatus.HEALTHY.name, NodeHealthStatus.UNKNOWN.name])
+            ),
+        ),
+        # Key-exists (?) lookups on supported runtimes
+        Index('ix_nodes_runtimes_gin', 'supported_runtimes', postgresql_using='gin'),
+        # Label selectors (@>)
+        Index('ix_nodes_labels_gin', 'labels', postgresql_using='gin'),
     )
 
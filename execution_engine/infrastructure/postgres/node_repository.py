@@ -2,82 +2,154 @@
 
 """Node manager repository."""
 
-from typing import List, Optional
+import logging
+import threading
+import time
+from dataclasses import fields, replace
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from datetime import datetime, timezone
-from sqlalchemy import func
+from sqlalchemy import SmallInteger, func, lambda_stmt, select, type_coerce, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from execution_engine.node_manager.models import InfrastructureNode, NodeStatus, NodeHealthStatus
-from execution_engine.infrastructure.postgres.database import SessionLocal
-from execution_engine.infrastructure.postgres.models import InfrastructureNodeORM
+from execution_engine.node_manager.models import (
+    CapacityRequest, InfrastructureNode, NodeStatus, NodeHealthStatus, PlacementStrategy
+)
+from execution_engine.infrastructure.postgres.database import ScopedSession, release_session
+from execution_engine.infrastructure.postgres.converters import build_to_domain, build_to_orm
+from execution_engine.infrastructure.postgres.models import CentiCores, InfrastructureNodeORM, utcnow_sql
 from execution_engine.core.errors import ExecutionConcurrencyError
 
+logger = logging.getLogger(__name__)
 
-def node_to_orm(node: InfrastructureNode) -> InfrastructureNodeORM:
-    """Convert node domain model to ORM."""
-    return InfrastructureNodeORM(
-        node_id=node.node_id,
-        node_name=node.node_name,
-        node_type=node.node_type,
-        internal_ip=node.internal_ip,
-        public_ip=node.public_ip,
-        runtime_agent_url=node.runtime_agent_url,
-        supported_runtimes=node.supported_runtimes,
-        total_cpu=node.total_cpu,
-        total_memory=node.total_memory,
-        total_storage=node.total_storage,
-        available_cpu=node.available_cpu,
-        available_memory=node.available_memory,
-        available_storage=node.available_storage,
-        max_containers=node.max_containers,
-        active_containers=node.active_containers,
-        status=node.status,
-        health_status=node.health_status,
-        last_heartbeat_at=node.last_heartbeat_at,
-        labels=node.labels,
-        created_at=node.created_at,
-        registered_at=node.registered_at,
-    )
 
+# Table columns in InfrastructureNode field order, for positional construction
+NODE_COLUMNS = tuple(InfrastructureNodeORM.__table__.c[f.name] for f in fields(InfrastructureNode))
+
+# Field-by-field copies generated from the InfrastructureNode dataclass
+node_to_orm = build_to_orm(InfrastructureNode, InfrastructureNodeORM, "node_to_orm")
+orm_to_node = build_to_domain(InfrastructureNode, "orm_to_node")
+
+# Spare capacity in "cores + GB of memory"; the requested amounts are the
+# same for every candidate, so ordering by what is free ranks by leftover.
+# available_cpu is read raw (hundredths) to keep the expression in SQL.
+SPARE_CAPACITY = (
+    type_coerce(InfrastructureNodeORM.available_cpu, SmallInteger) / float(CentiCores.SCALE)
+    + InfrastructureNodeORM.available_memory / 1024.0
+)
+
+# ORDER BY for each placement strategy
+PLACEMENT_ORDER = {
+    PlacementStrategy.BEST_FIT: (SPARE_CAPACITY.asc(), InfrastructureNodeORM.active_containers.asc()),
+    PlacementStrategy.LEAST_LOADED: (InfrastructureNodeORM.active_containers.asc(),),
+}
 
-def orm_to_node(orm: InfrastructureNodeORM) -> InfrastructureNode:
-    """Convert ORM to node domain model."""
-    return InfrastructureNode(
-        node_id=orm.node_id,
-        node_name=orm.node_name,
-        node_type=orm.node_type,
-        internal_ip=orm.internal_ip,
-        public_ip=orm.public_ip,
-        runtime_agent_url=orm.runtime_agent_url,
-        supported_runtimes=orm.supported_runtimes,
-        total_cpu=orm.total_cpu,
-        total_memory=orm.total_memory,
-        total_storage=orm.total_storage,
-        available_cpu=orm.available_cpu,
-        available_memory=orm.available_memory,
-        available_storage=orm.available_storage,
-        max_containers=orm.max_containers,
-        active_containers=orm.active_containers,
-        status=orm.status,
-        health_status=orm.health_status,
-        last_heartbeat_at=orm.last_heartbeat_at,
-        labels=orm.labels,
-        created_at=orm.created_at,
-        registered_at=orm.registered_at,
+
+def _assign_placements(
+    nodes: List[InfrastructureNode],
+    requests: List[CapacityRequest],
+    strategy: PlacementStrategy,
+) -> List[Optional[InfrastructureNode]]:
+    """
+    Assign requests to nodes in memory (first-fit decreasing).
+    
+    Largest requests are placed first; each goes to the fitting node ranked
+    first by strategy, using the capacity left after earlier assignments -
+    the same ranking PLACEMENT_ORDER applies in SQL. CPU is compared in
+    centicores so repeated subtraction does not drift.
+    
+    Returns:
+        The node for each request (input order), None where nothing fits
+    """
+    scale = CentiCores.SCALE
+    # {node_id: [cpu_centicores, memory, storage, active_containers]}
+    free = {
+        node.node_id: [
+            round(node.available_cpu * scale),
+            node.available_memory,
+            node.available_storage,
+            node.active_containers,
+        ]
+        for node in nodes
+    }
+    
+    if strategy == PlacementStrategy.BEST_FIT:
+        def rank(node):
+            cpu, memory, _, active = free[node.node_id]
+            return (cpu / scale + memory / 1024.0, active)
+    else:
+        def rank(node):
+            return free[node.node_id][3]
+    
+    assignment: List[Optional[InfrastructureNode]] = [None] * len(requests)
+    order = sorted(
+        range(len(requests)),
+        key=lambda i: requests[i].cpu + requests[i].memory / 1024.0,
+        reverse=True,
     )
+    for i in order:
+        request = requests[i]
+        cpu = round(request.cpu * scale)
+        fitting = [
+            node for node in nodes
+            if free[node.node_id][0] >= cpu
+            and free[node.node_id][1] >= request.memory
+            and free[node.node_id][2] >= request.storage
+            and free[node.node_id][3] < node.max_containers
+        ]
+        if not fitting:
+            continue
+        
+        node = min(fitting, key=rank)
+        remaining = free[node.node_id]
+        remaining[0] -= cpu
+        remaining[1] -= request.memory
+        remaining[2] -= request.storage
+        remaining[3] += 1
+        assignment[i] = node
+    
+    return assignment
 
 
 class NodeRepository:
     """Repository for infrastructure nodes."""
     
+    # Seconds a node fetched by get()/get_by_name() is served from memory
+    NODE_CACHE_TTL = 5.0
+    
     def __init__(self, session_factory: Optional[sessionmaker] = None):
-        self._session_factory = session_factory or SessionLocal
+        self._session_factory = session_factory or ScopedSession
+        
+        # {node_id: (expires_at, node)} plus a node_name -> node_id index
+        self._node_cache: Dict[UUID, Tuple[float, InfrastructureNode]] = {}
+        self._node_ids_by_name: Dict[str, UUID] = {}
+        self._node_cache_lock = threading.Lock()
     
     def _get_session(self):
         return self._session_factory()
     
+    def _cached_node(self, node_id: Optional[UUID]) -> Optional[InfrastructureNode]:
+        """Copy of a cached node, or None if absent or expired."""
+        with self._node_cache_lock:
+            entry = self._node_cache.get(node_id)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            # Callers mutate nodes (update_capacity) - hand out a copy
+            return replace(entry[1])
+    
+    def _cache_node(self, node: InfrastructureNode) -> None:
+        with self._node_cache_lock:
+            self._node_cache[node.node_id] = (time.monotonic() + self.NODE_CACHE_TTL, replace(node))
+            self._node_ids_by_name[node.node_name] = node.node_id
+    
+    def _invalidate_node(self, node_id: UUID) -> None:
+        with self._node_cache_lock:
+            entry = self._node_cache.pop(node_id, None)
+            if entry is not None:
+                self._node_ids_by_name.pop(entry[1].node_name, None)
+    
     def create(self, node: InfrastructureNode) -> None:
         """Register a new node."""
         session = self._get_session()
@@ -85,111 +157,389 @@ class NodeRepository:
             orm = node_to_orm(node)
             session.add(orm)
             session.commit()
-            print(f"[node_repo] registered node {node.node_id} ({node.node_name})")
+            logger.debug("[node_repo] registered node %s (%s)", node.node_id, node.node_name)
         except IntegrityError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Node {node.node_name} already exists") from e
         finally:
-            session.close()
+            release_session(session)
+    
+    def create_many(self, nodes: List[InfrastructureNode]) -> None:
+        """
+        Register nodes in a single INSERT statement (fleet boot).
+        
+        Nodes whose name is already registered are skipped rather than
+        failing the whole batch.
+        """
+        if not nodes:
+            return
+        
+        session = self._get_session()
+        try:
+            rows = [{c.key: getattr(n, c.key) for c in NODE_COLUMNS} for n in nodes]
+            session.execute(
+                pg_insert(InfrastructureNodeORM).on_conflict_do_nothing(index_elements=['node_name']),
+                rows,
+            )
+            session.commit()
+            logger.debug("[node_repo] registered up to %s node(s)", len(nodes))
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise ExecutionConcurrencyError(f"Failed to register nodes: {e}") from e
+        finally:
+            release_session(session)
     
     def get(self, node_id: UUID) -> Optional[InfrastructureNode]:
-        """Get node by ID."""
+        """Get node by ID (served from a short-TTL cache when fresh)."""
+        node = self._cached_node(node_id)
+        if node is not None:
+            return node
+        
         session = self._get_session()
         try:
             orm = session.get(InfrastructureNodeORM, node_id)
             if not orm:
                 return None
-            return orm_to_node(orm)
+            node = orm_to_node(orm)
         finally:
-            session.close()
+            release_session(session)
+        
+        self._cache_node(node)
+        return node
     
     def get_by_name(self, node_name: str) -> Optional[InfrastructureNode]:
-        """Get node by name."""
+        """Get node by name (served from a short-TTL cache when fresh)."""
+        with self._node_cache_lock:
+            node_id = self._node_ids_by_name.get(node_name)
+        node = self._cached_node(node_id)
+        if node is not None:
+            return node
+        
         session = self._get_session()
         try:
-            orm = session.query(InfrastructureNodeORM).filter(
-                InfrastructureNodeORM.node_name == node_name
-            ).first()
+            # lambda_stmt: statement built and cache-keyed once per process
+            orm = session.execute(lambda_stmt(
+                lambda: select(InfrastructureNodeORM)
+                .where(InfrastructureNodeORM.node_name == node_name)
+            )).scalar_one_or_none()
             if not orm:
                 return None
-            return orm_to_node(orm)
+            node = orm_to_node(orm)
         finally:
-            session.close()
+            release_session(session)
+        
+        self._cache_node(node)
+        return node
     
     def update(self, node: InfrastructureNode) -> None:
-        """Update node."""
+        """
+        Update node status and health.
+        
+        Capacity is written by update_capacity() and the heartbeat by
+        update_heartbeat(), each with a targeted UPDATE; node may be a
+        cached copy, and writing those columns back from it would undo
+        newer changes.
+        """
         session = self._get_session()
         try:
             orm = session.get(InfrastructureNodeORM, node.node_id)
             if not orm:
                 raise ExecutionConcurrencyError(f"Node {node.node_id} not found")
             
-            # Update capacity fields
-            orm.available_cpu = node.available_cpu
-            orm.available_memory = node.available_memory
-            orm.available_storage = node.available_storage
-            orm.active_containers = node.active_containers
             orm.status = node.status
             orm.health_status = node.health_status
-            orm.last_heartbeat_at = node.last_heartbeat_at
             
             session.commit()
-            print(f"[node_repo] updated node {node.node_id}")
+            logger.debug("[node_repo] updated node %s", node.node_id)
         except SQLAlchemyError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to update node: {e}") from e
         finally:
-            session.close()
+            # After the write, so a concurrent get() cannot re-cache stale data
+            self._invalidate_node(node.node_id)
+            release_session(session)
     
-    def list_available(self, runtime_type: str = "docker") -> List[InfrastructureNode]:
+    def update_capacity(
+        self,
+        node_id: UUID,
+        available_cpu: float,
+        available_memory: int,
+        available_storage: int,
+        active_containers: int,
+        status: NodeStatus,
+    ) -> None:
+        """
+        Write a node's reported capacity and status.
+        
+        One UPDATE of just these columns; nothing else in the row (such as
+        a newer heartbeat or health) is written back.
+        """
+        session = self._get_session()
+        try:
+            result = session.execute(
+                update(InfrastructureNodeORM)
+                .where(InfrastructureNodeORM.node_id == node_id)
+                .values(
+                    available_cpu=available_cpu,
+                    available_memory=available_memory,
+                    available_storage=available_storage,
+                    active_containers=active_containers,
+                    status=status,
+                )
+            )
+            if result.rowcount == 0:
+                raise ExecutionConcurrencyError(f"Node {node_id} not found")
+            
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise ExecutionConcurrencyError(f"Failed to update node capacity: {e}") from e
+        finally:
+            self._invalidate_node(node_id)
+            release_session(session)
+    
+    def list_available(
+        self,
+        runtime_type: str = "docker",
+        labels: Optional[Dict[str, str]] = None,
+    ) -> List[InfrastructureNode]:
         """
         List available nodes for deployment.
         
         Filters by status, health, and supported runtime.
         Accepts HEALTHY or UNKNOWN health status (for newly registered nodes).
+        
+        Args:
+            runtime_type: Runtime the node must support
+            labels: Label selector - nodes must carry all of these labels
         """
         session = self._get_session()
         try:
-            # Query for available nodes - accept HEALTHY or UNKNOWN
-            query = session.query(InfrastructureNodeORM).filter(
-                InfrastructureNodeORM.status == NodeStatus.READY,
-                InfrastructureNodeORM.health_status.in_([
-                    NodeHealthStatus.HEALTHY,
-                    NodeHealthStatus.UNKNOWN  # Accept newly registered nodes
-                ])
+            stmt = self._available_stmt(runtime_type, labels).order_by(
+                InfrastructureNodeORM.active_containers.asc()  # Least loaded first
             )
+            nodes = [InfrastructureNode(*row) for row in session.execute(stmt)]
             
-            orms = query.order_by(
-                InfrastructureNodeORM.active_containers.asc()  # Least loaded first
-            ).all()
+            logger.debug("[node_repo] found %s available nodes for runtime '%s'", len(nodes), runtime_type)
+            
+            return nodes
+        finally:
+            release_session(session)
+    
+    def find_placement(
+        self,
+        runtime_type: str,
+        required_cpu: float,
+        required_memory: int,
+        required_storage: int,
+        labels: Optional[Dict[str, str]] = None,
+        strategy: PlacementStrategy = PlacementStrategy.LEAST_LOADED,
+    ) -> Optional[InfrastructureNode]:
+        """
+        Pick an available node with enough free capacity.
+        
+        Capacity filter and ranking run in SQL and only the chosen row is
+        returned. Nothing is reserved: available_* are what the node last
+        reported, and nothing yet returns capacity when a container stops.
+        
+        Args:
+            runtime_type: Runtime the node must support
+            required_cpu: CPU cores needed
+            required_memory: Memory needed (MB)
+            required_storage: Storage needed (GB)
+            labels: Label selector - node must carry all of these labels
+            strategy: Ranking among fitting nodes (see PlacementStrategy)
             
-            # Convert to domain models
-            nodes = [orm_to_node(orm) for orm in orms]
+        Returns:
+            The chosen node, or None if no node fits
+        """
+        stmt = self._available_stmt(runtime_type, labels).where(
+            InfrastructureNodeORM.available_cpu >= required_cpu,
+            InfrastructureNodeORM.available_memory >= required_memory,
+            InfrastructureNodeORM.available_storage >= required_storage,
+            InfrastructureNodeORM.active_containers < InfrastructureNodeORM.max_containers,
+        ).order_by(*PLACEMENT_ORDER[strategy]).limit(1)
+        
+        session = self._get_session()
+        try:
+            row = session.execute(stmt).one_or_none()
+            return InfrastructureNode(*row) if row is not None else None
+        finally:
+            release_session(session)
+    
+    def find_placements(
+        self,
+        runtime_type: str,
+        requests: List[CapacityRequest],
+        labels: Optional[Dict[str, str]] = None,
+        strategy: PlacementStrategy = PlacementStrategy.LEAST_LOADED,
+    ) -> List[Optional[InfrastructureNode]]:
+        """
+        Place several containers at once.
+        
+        Loads the candidate nodes once and assigns the requests in memory
+        (_assign_placements), so containers of one batch do not crowd onto
+        the same node. The read takes no row locks: as with find_placement(),
+        nothing is reserved, so concurrent orchestrations and heartbeat
+        writes never wait on each other here.
+        
+        Args:
+            runtime_type: Runtime the nodes must support
+            requests: Capacity needed per container
+            labels: Label selector - nodes must carry all of these labels
+            strategy: Ranking among fitting nodes (see PlacementStrategy)
             
-            # Filter by runtime support (in Python - simpler than JSON SQL)
-            if runtime_type:
-                nodes = [
-                    node for node in nodes
-                    if runtime_type in node.supported_runtimes
-                ]
+        Returns:
+            The node for each request (input order), None where no node
+            had room
+        """
+        if not requests:
+            return []
+        
+        candidates = self._available_stmt(runtime_type, labels).where(
+            InfrastructureNodeORM.available_cpu >= min(r.cpu for r in requests),
+            InfrastructureNodeORM.available_memory >= min(r.memory for r in requests),
+            InfrastructureNodeORM.available_storage >= min(r.storage for r in requests),
+            InfrastructureNodeORM.active_containers < InfrastructureNodeORM.max_containers,
+        ).order_by(InfrastructureNodeORM.node_id)  # stable tie-breaks between equal nodes
+        
+        session = self._get_session()
+        try:
+            nodes = [InfrastructureNode(*row) for row in session.execute(candidates)]
             
-            print(f"[node_repo] found {len(nodes)} available nodes for runtime '{runtime_type}'")
+            assignment = _assign_placements(nodes, requests, strategy)
+            logger.debug(
+                "[node_repo] placed %s of %s container(s)",
+                sum(node is not None for node in assignment), len(requests),
+            )
+            return assignment
+        finally:
+            release_session(session)
+    
+    def _available_stmt(self, runtime_type: str, labels: Optional[Dict[str, str]]):
+        """Build the placement query shared by list_available/find_placement(s)."""
+        # Query for available nodes - accept HEALTHY or UNKNOWN
+        stmt = select(*NODE_COLUMNS).where(
+            InfrastructureNodeORM.status == NodeStatus.READY,
+            InfrastructureNodeORM.health_status.in_([
+                NodeHealthStatus.HEALTHY,
+                NodeHealthStatus.UNKNOWN  # Accept newly registered nodes
+            ])
+        )
+        
+        # Runtime support via JSONB key-exists (?) - served by the GIN index
+        if runtime_type:
+            stmt = stmt.where(
+                InfrastructureNodeORM.supported_runtimes.has_key(runtime_type)
+            )
+        
+        # Label selector via JSONB containment (@>) - served by the GIN index
+        if labels:
+            stmt = stmt.where(InfrastructureNodeORM.labels.contains(labels))
+        
+        return stmt
+    
+    def list_heartbeat_ages(self) -> Dict[UUID, float]:
+        """
+        Seconds since the last heartbeat of every READY or FULL node (the
+        ones that can go stale).
+        
+        Ages are measured on the database clock, the one mark_stale_offline()
+        compares against, so callers never mix in this host's clock.
+        """
+        session = self._get_session()
+        try:
+            rows = session.execute(
+                select(
+                    InfrastructureNodeORM.node_id,
+                    func.extract("epoch", utcnow_sql() - InfrastructureNodeORM.last_heartbeat_at),
+                )
+                .where(
+                    InfrastructureNodeORM.status.in_([NodeStatus.READY, NodeStatus.FULL]),
+                    InfrastructureNodeORM.last_heartbeat_at.is_not(None),
+                )
+            )
+            return {node_id: float(age) for node_id, age in rows}
+        finally:
+            release_session(session)
+    
+    def mark_stale_offline(self, stale_after: timedelta) -> List[InfrastructureNode]:
+        """
+        Take nodes whose last heartbeat is older than stale_after offline.
+        
+        One UPDATE ... RETURNING finds and marks them, so no node rows are
+        loaded beforehand. Only READY and FULL nodes are considered;
+        MAINTENANCE and already OFFLINE nodes are left alone.
+        
+        The cutoff is taken from the database clock, in the same naive UTC
+        as last_heartbeat_at - independent of this host's clock and of the
+        session TimeZone.
+        
+        Args:
+            stale_after: Heartbeat age at which a node goes offline
+        
+        Returns:
+            The nodes marked offline, as updated
+        """
+        session = self._get_session()
+        node_ids: List[UUID] = []
+        try:
+            rows = session.execute(
+                update(InfrastructureNodeORM)
+                .where(
+                    InfrastructureNodeORM.status.in_([NodeStatus.READY, NodeStatus.FULL]),
+                    InfrastructureNodeORM.last_heartbeat_at < utcnow_sql() - stale_after,
+                )
+                .values(status=NodeStatus.OFFLINE, health_status=NodeHealthStatus.UNHEALTHY)
+                .returning(*NODE_COLUMNS)
+            ).all()
+            session.commit()
             
+            nodes = [InfrastructureNode(*row) for row in rows]
+            node_ids = [node.node_id for node in nodes]
+            logger.debug("[node_repo] marked %s stale node(s) offline", len(nodes))
             return nodes
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise ExecutionConcurrencyError(f"Failed to mark stale nodes offline: {e}") from e
         finally:
-            session.close()                
-    def update_heartbeat(self, node_id: UUID) -> None:
-        """Update node heartbeat timestamp."""
+            for node_id in node_ids:
+                self._invalidate_node(node_id)
+            release_session(session)
+    
+    def update_heartbeat(
+        self,
+        node_id: UUID,
+        health_status: Optional[NodeHealthStatus] = None,
+    ) -> None:
+        """
+        Update node heartbeat timestamp (and health status, if given).
+        
+        Single UPDATE - nothing in the row is needed beforehand; the
+        timestamp comes from the database clock.
+        """
         session = self._get_session()
         try:
-            orm = session.get(InfrastructureNodeORM, node_id)
-            if not orm:
+            if health_status is None:
+                stmt = lambda_stmt(
+                    lambda: update(InfrastructureNodeORM)
+                    .where(InfrastructureNodeORM.node_id == node_id)
+                    .values(last_heartbeat_at=utcnow_sql())
+                )
+            else:
+                stmt = (
+                    update(InfrastructureNodeORM)
+                    .where(InfrastructureNodeORM.node_id == node_id)
+                    .values(last_heartbeat_at=utcnow_sql(), health_status=health_status)
+                )
+            result = session.execute(stmt)
+            if result.rowcount == 0:
                 raise ExecutionConcurrencyError(f"Node {node_id} not found")
             
-            orm.last_heartbeat_at = datetime.now(timezone.utc)
             session.commit()
         except SQLAlchemyError as e:
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to update heartbeat: {e}") from e
         finally:
-            session.close()
\ No newline at end of file
+            self._invalidate_node(node_id)
+            release_session(session)
@@ -0,0 +1,122 @@
+#execution_engine\infrastructure\postgres\notify.py
+
+"""PostgreSQL LISTEN/NOTIFY helper for waking background services."""
+
+import logging
+import select
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.extensions
+
+from execution_engine.infrastructure.postgres.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pause after a failed wait before the caller's next attempt (seconds)
+RECONNECT_DELAY = 2.0
+
+
+class NotificationListener:
+    """
+    Waits for NOTIFY events on one or more channels.
+
+    Background services use this instead of a blind sleep: wait() returns
+    as soon as a notification arrives, or after the timeout as a heartbeat.
+    If the connection is lost, wait() pauses briefly (RECONNECT_DELAY)
+    and returns empty, so the caller falls back to its poll, and the
+    listener reconnects on the next call.
+    """
+
+    def __init__(self, channels: Iterable[str], dsn: Optional[str] = None):
+        """
+        Initialize listener.
+
+        Args:
+            channels: Channel names to LISTEN on
+            dsn: Connection string (defaults to settings.direct_database_url,
+                since LISTEN does not survive PgBouncer transaction pooling)
+        """
+        self._channels = list(channels)
+        self._dsn = dsn or settings.direct_database_url
+        self._conn = None
+
+    def listen(self) -> None:
+        """
+        Open the LISTEN connection now rather than on the first wait.
+
+        Services call this before their first cycle, so a notification
+        raised while that cycle runs is buffered instead of missed. A
+        failure is only logged; the next wait retries.
+        """
+        try:
+            self._connect()
+        except (psycopg2.Error, OSError) as e:
+            logger.warning(f"[listener] LISTEN connection failed: {e}")
+            self.close()
+
+    def wait(self, timeout: float) -> List[str]:
+        """
+        Block until a notification arrives or timeout elapses.
+
+        Args:
+            timeout: Maximum time to wait (seconds)
+
+        Returns:
+            Channels that were notified (empty on timeout)
+        """
+        return [channel for channel, _ in self.wait_payloads(timeout)]
+
+    def wait_payloads(self, timeout: float) -> List[Tuple[str, str]]:
+        """
+        Like wait(), but keep each notification's payload.
+
+        Args:
+            timeout: Maximum time to wait (seconds)
+
+        Returns:
+            (channel, payload) pairs in arrival order (empty on timeout)
+        """
+        try:
+            conn = self._connect()
+
+            # Notifications may already be buffered from a previous poll
+            if not conn.notifies:
+                if select.select([conn], [], [], timeout) == ([], [], []):
+                    return []
+                conn.poll()
+
+            notifications = [(n.channel, n.payload) for n in conn.notifies]
+            conn.notifies.clear()
+            return notifications
+
+        except (psycopg2.Error, OSError) as e:
+            logger.warning(f"[listener] LISTEN connection failed: {e}")
+            self.close()
+            time.sleep(min(timeout, RECONNECT_DELAY))
+            return []
+
+    def close(self) -> None:
+        """Close the listening connection."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except psycopg2.Error:
+                pass
+            self._conn = None
+
+    def _connect(self):
+        """Open the LISTEN connection if needed."""
+        if self._conn is None or self._conn.closed:
+            conn = psycopg2.connect(self._dsn)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+
+            with conn.cursor() as cursor:
+                for channel in self._channels:
+                    cursor.execute(f"LISTEN {channel}")
+
+            self._conn = conn
+            logger.info(f"[listener] listening on {', '.join(self._channels)}")
+
+        return self._conn
@@ -2,11 +2,13 @@
 
 """PostgreSQL repository implementation using SQLAlchemy."""
 
-from datetime import datetime, timedelta
-from typing import Iterable, Optional, Callable
+import logging
+from dataclasses import fields
+from datetime import timedelta
+from typing import Iterable, List, Optional, Callable
 from uuid import UUID
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, insert, lambda_stmt, or_, select, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -18,70 +20,30 @@ from execution_engine.core.errors import (
     ExecutionNotFound,
     ExecutionAlreadyExists,
 )
-from execution_engine.infrastructure.postgres.database import SessionLocal
-from execution_engine.infrastructure.postgres.models import ExecutionORM
+from execution_engine.infrastructure.postgres.database import ScopedSession, release_session
+from execution_engine.infrastructure.postgres.converters import build_to_domain, build_to_orm
+from execution_engine.infrastructure.postgres.models import ExecutionORM, utcnow_sql
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip by list queries; rows are converted and
+# released batch by batch instead of all being held at once
+LIST_YIELD_PER = 500
 
 
 # ============================================
 # Mapping Functions
 # ============================================
 
-def orm_to_domain(orm: ExecutionORM) -> Execution:
-    """Convert ORM model to domain model."""
-    return Execution(
-        execution_id=orm.execution_id,
-        tenant_id=orm.tenant_id,
-        application_id=orm.application_id,
-        deployment_id=orm.deployment_id,
-        step_execution_id=orm.step_execution_id,
-        execution_type=orm.execution_type,
-        target_resource_id=orm.target_resource_id,
-        runtime_type=orm.runtime_type,
-        spec=orm.spec,
-        state=orm.state,
-        created_at=orm.created_at,
-        queued_at=orm.queued_at,
-        claimed_at=orm.claimed_at,
-        started_at=orm.started_at,
-        finished_at=orm.finished_at,
-        lease_owner=orm.lease_owner,
-        lease_expires_at=orm.lease_expires_at,
-        deployment_result=orm.deployment_result,
-        error_message=orm.error_message,
-        retry_count=orm.retry_count,
-        max_retries=orm.max_retries,
-        priority=orm.priority,
-        version=orm.version,
-    )
+# Table columns in Execution field order - list queries select these and
+# build each domain object positionally, skipping ORM instances entirely
+EXECUTION_COLUMNS = tuple(ExecutionORM.__table__.c[f.name] for f in fields(Execution))
 
 
-def domain_to_orm(execution: Execution) -> ExecutionORM:
-    """Convert domain model to ORM model."""
-    return ExecutionORM(
-        execution_id=execution.execution_id,
-        tenant_id=execution.tenant_id,
-        application_id=execution.application_id,
-        deployment_id=execution.deployment_id,
-        step_execution_id=execution.step_execution_id,
-        execution_type=execution.execution_type,
-        target_resource_id=execution.target_resource_id,
-        runtime_type=execution.runtime_type,
-        spec=execution.spec,
-        state=execution.state,
-        created_at=execution.created_at,
-        queued_at=execution.queued_at,
-        claimed_at=execution.claimed_at,
-        started_at=execution.started_at,
-        finished_at=execution.finished_at,
-        lease_owner=execution.lease_owner,
-        lease_expires_at=execution.lease_expires_at,
-        deployment_result=execution.deployment_result,
-        error_message=execution.error_message,
-        retry_count=execution.retry_count,
-        max_retries=execution.max_retries,
-        priority=execution.priority,
-        version=execution.version,
-    )
+# Field-by-field copies generated from the Execution dataclass, so adding
+# a field only needs the matching ExecutionORM column
+orm_to_domain = build_to_domain(Execution, "orm_to_domain")
+domain_to_orm = build_to_orm(Execution, ExecutionORM, "domain_to_orm")
 
 
 # ============================================
@@ -98,10 +60,10 @@ class PostgresExecutionRepository(ExecutionRepository):
         Args:
             session_factory: SQLAlchemy session factory. If None, uses default production factory.
         """
-        self._session_factory = session_factory or SessionLocal
+        self._session_factory = session_factory or ScopedSession
     
     def _get_session(self) -> Session:
-        """Get new session from the injected factory."""
+        """Get the thread/request session from the injected factory."""
         return self._session_factory()
     
     # -------------------------
@@ -115,7 +77,7 @@ class PostgresExecutionRepository(ExecutionRepository):
             orm = domain_to_orm(execution)
             session.add(orm)
             session.commit()
-            print(f"[postgres] create {execution.execution_id} -> done")
+            logger.debug("[postgres] create %s -> done", execution.execution_id)
         except IntegrityError as e:
             session.rollback()
             raise ExecutionAlreadyExists(
@@ -125,7 +87,29 @@ class PostgresExecutionRepository(ExecutionRepository):
             session.rollback()
             raise ExecutionConcurrencyError(f"Failed to create execution: {e}") from e
         finally:
-            session.close()
+            release_session(session)
+    
+    def create_many(self, executions: List[Execution]) -> None:
+        """Create executions in a single INSERT statement."""
+        if not executions:
+            return
+        
+        session = self._get_session()
+        try:
+            rows = [{c.key: getattr(e, c.key) for c in EXECUTION_COLUMNS} for e in executions]
+            session.execute(insert(ExecutionORM), rows)
+            session.commit()
+            logger.debug("[postgres] create_many %s execution(s) -> done", len(executions))
+        except IntegrityError as e:
+            session.rollback()
+            raise ExecutionAlreadyExists(
+                f"One of {len(executions)} executions already exists"
+            ) from e
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise ExecutionConcurrencyError(f"Failed to create executions: {e}") from e
+        finally:
+            release_session(session)
     
     # -------------------------
     # READ
@@ -138,13 +122,13 @@ class PostgresExecutionRepository(ExecutionRepository):
             orm = session.get(ExecutionORM, execution_id)
             
             if orm is None:
-                print(f"[postgres] get {execution_id} -> not found")
+                logger.debug("[postgres] get %s -> not found", execution_id)
                 return None
             
-            print(f"[postgres] get {execution_id} -> found")
+            logger.debug("[postgres] get %s -> found", execution_id)
             return orm_to_domain(orm)
         finally:
-            session.close()
+            release_session(session)
     
     # -------------------------
     # LIST BY STATE
@@ -159,24 +143,23 @@ class PostgresExecutionRepository(ExecutionRepository):
         """List executions by state."""
         session = self._get_session()
         try:
-            query = session.query(ExecutionORM).filter(
-                ExecutionORM.state == state
-            )
+            stmt = select(*EXECUTION_COLUMNS).where(ExecutionORM.state == state)
             
             if tenant_id:
-                query = query.filter(ExecutionORM.tenant_id == tenant_id)
+                stmt = stmt.where(ExecutionORM.tenant_id == tenant_id)
             
-            query = query.order_by(
+            stmt = stmt.order_by(
                 ExecutionORM.priority.desc(),
                 ExecutionORM.created_at.asc()
-            ).limit(limit)
+            ).limit(limit).execution_options(yield_per=LIST_YIELD_PER)
             
-            results = query.all()
-            print(f"[postgres] list_by_state state={state.value} -> {len(results)} rows")
+            results = [Execution(*row) for row in session.execute(stmt)]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[postgres] list_by_state state=%s -> %s rows", state.value, len(results))
             
-            return [orm_to_domain(orm) for orm in results]
+            return results
         finally:
-            session.close()
+            release_session(session)
     
     # -------------------------
     # CLAIM
@@ -191,41 +174,40 @@ class PostgresExecutionRepository(ExecutionRepository):
         """Atomically claim an execution."""
         session = self._get_session()
         try:
-            now = datetime.utcnow()
-            lease_expires_at = now + timedelta(seconds=lease_seconds)
-            
-            # Get execution with row lock
-            execution_orm = session.query(ExecutionORM).filter(
-                ExecutionORM.execution_id == execution_id
-            ).with_for_update().first()
-            
-            if not execution_orm:
-                return False
-            
-            # Check if claimable
-            if execution_orm.state != ExecutionState.QUEUED:
-                return False
-            
-            if execution_orm.lease_expires_at and execution_orm.lease_expires_at > now:
-                return False
-            
-            # Claim it
-            execution_orm.state = ExecutionState.CLAIMED
-            execution_orm.lease_owner = worker_id
-            execution_orm.lease_expires_at = lease_expires_at
-            execution_orm.claimed_at = now
-            execution_orm.version += 1
+            lease = timedelta(seconds=lease_seconds)
+            
+            # Claimability is checked by the UPDATE itself - no row lock held.
+            # lambda_stmt: statement built and cache-keyed once per process
+            result = session.execute(lambda_stmt(
+                lambda: update(ExecutionORM)
+                .where(
+                    ExecutionORM.execution_id == execution_id,
+                    ExecutionORM.state == ExecutionState.QUEUED,
+                    or_(
+                        ExecutionORM.lease_expires_at.is_(None),
+                        ExecutionORM.lease_expires_at <= utcnow_sql(),
+                    ),
+                )
+                .values(
+                    state=ExecutionState.CLAIMED,
+                    lease_owner=worker_id,
+                    lease_expires_at=utcnow_sql() + lease,
+                    claimed_at=utcnow_sql(),
+                    version=ExecutionORM.version + 1,
+                )
+            ))
             
+            claimed = result.rowcount > 0
             session.commit()
-            print(f"[postgres] try_claim {execution_id} by {worker_id} -> True")
-            return True
+            logger.debug("[postgres] try_claim %s by %s -> %s", execution_id, worker_id, claimed)
+            return claimed
             
         except Exception as e:
             session.rollback()
-            print(f"[postgres] try_claim {execution_id} by {worker_id} -> False (error: {e})")
+            logger.warning("[postgres] try_claim %s by %s -> False (error: %s)", execution_id, worker_id, e)
             return False
         finally:
-            session.close()
+            release_session(session)
     
     # -------------------------
     # START
@@ -235,35 +217,28 @@ class PostgresExecutionRepository(ExecutionRepository):
         """Start execution."""
         session = self._get_session()
         try:
-            now = datetime.utcnow()
-            
-            # Get with lock
-            execution_orm = session.query(ExecutionORM).filter(
-                ExecutionORM.execution_id == execution_id
-            ).with_for_update().first()
-            
-            if not execution_orm:
-                raise ExecutionLeaseError(f"Execution {execution_id} not found")
+            result = session.execute(
+                update(ExecutionORM)
+                .where(
+                    ExecutionORM.execution_id == execution_id,
+                    ExecutionORM.state == ExecutionState.CLAIMED,
+                    ExecutionORM.lease_owner == worker_id,
+                    ExecutionORM.lease_expires_at > utcnow_sql(),
+                )
+                .values(
+                    state=ExecutionState.STARTED,
+                    started_at=utcnow_sql(),
+                    version=ExecutionORM.version + 1,
+                )
+            )
             
-            # Validate
-            if execution_orm.state != ExecutionState.CLAIMED:
+            if result.rowcount == 0:
                 raise ExecutionLeaseError(
-                    f"Execution not in CLAIMED state (current: {execution_orm.state.value})"
+                    f"Execution {execution_id} not found, not CLAIMED by {worker_id}, or lease expired"
                 )
             
-            if execution_orm.lease_owner != worker_id:
-                raise ExecutionLeaseError(f"Execution owned by {execution_orm.lease_owner}")
-            
-            if not execution_orm.lease_expires_at or execution_orm.lease_expires_at <= now:
-                raise ExecutionLeaseError("Lease expired")
-            
-            # Start it
-            execution_orm.state = ExecutionState.STARTED
-            execution_orm.started_at = now
-            execution_orm.version += 1
-            
             session.commit()
-            print(f"[postgres] start succeeded for {execution_id}")
+            logger.debug("[postgres] start succeeded for %s", execution_id)
             
         except ExecutionLeaseError:
             session.rollback()
@@ -272,7 +247,7 @@ class PostgresExecutionRepository(ExecutionRepository):
             session.rollback()
             raise ExecutionLeaseError(f"Failed to start execution: {e}") from e
         finally:
-            session.close()
+            release_session(session)
     
     # -------------------------
     # UPDATE
@@ -282,33 +257,34 @@ class PostgresExecutionRepository(ExecutionRepository):
         """Update execution with optimistic locking."""
         session = self._get_session()
         try:
-            # Get current version
-            current = session.query(ExecutionORM).filter(
-                and_(
+            # Version check and write in one statement - no row lock held
+            result = session.execute(
+                update(ExecutionORM)
+                .where(
                     ExecutionORM.execution_id == execution.execution_id,
-                    ExecutionORM.version == execution.version - 1
+                    ExecutionORM.version == execution.version - 1,
                 )
-            ).with_for_update().first()
+                .values(
+                    state=execution.state,
+                    lease_owner=execution.lease_owner,
+                    lease_expires_at=execution.lease_expires_at,
+                    queued_at=execution.queued_at,
+                    started_at=execution.started_at,
+                    finished_at=execution.finished_at,
+                    deployment_result=execution.deployment_result,
+                    error_message=execution.error_message,
+                    retry_count=execution.retry_count,
+                    version=execution.version,
+                )
+            )
             
-            if not current:
+            if result.rowcount == 0:
                 raise ExecutionConcurrencyError(
                     f"Update failed for {execution.execution_id} - concurrent modification"
                 )
             
-            # Update fields
-            current.state = execution.state
-            current.lease_owner = execution.lease_owner
-            current.lease_expires_at = execution.lease_expires_at
-            current.queued_at = execution.queued_at
-            current.started_at = execution.started_at
-            current.finished_at = execution.finished_at
-            current.deployment_result = execution.deployment_result
-            current.error_message = execution.error_message
-            current.retry_count = execution.retry_count
-            current.version = execution.version
-            
             session.commit()
-            print(f"[postgres] update {execution.execution_id} -> done")
+            logger.debug("[postgres] update %s -> done", execution.execution_id)
             
         except ExecutionConcurrencyError:
             session.rollback()
@@ -317,7 +293,7 @@ class PostgresExecutionRepository(ExecutionRepository):
             session.rollback()
             raise ExecutionConcurrencyError(f"Update failed: {e}") from e
         finally:
-            session.close()
+            release_session(session)
     
     # -------------------------
     # RENEW LEASE
@@ -332,27 +308,29 @@ class PostgresExecutionRepository(ExecutionRepository):
         """Renew lease."""
         session = self._get_session()
         try:
-            now = datetime.utcnow()
-            new_expires_at = now + timedelta(seconds=lease_seconds)
-            
-            execution_orm = session.query(ExecutionORM).filter(
-                ExecutionORM.execution_id == execution_id
-            ).with_for_update().first()
-            
-            if not execution_orm:
-                raise ExecutionLeaseError(f"Execution {execution_id} not found")
-            
-            if execution_orm.lease_owner != worker_id:
-                raise ExecutionLeaseError(f"Execution owned by {execution_orm.lease_owner}")
-            
-            if not execution_orm.lease_expires_at or execution_orm.lease_expires_at <= now:
-                raise ExecutionLeaseError("Lease already expired")
+            lease = timedelta(seconds=lease_seconds)
+            
+            # Ownership and expiry are checked by the UPDATE itself - no row lock
+            result = session.execute(lambda_stmt(
+                lambda: update(ExecutionORM)
+                .where(
+                    ExecutionORM.execution_id == execution_id,
+                    ExecutionORM.lease_owner == worker_id,
+                    ExecutionORM.lease_expires_at > utcnow_sql(),
+                )
+                .values(
+                    lease_expires_at=utcnow_sql() + lease,
+                    version=ExecutionORM.version + 1,
+                )
+            ))
             
-            execution_orm.lease_expires_at = new_expires_at
-            execution_orm.version += 1
+            if result.rowcount == 0:
+                raise ExecutionLeaseError(
+                    f"Execution {execution_id} not found, not owned by {worker_id}, or lease expired"
+                )
             
             session.commit()
-            print(f"[postgres] renew_lease {execution_id} -> {new_expires_at}")
+            logger.debug("[postgres] renew_lease %s by %s -> +%ss", execution_id, worker_id, lease_seconds)
             
         except ExecutionLeaseError:
             session.rollback()
@@ -361,29 +339,42 @@ class PostgresExecutionRepository(ExecutionRepository):
             session.rollback()
             raise ExecutionLeaseError(f"Failed to renew lease: {e}") from e
         finally:
-            session.close()
+            release_session(session)
     
     # -------------------------
     # RECOVERABLE
     # -------------------------
     
     def list_recoverable(self, limit: int = 100) -> Iterable[Execution]:
-        """List recoverable executions."""
+        """
+        List recoverable executions, oldest expired lease first.
+        
+        Rows another worker is claiming right now (row-locked by its
+        UPDATE) are skipped rather than waited on, so concurrent recovery
+        workers walk past each other instead of queueing on the same row.
+        """
         session = self._get_session()
         try:
-            now = datetime.utcnow()
-            
-            results = session.query(ExecutionORM).filter(
+            # Served by ix_executions_recoverable_lookup (partial on STARTED)
+            stmt = select(*EXECUTION_COLUMNS).where(
                 and_(
                     ExecutionORM.state == ExecutionState.STARTED,
-                    ExecutionORM.lease_expires_at <= now
+                    ExecutionORM.lease_expires_at <= utcnow_sql()
                 )
-            ).limit(limit).all()
+            ).order_by(
+                ExecutionORM.lease_expires_at.asc()
+            ).limit(limit).with_for_update(
+                skip_locked=True
+            ).execution_options(yield_per=LIST_YIELD_PER)
+            
+            results = [Execution(*row) for row in session.execute(stmt)]
             
-            print(f"[postgres] list_recoverable -> {len(results)} rows")
-            return [orm_to_domain(orm) for orm in results]
+            # Drop the row locks now - a request-scoped session stays open
+            session.commit()
+            logger.debug("[postgres] list_recoverable -> %s rows", len(results))
+            return results
         finally:
-            session.close()
+            release_session(session)
     
     # -------------------------
     # FINALIZE
@@ -401,29 +392,30 @@ class PostgresExecutionRepository(ExecutionRepository):
         
         session = self._get_session()
         try:
-            now = datetime.utcnow()
-            
-            execution_orm = session.query(ExecutionORM).filter(
-                ExecutionORM.execution_id == execution_id
-            ).with_for_update().first()
-            
-            if not execution_orm:
-                raise ExecutionLeaseError(f"Execution {execution_id} not found")
-            
-            if execution_orm.lease_owner != worker_id:
-                raise ExecutionLeaseError(f"Execution owned by {execution_orm.lease_owner}")
-            
-            if not execution_orm.lease_expires_at or execution_orm.lease_expires_at <= now:
-                raise ExecutionLeaseError("Lease expired")
+            result = session.execute(
+                update(ExecutionORM)
+                .where(
+                    ExecutionORM.execution_id == execution_id,
+                    ExecutionORM.lease_owner == worker_id,
+                    ExecutionORM.lease_expires_at > utcnow_sql(),
+                )
+                .values(
+                    state=final_state,
+                    finished_at=utcnow_sql(),
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    version=ExecutionORM.version + 1,
+                )
+            )
             
-            execution_orm.state = final_state
-            execution_orm.finished_at = now
-            execution_orm.lease_owner = None
-            execution_orm.lease_expires_at = None
-            execution_orm.version += 1
+            if result.rowcount == 0:
+                raise ExecutionLeaseError(
+                    f"Execution {execution_id} not found, not owned by {worker_id}, or lease expired"
+                )
             
             session.commit()
-            print(f"[postgres] finalize {execution_id} -> {final_state.value}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[postgres] finalize %s -> %s", execution_id, final_state.value)
             
         except ExecutionLeaseError:
             session.rollback()
@@ -432,4 +424,4 @@ class PostgresExecutionRepository(ExecutionRepository):
             session.rollback()
             raise ExecutionLeaseError(f"Failed to finalize: {e}") from e
         finally:
-            session.close()
\ No newline at end of file
+            release_session(session)
\ No newline at end of file
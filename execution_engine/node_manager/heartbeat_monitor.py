@@ -0,0 +1,142 @@
+#execution_engine\node_manager\heartbeat_monitor.py
+
+"""Push-driven detection of nodes that stopped sending heartbeats."""
+
+import logging
+import signal
+import time
+from typing import Dict, Optional
+from uuid import UUID
+
+from execution_engine.infrastructure.postgres.node_repository import NodeRepository
+from execution_engine.infrastructure.postgres.notify import NotificationListener
+from execution_engine.node_manager.service import NodeManagerService
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel raised with the node_id whenever a node's heartbeat is written
+NODE_HEARTBEAT_CHANNEL = "node_heartbeat"
+
+# Reload heartbeats from the database this often (seconds), to pick up
+# status changes and anything missed while the LISTEN connection was down
+RESYNC_INTERVAL = 300
+
+# Least time between sweeps that marked nothing (seconds), so a node the
+# cache thinks stale but the database does not cannot make the loop spin
+MIN_SWEEP_INTERVAL = 5.0
+
+
+class NodeHeartbeatMonitor:
+    """
+    Marks nodes offline once their heartbeat is older than the threshold.
+    
+    Keeps {node_id: deadline} in memory - the monotonic time at which the
+    node's heartbeat crosses the threshold - updated by NOTIFY
+    node_heartbeat, and sleeps until the earliest deadline. The stale
+    sweep (check_stale_nodes) only runs then, rather than on a fixed poll.
+    
+    Heartbeat ages come from the database clock (list_heartbeat_ages), the
+    one the sweep compares against; this host's wall clock is never used.
+    """
+    
+    def __init__(
+        self,
+        node_manager_service: NodeManagerService,
+        node_repo: NodeRepository,
+        stale_threshold_minutes: int = 5,
+    ):
+        """
+        Initialize monitor.
+        
+        Args:
+            node_manager_service: Service whose check_stale_nodes() does the sweep
+            node_repo: Repository used to load heartbeats
+            stale_threshold_minutes: Heartbeat age at which a node goes offline
+        """
+        self._node_manager_service = node_manager_service
+        self._node_repo = node_repo
+        self._stale_threshold_minutes = stale_threshold_minutes
+        self._threshold = stale_threshold_minutes * 60.0
+        self._stop_requested = False
+        
+        self._deadlines: Dict[UUID, float] = {}
+        self._synced_at: Optional[float] = None
+        # No sweep before this (monotonic); set after a sweep that marked nothing
+        self._next_sweep_at = 0.0
+        
+        self._listener = NotificationListener([NODE_HEARTBEAT_CHANNEL])
+    
+    def start(self) -> None:
+        """Run the monitor loop until SIGINT/SIGTERM."""
+        logger.info("Node heartbeat monitor started (threshold: %s min)", self._stale_threshold_minutes)
+        
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+        
+        # LISTEN before the first resync, so no heartbeat falls in between
+        self._listener.listen()
+        
+        while not self._stop_requested:
+            try:
+                self._cycle()
+            except Exception as e:
+                logger.error("Error in heartbeat monitor cycle: %s", e, exc_info=True)
+                self._synced_at = None  # Reload from the database next time
+                time.sleep(1)
+        
+        self._listener.close()
+        logger.info("Node heartbeat monitor stopped")
+    
+    def _signal_handler(self, signum, frame):
+        """Handle shutdown signals."""
+        logger.info("Received signal %s, stopping...", signum)
+        self._stop_requested = True
+    
+    def _cycle(self) -> None:
+        """Sweep if a heartbeat has gone stale, then wait for the next event."""
+        if self._synced_at is None or time.monotonic() - self._synced_at >= RESYNC_INTERVAL:
+            self._resync()
+        
+        now = time.monotonic()
+        if self._deadlines and min(self._deadlines.values()) <= now and now >= self._next_sweep_at:
+            stale = self._node_manager_service.check_stale_nodes(self._stale_threshold_minutes)
+            if stale:
+                logger.warning(
+                    "Marked %s node(s) offline: %s",
+                    len(stale), ", ".join(node.node_name for node in stale),
+                )
+            else:
+                self._next_sweep_at = now + MIN_SWEEP_INTERVAL
+            # The sweep may have skipped nodes the cache thought stale
+            # (status changed elsewhere) - reload rather than guess
+            self._resync()
+        
+        notifications = self._listener.wait_payloads(self._next_timeout())
+        if not notifications:
+            return
+        
+        # One clock read for the whole batch of heartbeats
+        deadline = time.monotonic() + self._threshold
+        for _, payload in notifications:
+            try:
+                node_id = UUID(payload)
+            except ValueError:
+                continue
+            self._deadlines[node_id] = deadline
+    
+    def _resync(self) -> None:
+        """Reload all heartbeat ages from the database."""
+        ages = self._node_repo.list_heartbeat_ages()
+        now = time.monotonic()
+        self._deadlines = {node_id: now + self._threshold - age for node_id, age in ages.items()}
+        self._synced_at = now
+        logger.debug("Tracking heartbeats of %s node(s)", len(self._deadlines))
+    
+    def _next_timeout(self) -> float:
+        """Seconds until the earliest deadline (or next allowed sweep), capped by the next resync."""
+        now = time.monotonic()
+        timeout = RESYNC_INTERVAL - (now - self._synced_at)
+        if self._deadlines:
+            sweep_at = max(min(self._deadlines.values()), self._next_sweep_at)
+            timeout = min(timeout, sweep_at - now)
+        return max(timeout, 0.0)
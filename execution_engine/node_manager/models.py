@@ -5,7 +5,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Optional
 from uuid import UUID
 
 
@@ -31,7 +31,21 @@ class NodeHealthStatus(Enum):
     UNKNOWN = "UNKNOWN"
 
 
-@dataclass
+class PlacementStrategy(Enum):
+    """How a node is chosen among those with enough free capacity."""
+    BEST_FIT = "BEST_FIT"          # Least spare CPU/memory - packs nodes tightly
+    LEAST_LOADED = "LEAST_LOADED"  # Fewest active containers - spreads load
+
+
+@dataclass(frozen=True, slots=True)
+class CapacityRequest:
+    """Capacity one container needs on a node."""
+    cpu: float  # cores
+    memory: int  # MB
+    storage: int  # GB
+
+
+@dataclass(slots=True)
 class InfrastructureNode:
     """Infrastructure node (server/VM running containers)."""
     node_id: UUID
@@ -43,7 +57,7 @@ class InfrastructureNode:
     public_ip: Optional[str] = None
     
     
-    supported_runtimes: List[str] = field(default_factory=lambda: ["docker"])
+    supported_runtimes: FrozenSet[str] = frozenset({"docker"})
     
     total_cpu: float = 0.0  # cores
     total_memory: int = 0  # MB
@@ -2,22 +2,46 @@
 
 """Node manager service."""
 
-from typing import List, Optional
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
 
 from execution_engine.node_manager.models import (
-    InfrastructureNode, NodeStatus, NodeHealthStatus
+    CapacityRequest, InfrastructureNode, NodeStatus, NodeHealthStatus, PlacementStrategy
 )
 from execution_engine.infrastructure.postgres.node_repository import NodeRepository
 from execution_engine.core.errors import ExecutionValidationError
+from execution_engine.core.async_logging import install_queue_handler
+
+logger = logging.getLogger(__name__)
+install_queue_handler(logger)
 
 
 class NodeManagerService:
     """Service for managing infrastructure nodes."""
     
-    def __init__(self, node_repo: NodeRepository):
+    # Seconds a list_available_nodes() result is reused
+    AVAILABLE_CACHE_TTL = 1.0
+    
+    def __init__(
+        self,
+        node_repo: NodeRepository,
+        strategy: PlacementStrategy = PlacementStrategy.BEST_FIT,
+    ):
         self._node_repo = node_repo
+        self._strategy = strategy
+        
+        # {runtime_type: (expires_at, nodes)} - absorbs bursts of list calls
+        self._available_cache: Dict[Optional[str], Tuple[float, List[InfrastructureNode]]] = {}
+        self._available_cache_lock = threading.Lock()
+    
+    def _invalidate_available(self) -> None:
+        """Drop cached node lists after membership may have changed."""
+        with self._available_cache_lock:
+            self._available_cache.clear()
     
     # ============================================
     # NODE REGISTRATION
@@ -35,11 +59,12 @@ class NodeManagerService:
         # Set initial status
         node.status = NodeStatus.READY
         node.health_status = NodeHealthStatus.HEALTHY
-        node.last_heartbeat_at = datetime.now(timezone.utc)
+        node.last_heartbeat_at = datetime.now(timezone.utc).replace(tzinfo=None)  # naive UTC, as stored
         
         self._node_repo.create(node)
+        self._invalidate_available()
         
-        print(f"[node_manager] registered node {node.node_id} ({node.node_name})")
+        logger.info("[node_manager] registered node %s (%s)", node.node_id, node.node_name)
     
     def get_node(self, node_id: UUID) -> Optional[InfrastructureNode]:
         """Get node by ID."""
@@ -63,30 +88,67 @@ class NodeManagerService:
         """
         Select best node for deployment.
         
-        Strategy: Least loaded node with sufficient capacity.
+        Strategy: among nodes with sufficient capacity, the one ranked first
+        by the configured PlacementStrategy (best-fit by default).
         """
-        available_nodes = self._node_repo.list_available(runtime_type=runtime_type)
-        #print(f"[node_manager] available nodes {available_nodes}")
-        # Filter by capacity
-        suitable_nodes = [
-            node for node in available_nodes
-            if node.can_accommodate(required_cpu, required_memory, required_storage)
-        ]
-        #print(f"[node_manager] suitable nodes {suitable_nodes}")
-        if not suitable_nodes:
-            print(f"[node_manager] no suitable nodes found for {runtime_type}")
+        # Capacity filter and ranking both run in SQL
+        selected = self._node_repo.find_placement(
+            runtime_type=runtime_type,
+            required_cpu=required_cpu,
+            required_memory=required_memory,
+            required_storage=required_storage,
+            strategy=self._strategy,
+        )
+        
+        if selected is None:
+            logger.warning("[node_manager] no suitable nodes found for %s", runtime_type)
             return None
         
-        # Select least loaded
-        selected = min(suitable_nodes, key=lambda n: n.active_containers)
+        logger.debug("[node_manager] selected node %s (%s)", selected.node_id, selected.node_name)
+        
+        return selected
+    
+    def select_nodes(
+        self,
+        runtime_type: str,
+        requests: List[CapacityRequest],
+    ) -> List[Optional[InfrastructureNode]]:
+        """
+        Select nodes for several containers in one pass.
+        
+        Like select_node() per request, but the candidate nodes are read
+        once for the whole batch (largest requests placed first), and each
+        placement counts against its node for the rest of the batch.
+        
+        Returns:
+            Node per request (input order), None where no node had room
+        """
+        selected = self._node_repo.find_placements(
+            runtime_type=runtime_type,
+            requests=requests,
+            strategy=self._strategy,
+        )
         
-        print(f"[node_manager] selected node {selected.node_id} ({selected.node_name})")
+        unplaced = sum(node is None for node in selected)
+        if unplaced:
+            logger.warning("[node_manager] no suitable nodes found for %s of %s %s container(s)",
+                           unplaced, len(requests), runtime_type)
         
         return selected
     
     def list_available_nodes(self, runtime_type: Optional[str] = None) -> List[InfrastructureNode]:
-        """List all available nodes."""
-        return self._node_repo.list_available(runtime_type=runtime_type)
+        """List all available nodes (cached for AVAILABLE_CACHE_TTL seconds)."""
+        now = time.monotonic()
+        with self._available_cache_lock:
+            entry = self._available_cache.get(runtime_type)
+            if entry is not None and entry[0] > now:
+                return list(entry[1])
+        
+        nodes = self._node_repo.list_available(runtime_type=runtime_type)
+        
+        with self._available_cache_lock:
+            self._available_cache[runtime_type] = (now + self.AVAILABLE_CACHE_TTL, nodes)
+        return list(nodes)
     
     # ============================================
     # CAPACITY MANAGEMENT
@@ -101,26 +163,32 @@ class NodeManagerService:
         active_containers: int,
     ) -> None:
         """Update node capacity metrics."""
+        # Cached read is only for max_containers, fixed at registration
         node = self._node_repo.get(node_id)
         if not node:
             raise ExecutionValidationError(f"Node {node_id} not found")
         
-        node.update_capacity(
+        # Update status based on capacity
+        if active_containers >= node.max_containers:
+            status = NodeStatus.FULL
+        elif available_cpu < 0.5:  # Less than 0.5 CPU cores available
+            status = NodeStatus.FULL
+        else:
+            status = NodeStatus.READY
+        
+        # Targeted UPDATE - the cached copy is never written back
+        self._node_repo.update_capacity(
+            node_id,
             available_cpu=available_cpu,
             available_memory=available_memory,
             available_storage=available_storage,
             active_containers=active_containers,
+            status=status,
         )
         
-        # Update status based on capacity
-        if active_containers >= node.max_containers:
-            node.status = NodeStatus.FULL
-        elif node.available_cpu < 0.5:  # Less than 0.5 CPU cores available
-            node.status = NodeStatus.FULL
-        else:
-            node.status = NodeStatus.READY
-        
-        self._node_repo.update(node)
+        # READY <-> FULL moves the node in or out of the available list
+        if status != node.status:
+            self._invalidate_available()
     
     def report_heartbeat(
         self,
@@ -128,33 +196,27 @@ class NodeManagerService:
         health_status: NodeHealthStatus,
     ) -> None:
         """Update node heartbeat and health status."""
+        # Cached read is enough to decide whether the health changed
         node = self._node_repo.get(node_id)
         if not node:
             raise ExecutionValidationError(f"Node {node_id} not found")
         
-        node.health_status = health_status
-        node.last_heartbeat_at = datetime.now(timezone.utc)
+        # Timestamp from the database clock, as update_heartbeat() always does
+        self._node_repo.update_heartbeat(node_id, health_status=health_status)
         
-        self._node_repo.update(node)
+        if health_status != node.health_status:
+            self._invalidate_available()
     
     def check_stale_nodes(self, stale_threshold_minutes: int = 5) -> List[InfrastructureNode]:
         """
         Find nodes that haven't sent heartbeat recently.
         
-        Returns list of potentially offline nodes.
+        Stale nodes are marked OFFLINE/UNHEALTHY and returned.
         """
-        all_nodes = self._node_repo.list_available()
-        stale_cutoff = datetime.now(timezone.utc) - timedelta(minutes=stale_threshold_minutes)
-        
-        stale_nodes = [
-            node for node in all_nodes
-            if node.last_heartbeat_at and node.last_heartbeat_at < stale_cutoff
-        ]
-        
-        # Mark as offline
-        for node in stale_nodes:
-            node.status = NodeStatus.OFFLINE
-            node.health_status = NodeHealthStatus.UNHEALTHY
-            self._node_repo.update(node)
+        # Filter and mark offline in a single UPDATE (cutoff from the DB clock)
+        stale_nodes = self._node_repo.mark_stale_offline(timedelta(minutes=stale_threshold_minutes))
+        
+        if stale_nodes:
+            self._invalidate_available()
         
         return stale_nodes
\ No newline at end of file
@@ -1,9 +1,15 @@
 # execution_engine/orchestrator/deployment_orchestrator.py
 """Deployment orchestrator - coordinates multi-step deployments."""
 
+import logging
+import re
+import threading
 import time
-from typing import Dict, Any, Optional
-from uuid import UUID, uuid4
+from collections import OrderedDict
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import UUID
 from datetime import datetime, timezone
 
 from execution_engine.domain.service import DomainService
@@ -12,9 +18,108 @@ from execution_engine.domain.models import (
     DeployedResource, ResourceType, ApplicationStatus
 )
 from execution_engine.core.service import ExecutionService
+from execution_engine.core.ids import new_id
 from execution_engine.core.models import Execution, ExecutionState
+from execution_engine.node_manager.models import CapacityRequest, InfrastructureNode
 from execution_engine.node_manager.service import NodeManagerService
-from execution_engine.infrastructure.postgres.domain_repository import DeploymentRepository
+from execution_engine.infrastructure.postgres.database import shared_transaction
+from execution_engine.infrastructure.postgres.domain_repository import (
+    DeployedResourceRepository, DeploymentRepository
+)
+from execution_engine.core.async_logging import install_queue_handler
+
+logger = logging.getLogger(__name__)
+# Records are queued and written by a background thread, off the step path
+install_queue_handler(logger)
+
+
+# Memory suffix -> MB multiplier; no suffix (None) means MB
+_MEMORY_UNITS_MB = {"Gi": 1024, "Mi": 1, "G": 1024, "M": 1, None: 1}
+_MEMORY_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(Gi|Mi|G|M)?\s*$")
+
+
+@lru_cache(maxsize=1024)
+def _parse_memory(memory_str: str) -> int:
+    """
+    Parse memory string (e.g., '512Mi', '1Gi', '256') to MB.
+    
+    Raises:
+        ValueError: If the string is not a number with an optional unit
+    """
+    match = _MEMORY_RE.match(memory_str)
+    if match is None:
+        raise ValueError(f"Invalid memory value: {memory_str!r}")
+    return int(float(match.group(1)) * _MEMORY_UNITS_MB[match.group(2)])
+
+
+# Storage reserved per container (GB)
+CONTAINER_STORAGE_GB = 1
+
+
+def _container_requirements(spec: Dict[str, Any]) -> CapacityRequest:
+    """
+    Resource needs of a container spec.
+    
+    One pass over spec["resources"]; memory strings go through the
+    memoized _parse_memory.
+    """
+    resources = spec.get("resources")
+    if not resources:
+        return CapacityRequest(0.5, _parse_memory("512Mi"), CONTAINER_STORAGE_GB)
+    return CapacityRequest(
+        float(resources.get("cpu", "0.5")),
+        _parse_memory(resources.get("memory", "512Mi")),
+        CONTAINER_STORAGE_GB,
+    )
+
+
+def _step_layers(steps: List[Any]) -> List[List[Any]]:
+    """
+    Group steps into dependency layers (Kahn's algorithm).
+    
+    Every step's depends_on entries sit in earlier layers, so the steps of
+    one layer are independent of each other. Within a layer, steps keep
+    the order of the input list.
+    
+    Raises:
+        ValueError: On a dependency that is not a step, or a cycle
+    """
+    known = {step.step_id for step in steps}
+    remaining = {}
+    for step in steps:
+        missing = set(step.depends_on) - known
+        if missing:
+            raise ValueError(f"Step {step.step_id} depends on unknown step(s): {', '.join(sorted(missing))}")
+        remaining[step.step_id] = set(step.depends_on)
+    
+    layers = []
+    pending = list(steps)
+    while pending:
+        layer = [step for step in pending if not remaining[step.step_id]]
+        if not layer:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(s.step_id for s in pending)}")
+        
+        done = {step.step_id for step in layer}
+        pending = [step for step in pending if step.step_id not in done]
+        for step in pending:
+            remaining[step.step_id] -= done
+        layers.append(layer)
+    
+    return layers
+
+
+@dataclass
+class _StepWrites:
+    """Rows produced by a deployment's steps, written together at the end."""
+    executions: List[Execution] = field(default_factory=list)
+    resources: List[DeployedResource] = field(default_factory=list)
+    # Node chosen for each container step: {step_id: node}
+    placements: Dict[str, InfrastructureNode] = field(default_factory=dict)
+    
+    def add(self, execution: Execution, resource: DeployedResource) -> None:
+        """Record one container step's rows."""
+        self.executions.append(execution)
+        self.resources.append(resource)
 
 
 class DeploymentOrchestrator:
@@ -23,26 +128,63 @@ class DeploymentOrchestrator:
     
     Flow:
     1. Get deployment from domain service
-    2. For each step in order:
+    2. Select infrastructure nodes for all container steps (one batch)
+    3. For each step in order:
        a. Check dependencies completed
-       b. Select infrastructure node
-       c. Create execution
-       d. Wait for execution to complete
-       e. Store step result
-    3. Mark deployment as complete
+       b. Create execution
+       c. Wait for execution to complete
+       d. Store step result
+    4. Mark deployment as complete
     """
     
+    # Step layers kept for this many template revisions
+    LAYER_CACHE_SIZE = 256
+    
     def __init__(
         self,
         domain_service: DomainService,
         execution_service: ExecutionService,
         node_manager_service: NodeManagerService,
         deployment_repo: DeploymentRepository,
+        deployed_resource_repo: Optional[DeployedResourceRepository] = None,
     ):
         self._domain_service = domain_service
         self._execution_service = execution_service
         self._node_manager_service = node_manager_service
         self._deployment_repo = deployment_repo
+        self._deployed_resource_repo = deployed_resource_repo or DeployedResourceRepository()
+        
+        # {(template_id, updated_at): step layers}, LRU order
+        self._layer_cache: OrderedDict[Tuple[str, datetime], List[List[Any]]] = OrderedDict()
+        self._layer_cache_lock = threading.Lock()
+    
+    def _get_step_layers(self, template) -> List[List[Any]]:
+        """
+        Get the template's dependency layers, computed once per template revision.
+        
+        Keyed like the template repository's cache, by updated_at, so an
+        edited template gets fresh layers even without a version bump.
+        deployment_steps arrive sorted by order (orm_to_template), so each
+        layer lists its steps in step order.
+        
+        Raises:
+            ValueError: If the template's steps have a bad dependency (see _step_layers)
+        """
+        key = (template.template_id, template.updated_at)
+        with self._layer_cache_lock:
+            layers = self._layer_cache.get(key)
+            if layers is not None:
+                self._layer_cache.move_to_end(key)
+                return layers
+        
+        layers = _step_layers(template.deployment_steps)
+        
+        with self._layer_cache_lock:
+            self._layer_cache[key] = layers
+            while len(self._layer_cache) > self.LAYER_CACHE_SIZE:
+                self._layer_cache.popitem(last=False)
+        
+        return layers
     
     def start_deployment(self, deployment_id: UUID) -> None:
         """
@@ -58,7 +200,7 @@ class DeploymentOrchestrator:
         if not deployment:
             raise ValueError(f"Deployment {deployment_id} not found")
         
-        print(f"[orchestrator] starting deployment {deployment_id}")
+        logger.info("[orchestrator] starting deployment %s", deployment_id)
         
         # Get template
         template = self._domain_service.get_template(deployment.template_id)
@@ -70,26 +212,39 @@ class DeploymentOrchestrator:
         deployment.started_at = datetime.now(timezone.utc)
         self._deployment_repo.update(deployment)
         
-        print(f"[orchestrator] deployment has {len(template.deployment_steps)} steps")
+        logger.debug("[orchestrator] deployment has %s steps", len(template.deployment_steps))
+        
+        # Index resolved step configs once (first entry wins, as the old scan did)
+        steps_by_id: Dict[str, Dict[str, Any]] = {}
+        for step in deployment.resolved_config.get("steps", []):
+            steps_by_id.setdefault(step["step_id"], step)
+        
+        writes = _StepWrites()
         
         try:
-            # Execute steps sequentially (create executions)
-            for step_def in sorted(template.deployment_steps, key=lambda s: s.order):
-                print(f"[orchestrator] processing step {step_def.order}: {step_def.step_id}")
-                
-                try:
-                    self._execute_step(deployment, step_def)
-                except Exception as e:
-                    print(f"[orchestrator] step {step_def.step_id} failed: {e}")
-                    raise
+            layers = self._get_step_layers(template)
+            
+            # Every container's node is chosen in one batch
+            self._place_containers(template, steps_by_id, writes)
+            
+            # Layer by layer, so every step runs after its dependencies. Steps
+            # only build rows in memory (no I/O), so they run one at a time.
+            for layer in layers:
+                for step_def in layer:
+                    self._run_step(deployment, step_def, steps_by_id, writes)
+            
+            self._flush_step_writes(writes)
             
             # ✅ REMOVE ALL STATUS UPDATES HERE
             # Status updater will handle them!
             
-            print(f"[orchestrator] all executions queued, status updater will monitor")
+            logger.info("[orchestrator] all executions queued, status updater will monitor")
             
         except Exception as e:
-            print(f"[orchestrator] deployment {deployment_id} failed during orchestration: {e}")
+            logger.error(
+                "[orchestrator] deployment %s failed during orchestration: %s",
+                deployment_id, e, exc_info=True,
+            )
             
             # ✅ Only mark as FAILED if orchestration itself fails
             # (not execution failures - status updater handles those)
@@ -100,20 +255,72 @@ class DeploymentOrchestrator:
             
             raise
   
-    def _execute_step(self, deployment, step_def) -> Dict[str, Any]:
+    def _place_containers(
+        self,
+        template,
+        steps_by_id: Dict[str, Dict[str, Any]],
+        writes: _StepWrites,
+    ) -> None:
+        """
+        Choose nodes for all container steps with one select_nodes() call.
+        
+        Placements land in writes.placements for _execute_container_step.
+        
+        Raises:
+            RuntimeError: If some container fits on no node
+        """
+        container_steps = [
+            step_def for step_def in template.deployment_steps
+            if step_def.step_type == "container" and step_def.step_id in steps_by_id
+        ]
+        if not container_steps:
+            return
+        
+        requests = [
+            _container_requirements(steps_by_id[step_def.step_id]["spec_template"])
+            for step_def in container_steps
+        ]
+        nodes = self._node_manager_service.select_nodes(runtime_type="docker", requests=requests)
+        
+        for step_def, node in zip(container_steps, nodes):
+            if node is not None:
+                writes.placements[step_def.step_id] = node
+        
+        if len(writes.placements) < len(container_steps):
+            raise RuntimeError("No suitable infrastructure node available")
+    
+    def _run_step(self, deployment, step_def, steps_by_id, writes: _StepWrites) -> Dict[str, Any]:
+        """Execute one step, logging which step failed."""
+        logger.debug("[orchestrator] processing step %s: %s", step_def.order, step_def.step_id)
+        
+        try:
+            return self._execute_step(deployment, step_def, steps_by_id, writes)
+        except Exception as e:
+            logger.warning("[orchestrator] step %s failed: %s", step_def.step_id, e)
+            raise
+    
+    def _execute_step(
+        self,
+        deployment,
+        step_def,
+        steps_by_id: Dict[str, Dict[str, Any]],
+        writes: _StepWrites,
+    ) -> Dict[str, Any]:
         """
         Execute a single deployment step.
         
+        Args:
+            deployment: Deployment being orchestrated
+            step_def: Template step definition
+            steps_by_id: Resolved step configs keyed by step_id
+            writes: Collects rows to persist once all steps succeed
+        
         Returns step result data.
         """
-        print(f"[orchestrator] executing step: {step_def.step_id}")
+        logger.debug("[orchestrator] executing step: %s", step_def.step_id)
         
         # Get step configuration from resolved config
-        step_config = None
-        for step in deployment.resolved_config.get("steps", []):
-            if step["step_id"] == step_def.step_id:
-                step_config = step
-                break
+        step_config = steps_by_id.get(step_def.step_id)
         
         if not step_config:
             raise ValueError(f"Step {step_def.step_id} not found in resolved config")
@@ -126,14 +333,14 @@ class DeploymentOrchestrator:
             return self._execute_database_step(deployment, step_def, step_config)
         
         elif step_def.step_type == "container":
-            return self._execute_container_step(deployment, step_def, step_config)
+            return self._execute_container_step(deployment, step_def, step_config, writes)
         
         else:
             raise ValueError(f"Unknown step type: {step_def.step_type}")
     
     def _execute_volume_step(self, deployment, step_def, step_config) -> Dict[str, Any]:
         """Execute volume creation step (simplified for MVP)."""
-        print(f"[orchestrator] creating volume: {step_config['spec_template']['volume_name']}")
+        logger.debug("[orchestrator] creating volume: %s", step_config['spec_template']['volume_name'])
         
         # For MVP: Just return success
         # In production: Create actual volume via Runtime Agent
@@ -143,7 +350,7 @@ class DeploymentOrchestrator:
             "status": "created"
         }
         
-        print(f"[orchestrator] volume created: {result}")
+        logger.debug("[orchestrator] volume created: %s", result)
         
         return result
     
@@ -151,7 +358,7 @@ class DeploymentOrchestrator:
         """Execute database provisioning step (simplified for MVP)."""
         spec = step_config["spec_template"]
         
-        print(f"[orchestrator] provisioning database: {spec['db_name']}")
+        logger.debug("[orchestrator] provisioning database: %s", spec['db_name'])
         
         # For MVP: Simulate DB provisioning
         # In production: Call database provisioning service
@@ -166,42 +373,30 @@ class DeploymentOrchestrator:
             "status": "ready"
         }
         
-        print(f"[orchestrator] database provisioned: {result}")
+        logger.debug("[orchestrator] database provisioned: %s", result)
         
         return result
     
-    def _execute_container_step(self, deployment, step_def, step_config) -> Dict[str, Any]:
+    def _execute_container_step(self, deployment, step_def, step_config, writes: _StepWrites) -> Dict[str, Any]:
         """
         Execute container deployment step.
         
-        Creates execution and tracks deployed resource.
+        Builds the execution and its deployed resource; both are persisted
+        by _flush_step_writes() once every step has been processed. The
+        node was already chosen by _place_containers().
         """
         spec = step_config["spec_template"]
+        container_name = spec["name"]
         
-        print(f"[orchestrator] deploying container: {spec['name']}")
-        
-        # Parse resource requirements
-        resources = spec.get("resources", {})
-        cpu = float(resources.get("cpu", "0.5"))
-        memory_str = resources.get("memory", "512Mi")
-        memory_mb = self._parse_memory(memory_str)
-        
-        # Select node
-        node = self._node_manager_service.select_node(
-            runtime_type="docker",
-            required_cpu=cpu,
-            required_memory=memory_mb,
-            required_storage=1,
-        )
+        logger.debug("[orchestrator] deploying container: %s", container_name)
         
-        if not node:
-            raise RuntimeError("No suitable infrastructure node available")
+        node = writes.placements[step_def.step_id]
         
-        print(f"[orchestrator] selected node: {node.node_name}")
+        logger.debug("[orchestrator] selected node: %s", node.node_name)
         
         # Create execution
         execution = Execution(
-            execution_id=uuid4(),
+            execution_id=new_id(),
             tenant_id=deployment.tenant_id,
             application_id=deployment.application_id,
             deployment_id=deployment.deployment_id,
@@ -214,15 +409,10 @@ class DeploymentOrchestrator:
             },
         )
         
-        # Register and queue execution
-        self._execution_service.register_execution(execution)
-        self._execution_service.queue_execution(execution.execution_id)
-        
-        print(f"[orchestrator] created execution {execution.execution_id}")
+        logger.debug("[orchestrator] created execution %s", execution.execution_id)
         
         # ✅ ADD: Track as deployed resource
-        from execution_engine.domain.models import DeployedResource, ResourceType, HealthStatus
-        from execution_engine.infrastructure.postgres.domain_repository import DeployedResourceRepository
+        from execution_engine.domain.models import HealthStatus
         
         # Convert health check to dict
         health_check_dict = None
@@ -239,12 +429,12 @@ class DeploymentOrchestrator:
             }
         
         deployed_resource = DeployedResource(
-            resource_id=uuid4(),
+            resource_id=new_id(),
             deployment_id=deployment.deployment_id,
             resource_type=ResourceType.CONTAINER,
             external_id="pending",  # Will be updated when execution completes
             node_id=node.node_id,
-            name=spec["name"],
+            name=container_name,
             spec={
                 **step_config,
                 'execution_id': str(execution.execution_id),
@@ -254,10 +444,9 @@ class DeploymentOrchestrator:
             health_status=HealthStatus.UNKNOWN,
         )
         
-        resource_repo = DeployedResourceRepository()
-        resource_repo.create(deployed_resource)
+        writes.add(execution, deployed_resource)
         
-        print(f"[orchestrator] tracked deployed resource {deployed_resource.resource_id}")
+        logger.debug("[orchestrator] tracked deployed resource %s", deployed_resource.resource_id)
         
         # Return result
         result = {
@@ -265,14 +454,27 @@ class DeploymentOrchestrator:
             'resource_id': str(deployed_resource.resource_id),
             'node_id': str(node.node_id),
             'node_name': node.node_name,
-            'container_name': spec["name"],
+            'container_name': container_name,
             'status': "queued",
         }
         
-        print(f"[orchestrator] container deployment queued: {result}")
+        logger.debug("[orchestrator] container deployment queued: %s", result)
         
         return result
    
+    def _flush_step_writes(self, writes: _StepWrites) -> None:
+        """
+        Persist the rows collected from all steps.
+        
+        Resources go first: the executor looks a resource up by execution_id
+        when its execution finishes, so it must exist before anything is
+        queued. Executions are then inserted already QUEUED in one statement.
+        Both inserts share one transaction, so a failure leaves neither.
+        """
+        with shared_transaction():
+            self._deployed_resource_repo.create_many(writes.resources)
+            self._execution_service.submit_executions(writes.executions)
+    
     def _wait_for_execution(
         self,
         execution_id: UUID,
@@ -296,7 +498,9 @@ class DeploymentOrchestrator:
         Raises:
             RuntimeError: If execution fails or times out
         """
-        start_time = datetime.now(timezone.utc)
+        # Only elapsed time matters here - monotonic clock, no datetimes
+        start_time = time.monotonic()
+        next_progress_log = 10.0
         poll_interval = 2  # seconds
         
         while True:
@@ -308,7 +512,7 @@ class DeploymentOrchestrator:
             
             # Check if completed
             if execution.state == ExecutionState.COMPLETED:
-                print(f"[orchestrator] execution {execution_id} completed successfully")
+                logger.info("[orchestrator] execution %s completed successfully", execution_id)
                 
                 result = {
                     "execution_id": str(execution.execution_id),
@@ -321,33 +525,21 @@ class DeploymentOrchestrator:
             # Check if failed
             if execution.state == ExecutionState.FAILED:
                 error_msg = execution.error_message or "Unknown error"
-                print(f"[orchestrator] execution {execution_id} failed: {error_msg}")
+                logger.warning("[orchestrator] execution %s failed: %s", execution_id, error_msg)
                 raise RuntimeError(f"Execution failed: {error_msg}")
             
             # Check timeout
-            elapsed = (datetime.now(timezone.utc) - start_time).total_seconds()
+            elapsed = time.monotonic() - start_time
             if elapsed > timeout_seconds:
                 raise RuntimeError(f"Execution timeout after {timeout_seconds}s (current state: {execution.state.value})")
             
             # Log progress
-            if elapsed % 10 == 0:  # Log every 10 seconds
-                print(f"[orchestrator] execution {execution_id} still running (state: {execution.state.value}, elapsed: {int(elapsed)}s)")
+            if elapsed >= next_progress_log:  # Log every 10 seconds
+                next_progress_log += 10
+                logger.debug(
+                    "[orchestrator] execution %s still running (state: %s, elapsed: %ss)",
+                    execution_id, execution.state.value, int(elapsed),
+                )
             
             # Wait before next poll
             time.sleep(poll_interval)
-    
-    def _parse_memory(self, memory_str: str) -> int:
-        """Parse memory string (e.g., '512Mi', '1Gi') to MB."""
-        memory_str = memory_str.strip()
-        
-        if memory_str.endswith("Gi"):
-            return int(float(memory_str[:-2]) * 1024)
-        elif memory_str.endswith("Mi"):
-            return int(float(memory_str[:-2]))
-        elif memory_str.endswith("G"):
-            return int(float(memory_str[:-1]) * 1024)
-        elif memory_str.endswith("M"):
-            return int(float(memory_str[:-1]))
-        else:
-            # Assume MB
-            return int(memory_str)
\ No newline at end of file
@@ -2,9 +2,8 @@
 """Run executor worker to process queued executions."""
 
 import logging
-import time
 import signal
-import sys
+import threading
 
 from execution_engine.container import execution_service, execution_repository
 from execution_engine.executor.executor import Executor
@@ -30,12 +29,15 @@ executor = Executor(
     lease_seconds=30,   # Lease duration
 )
 
+# Set by the signal handler; the main thread just waits on it
+stop_event = threading.Event()
+
 
 def signal_handler(sig, frame):
-    """Handle Ctrl+C gracefully."""
+    """Handle Ctrl+C / SIGTERM gracefully."""
     logger.info("🛑 Shutting down executor...")
     executor.stop()
-    sys.exit(0)
+    stop_event.set()
 
 
 def main():
@@ -59,13 +61,8 @@ def main():
     # Start executor
     executor.start()
     
-    # Keep running
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        logger.info("🛑 Shutting down executor...")
-        executor.stop()
+    # Keep running until a signal arrives (no periodic wake-ups)
+    stop_event.wait()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+# execution_engine/run_node_monitor.py
+"""Run node heartbeat monitor (development)."""
+
+import logging
+import sys
+
+from execution_engine.container import node_manager_service, node_repository
+from execution_engine.node_manager.heartbeat_monitor import NodeHeartbeatMonitor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point."""
+    logger.info("Starting Node Heartbeat Monitor (Development Mode)")
+    
+    monitor = NodeHeartbeatMonitor(
+        node_manager_service=node_manager_service,
+        node_repo=node_repository,
+        stale_threshold_minutes=5,
+    )
+    
+    try:
+        monitor.start()
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,12 @@
 """Retry worker - automatically retries failed executions."""
 
 import logging
-import time
 import signal
 import sys
 
 from execution_engine.container import execution_repository, execution_service
 from execution_engine.executor.retry_service import RetryService
+from execution_engine.infrastructure.postgres.notify import NotificationListener
 
 # Setup logging
 logging.basicConfig(
@@ -17,28 +17,36 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# NOTIFY channel raised with the execution_id when an execution fails
+EXECUTION_FAILED_CHANNEL = "execution_failed"
+
 
 class RetryWorker:
     """
-    Retry worker - polls for failed executions and retries them.
+    Retry worker - retries failed executions.
     
     Separate process that:
-    - Checks every 5 seconds for failed executions
+    - Wakes when an execution fails (NOTIFY execution_failed) or when the
+      next pending retry's backoff runs out
     - Retries transient failures with exponential backoff
     - Respects max retry limits
+    - Re-checks every poll_interval anyway, in case a notification is lost
     """
     
-    def __init__(self, poll_interval: int = 5):
+    def __init__(self, poll_interval: int = 10):
         """
         Initialize retry worker.
         
         Args:
-            poll_interval: How often to check for retries (seconds)
+            poll_interval: Longest wait between checks (seconds); covers lost
+                notifications, listener reconnects and a database without
+                the migration's execution_failed trigger
         """
         self.poll_interval = poll_interval
         self._stop_requested = False
         
         self.retry_service = RetryService(repository=execution_repository)
+        self._listener = NotificationListener([EXECUTION_FAILED_CHANNEL])
         
         logger.info("Retry Worker initialized")
         logger.info(f"Poll interval: {poll_interval}s")
@@ -59,6 +67,10 @@ class RetryWorker:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
+        # LISTEN before the first cycle, so failures during it are not
+        # left to the safety-net poll
+        self._listener.listen()
+        
         # Main loop
         while not self._stop_requested:
             try:
@@ -66,12 +78,21 @@ class RetryWorker:
             except Exception as e:
                 logger.error(f"Error in retry cycle: {e}", exc_info=True)
             
-            # Wait before next cycle
+            # Wait for a failure, the next backoff deadline, or the safety-net poll
             if not self._stop_requested:
-                time.sleep(self.poll_interval)
+                if self._listener.wait(self._next_wait_interval()):
+                    logger.debug("Woken by failed execution")
         
+        self._listener.close()
         logger.info("Retry Worker stopped")
     
+    def _next_wait_interval(self) -> float:
+        """Get wait time before the next cycle (soonest backoff, capped at poll_interval)."""
+        next_retry = self.retry_service.seconds_until_next_retry()
+        if next_retry is None:
+            return self.poll_interval
+        return min(next_retry, self.poll_interval)
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         logger.info(f"Received signal {signum}, stopping...")
@@ -110,7 +131,7 @@ def main():
     """Main entry point."""
     logger.info("Starting Retry Worker (Development Mode)")
     
-    worker = RetryWorker(poll_interval=5)
+    worker = RetryWorker(poll_interval=10)
     
     try:
         worker.start()
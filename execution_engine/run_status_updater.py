@@ -23,7 +23,7 @@ def main():
     """Main entry point."""
     logger.info("Starting Status Updater (Development Mode)")
     
-    updater = StatusUpdater(poll_interval=5)
+    updater = StatusUpdater(poll_interval=10)
     
     try:
         updater.start()
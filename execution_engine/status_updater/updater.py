@@ -3,24 +3,24 @@
 Status Updater Service - Background process that monitors deployments
 and updates their status based on execution states.
 
-This runs as a separate process and polls the database every 5 seconds.
+This runs as a separate process. It re-checks a deployment whenever one of
+its executions finishes (NOTIFY deployment_events), and reconciles every
+DEPLOYING deployment on a short poll as a safety net.
 """
 
-import time
 import logging
 import signal
 import sys
-from datetime import datetime, timezone
-from typing import List, Set
+from typing import Iterable, Optional, Set
 from uuid import UUID
 
-from execution_engine.domain.models import DeploymentStatus, ApplicationStatus
-from execution_engine.core.models import ExecutionState
-from execution_engine.container import (
-    domain_service,
-    execution_repository,
-    deployment_repository,
-)
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from execution_engine.infrastructure.postgres.config import settings
+from execution_engine.infrastructure.postgres.database import create_db_engine
+from execution_engine.infrastructure.postgres.notify import NotificationListener
 
 # Setup logging
 logging.basicConfig(
@@ -29,6 +29,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# NOTIFY channel raised with the deployment_id when one of its executions
+# completes or fails
+DEPLOYMENT_EVENTS_CHANNEL = "deployment_events"
+
+
+# Settles DEPLOYING deployments whose executions have all completed (RUNNING)
+# or any failed (FAILED), and moves each one's application to the same
+# status - newest deployment wins if one application has several. Error
+# messages of all its executions, in creation order, become a failed
+# deployment's error_message. Returns (deployment_id, application_id, status)
+# of the deployments that changed.
+SETTLE_DEPLOYMENTS_SQL = """
+    WITH counts AS (
+        SELECT e.deployment_id,
+               COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE e.state = 'COMPLETED') AS completed,
+               COUNT(*) FILTER (WHERE e.state = 'FAILED') AS failed,
+               string_agg(e.error_message, '; ' ORDER BY e.created_at) AS errors
+        FROM deployments d
+        JOIN executions e ON e.deployment_id = d.deployment_id
+        WHERE d.status = 'DEPLOYING' {only_ids}
+        GROUP BY e.deployment_id
+    ),
+    settled AS (
+        UPDATE deployments d
+        SET status = CASE WHEN c.failed > 0 THEN 'FAILED' ELSE 'RUNNING' END,
+            completed_at = timezone('UTC', now()),
+            error_message = CASE
+                WHEN c.failed > 0 THEN COALESCE(c.errors, 'Deployment failed')
+                ELSE d.error_message
+            END,
+            version = d.version + 1
+        FROM counts c
+        WHERE d.deployment_id = c.deployment_id
+          AND d.status = 'DEPLOYING'
+          AND (c.failed > 0 OR c.completed = c.total)
+        RETURNING d.deployment_id, d.application_id, d.status, d.created_at
+    ),
+    applications_settled AS (
+        UPDATE applications a
+        SET status = s.status,
+            version = a.version + 1,
+            updated_at = timezone('UTC', now())
+        FROM (
+            SELECT DISTINCT ON (application_id) application_id, status
+            FROM settled
+            ORDER BY application_id, created_at DESC
+        ) s
+        WHERE a.application_id = s.application_id
+          AND a.status <> s.status
+    )
+    SELECT deployment_id, application_id, status FROM settled
+"""
+
+# Server-side prepared forms of SETTLE_DEPLOYMENTS_SQL, created once per
+# connection so each cycle skips parsing and planning
+PREPARE_SETTLE_SQL = (
+    "PREPARE settle_deployments AS "
+    + SETTLE_DEPLOYMENTS_SQL.format(only_ids="")
+)
+PREPARE_SETTLE_IN_SQL = (
+    "PREPARE settle_deployments_in(uuid[]) AS "
+    + SETTLE_DEPLOYMENTS_SQL.format(only_ids="AND d.deployment_id = ANY($1)")
+)
+
+# Per-cycle statements, built once
+EXECUTE_SETTLE = text("EXECUTE settle_deployments")
+EXECUTE_SETTLE_IN = text("EXECUTE settle_deployments_in(:deployment_ids)")
+
 
 class StatusUpdater:
     """
@@ -36,20 +105,28 @@ class StatusUpdater:
     
     Architecture:
     - Runs as separate process (not thread)
-    - Polls database every 5 seconds
+    - Re-checks the deployments named by NOTIFY; scans all DEPLOYING ones
+      at start-up and whenever poll_interval passes without a notification
     - No in-memory state (crash-safe)
     - Single source of truth: PostgreSQL
     """
     
-    def __init__(self, poll_interval: int = 5):
+    def __init__(self, poll_interval: int = 10):
         """
         Initialize status updater.
         
         Args:
-            poll_interval: How often to poll database (seconds)
+            poll_interval: Longest wait between checks (seconds); NOTIFY
+                usually wakes the updater sooner, and the poll covers lost
+                notifications or a database without the migration's trigger
         """
         self.poll_interval = poll_interval
         self._stop_requested = False
+        self._listener = NotificationListener([DEPLOYMENT_EVENTS_CHANNEL])
+        # PREPAREd statements live in the server session, which PgBouncer's
+        # transaction pooling does not keep - so connect directly
+        self._engine = None
+        self._conn: Optional[Connection] = None
         
         logger.info("Status Updater initialized")
         logger.info(f"Poll interval: {poll_interval}s")
@@ -68,17 +145,24 @@ class StatusUpdater:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
-        # Main loop
+        # LISTEN before the first cycle, so executions finishing during it
+        # are not left to the safety-net poll
+        self._listener.listen()
+        
+        # Main loop; None means reconcile every DEPLOYING deployment
+        deployment_ids: Optional[Set[UUID]] = None
         while not self._stop_requested:
             try:
-                self._update_cycle()
+                self._update_cycle(deployment_ids)
             except Exception as e:
                 logger.error(f"Error in update cycle: {e}", exc_info=True)
             
-            # Wait before next cycle
+            # Wait for an execution to finish (or the safety-net poll)
             if not self._stop_requested:
-                time.sleep(self.poll_interval)
+                deployment_ids = self._wait_for_events()
         
+        self._listener.close()
+        self._discard_connection()
         logger.info("Status Updater stopped")
     
     def _signal_handler(self, signum, frame):
@@ -86,217 +170,105 @@ class StatusUpdater:
         logger.info(f"Received signal {signum}, stopping...")
         self._stop_requested = True
     
-    def _update_cycle(self):
+    def _connection(self) -> Connection:
         """
-        Single update cycle.
+        Return the connection every cycle runs on, checking it out if needed.
         
-        1. Find all deployments in DEPLOYING state
-        2. For each deployment, check execution states
-        3. Update deployment status accordingly
-        4. Update application status
+        The updater is a single-threaded process, so it keeps one pooled
+        connection for its lifetime instead of checking one out per cycle.
+        The settle statements are prepared on it when it is opened.
         """
-        # Find deployments that need checking
-        deployments_to_check = self._find_active_deployments()
-        
-        if not deployments_to_check:
-            logger.debug("No active deployments to check")
-            return
-        
-        logger.info(f"Checking {len(deployments_to_check)} active deployment(s)")
-        
-        for deployment_id in deployments_to_check:
+        if self._conn is None or self._conn.closed or self._conn.invalidated:
+            if self._engine is None:
+                self._engine = create_db_engine(settings.direct_database_url)
+            
+            conn = self._engine.connect()
+            conn.execute(text("DEALLOCATE ALL"))  # pooled connection may have them
+            conn.execute(text(PREPARE_SETTLE_SQL))
+            conn.execute(text(PREPARE_SETTLE_IN_SQL))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+    
+    def _discard_connection(self) -> None:
+        """Close the held connection; the next cycle checks out a fresh one."""
+        if self._conn is not None:
             try:
-                self._update_deployment(deployment_id)
-            except Exception as e:
-                logger.error(f"Error updating deployment {deployment_id}: {e}")
+                self._conn.close()
+            except DBAPIError:
+                pass
+            self._conn = None
     
-    def _find_active_deployments(self) -> List[UUID]:
+    def _wait_for_events(self) -> Optional[Set[UUID]]:
         """
-        Find deployments that are actively deploying.
+        Block until deployments are notified or poll_interval elapses.
         
         Returns:
-            List of deployment IDs in DEPLOYING state
+            Deployment IDs from the notifications, or None on timeout (the
+            next cycle then reconciles everything)
         """
-        # Query database for deploying deployments
-        # We use raw SQL here for efficiency
-        from execution_engine.infrastructure.postgres.database import engine
-        from sqlalchemy import text
+        notifications = self._listener.wait_payloads(self.poll_interval)
+        if not notifications:
+            return None
         
-        with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT deployment_id 
-                FROM deployments 
-                WHERE status = 'DEPLOYING'
-                ORDER BY created_at ASC
-            """))
-            
-            return [row[0] for row in result]
+        deployment_ids = set()
+        for _, payload in notifications:
+            try:
+                deployment_ids.add(UUID(payload))
+            except ValueError:
+                continue
+        
+        logger.debug(f"Woken for {len(deployment_ids)} deployment(s)")
+        return deployment_ids
     
-    def _update_deployment(self, deployment_id: UUID):
+    def _update_cycle(self, deployment_ids: Optional[Iterable[UUID]] = None):
         """
-        Update a single deployment's status.
+        Single update cycle.
         
-        Logic:
-        1. Get all executions for this deployment
-        2. Check their states
+        One prepared statement (SETTLE_DEPLOYMENTS_SQL) does the whole state machine
+        in the database:
+        1. Count execution states of DEPLOYING deployments
+        2. If any FAILED → deployment FAILED (with the executions' errors)
         3. If all COMPLETED → deployment RUNNING
-        4. If any FAILED → deployment FAILED
-        5. Otherwise → still DEPLOYING
+        4. Otherwise → still DEPLOYING (row untouched)
+        5. Move the application of each settled deployment to match
         
         Args:
-            deployment_id: Deployment to update
+            deployment_ids: Deployments to check; None checks every
+                DEPLOYING deployment
         """
-        logger.info(f"[{deployment_id}] Checking deployment status")
-        
-        # Get deployment
-        deployment = domain_service.get_deployment(deployment_id)
-        if not deployment:
-            logger.warning(f"[{deployment_id}] Deployment not found")
-            return
-        
-        # Get all executions for this deployment
-        executions = self._get_deployment_executions(deployment_id)
-        
-        if not executions:
-            logger.debug(f"[{deployment_id}] No executions yet")
-            return
-        
-        # Count execution states
-        total = len(executions)
-        completed = sum(1 for e in executions if e.state == ExecutionState.COMPLETED)
-        failed = sum(1 for e in executions if e.state == ExecutionState.FAILED)
-        
-        logger.info(
-            f"[{deployment_id}] Executions: {completed}/{total} completed, "
-            f"{failed}/{total} failed"
-        )
-        
-        # Determine new status
-        new_status = None
-        
-        if failed > 0:
-            # Any failure means deployment failed
-            new_status = DeploymentStatus.FAILED
-            logger.info(f"[{deployment_id}] → FAILED (has failed executions)")
-        
-        elif completed == total:
-            # All completed means success
-            new_status = DeploymentStatus.RUNNING
-            logger.info(f"[{deployment_id}] → RUNNING (all executions completed)")
-        
+        if deployment_ids is None:
+            statement = EXECUTE_SETTLE
+            params = {}
         else:
-            # Still in progress
-            logger.debug(f"[{deployment_id}] Still deploying ({completed}/{total})")
-        
-        # Update deployment status if changed
-        if new_status and new_status != deployment.status:
-            self._apply_deployment_status(deployment, new_status, executions)
-    
-    def _get_deployment_executions(self, deployment_id: UUID) -> List:
-        """
-        Get all executions for a deployment.
-        
-        Args:
-            deployment_id: Deployment ID
-            
-        Returns:
-            List of executions
-        """
-        from execution_engine.infrastructure.postgres.database import engine
-        from sqlalchemy import text
-        
-        with engine.connect() as conn:
-            result = conn.execute(
-                text("""
-                    SELECT execution_id, state, error_message
-                    FROM executions
-                    WHERE deployment_id = :deployment_id
-                    ORDER BY created_at ASC
-                """),
-                {"deployment_id": deployment_id}
-            )
-            
-            executions = []
-            for row in result:
-                # Get full execution object
-                execution = execution_repository.get(row[0])
-                if execution:
-                    executions.append(execution)
-            
-            return executions
-    
-    def _apply_deployment_status(self, deployment, new_status: DeploymentStatus, executions: List):
-        """
-        Apply new status to deployment and update application.
-        
-        Args:
-            deployment: Deployment object
-            new_status: New status to apply
-            executions: List of executions
-        """
-        deployment_id = deployment.deployment_id
-        
-        logger.info(f"[{deployment_id}] Updating status: {deployment.status.value} → {new_status.value}")
-        
-        # Update deployment
-        deployment.status = new_status
-        
-        if new_status == DeploymentStatus.RUNNING:
-            deployment.completed_at = datetime.now(timezone.utc)
-        
-        elif new_status == DeploymentStatus.FAILED:
-            deployment.completed_at = datetime.now(timezone.utc)
-            # Collect error messages
-            errors = [e.error_message for e in executions if e.error_message]
-            deployment.error_message = "; ".join(errors) if errors else "Deployment failed"
-        
-        deployment_repository.update(deployment)
-        
-        logger.info(f"[{deployment_id}] ✅ Deployment status updated")
-        
-        # Update application status
-        self._update_application_status(deployment, new_status)
-    
-    def _update_application_status(self, deployment, deployment_status: DeploymentStatus):
-        """
-        Update application status based on deployment status.
-        
-        Args:
-            deployment: Deployment object
-            deployment_status: New deployment status
-        """
-        application_id = deployment.application_id
-        application = domain_service.get_application(application_id)
-        
-        if not application:
-            logger.warning(f"Application {application_id} not found")
+            statement = EXECUTE_SETTLE_IN
+            params = {"deployment_ids": list(deployment_ids)}
+            if not params["deployment_ids"]:
+                return
+        
+        conn = self._connection()
+        try:
+            with conn.begin():
+                settled = conn.execute(statement, params).all()
+        except DBAPIError as e:
+            # Lost connection: drop it so the next cycle reconnects
+            if e.connection_invalidated or conn.invalidated:
+                self._discard_connection()
+            raise
+        
+        if not settled:
+            logger.debug("No deployments settled")
             return
         
-        # Map deployment status to application status
-        if deployment_status == DeploymentStatus.RUNNING:
-            new_app_status = ApplicationStatus.RUNNING
-        elif deployment_status == DeploymentStatus.FAILED:
-            new_app_status = ApplicationStatus.FAILED
-        else:
-            # Other statuses don't change app status
-            return
+        for deployment_id, application_id, status in settled:
+            logger.info(f"[{deployment_id}] → {status} (application {application_id})")
         
-        # Update application
-        if application.status != new_app_status:
-            logger.info(
-                f"[app:{application_id}] Updating status: "
-                f"{application.status.value} → {new_app_status.value}"
-            )
-            
-            application.status = new_app_status
-            domain_service._app_repo.update(application)
-            
-            logger.info(f"[app:{application_id}] ✅ Application status updated")
+        logger.info(f"✅ Settled {len(settled)} deployment(s)")
 
 
 def main():
     """Main entry point."""
-    updater = StatusUpdater(poll_interval=5)
+    updater = StatusUpdater(poll_interval=10)
     
     try:
         updater.start()
@@ -2,13 +2,24 @@
 """Runtime Agent client for making deployment requests."""
 
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional
+from urllib3.util.retry import Retry
 from uuid import UUID
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections held per agent; the executor deploys to one agent
+# from several threads at once
+POOL_MAXSIZE = 32
+
+# Retry connection failures and gateway errors briefly. urllib3 only
+# retries POST when the request never reached the agent, so a deploy is
+# not sent twice.
+RETRY = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+
 
 @dataclass
 class DeploymentResult:
@@ -33,6 +44,22 @@ class RuntimeAgentClient:
         """
         self.base_url = agent_url.rstrip('/')
         self.timeout = timeout
+        
+        # One session per agent reuses TCP connections across calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=POOL_MAXSIZE, max_retries=RETRY)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+    
+    def close(self) -> None:
+        """Close the client's pooled connections."""
+        self._session.close()
+    
+    def __enter__(self) -> "RuntimeAgentClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def health_check(self) -> bool:
         """
@@ -42,7 +69,7 @@ class RuntimeAgentClient:
             True if healthy, False otherwise
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/health",
                 timeout=5
             )
@@ -59,7 +86,7 @@ class RuntimeAgentClient:
             Node info dict or None if failed
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/info",
                 timeout=10
             )
@@ -97,7 +124,7 @@ class RuntimeAgentClient:
             }
             
             # Make request
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/deploy",
                 json=payload,
                 timeout=self.timeout
@@ -140,7 +167,7 @@ class RuntimeAgentClient:
             Status dict or None if failed
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/containers/{container_id}/status",
                 timeout=10
             )
@@ -161,7 +188,7 @@ class RuntimeAgentClient:
             True if stopped, False otherwise
         """
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/containers/{container_id}/stop",
                 timeout=30
             )
@@ -183,7 +210,7 @@ class RuntimeAgentClient:
             True if removed, False otherwise
         """
         try:
-            response = requests.delete(
+            response = self._session.delete(
                 f"{self.base_url}/containers/{container_id}",
                 params={"force": force},
                 timeout=30
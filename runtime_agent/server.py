@@ -6,7 +6,7 @@ Receives deployment requests and manages Docker containers.
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Literal, Optional, List
 from uuid import UUID
 import docker
 import logging
@@ -43,6 +43,11 @@ class ContainerSpec(BaseModel):
     volumes: List[str] = Field(default_factory=list, description="Volume mounts")
     restart_policy: str = Field(default="always", description="Restart policy")
     labels: Dict[str, str] = Field(default_factory=dict, description="Container labels")
+    pull_policy: Optional[Literal["always", "if_not_present", "never"]] = Field(
+        default=None,
+        description="When to pull the image (default: 'always' for untagged or "
+                    ":latest images, else 'if_not_present')"
+    )
 
 
 class DeployRequest(BaseModel):
@@ -78,9 +83,61 @@ class NodeInfoResponse(BaseModel):
     cpu_count: int
 
 
+# ============================================
+# HELPERS
+# ============================================
+
+def _ensure_image(execution_id: UUID, spec: ContainerSpec) -> None:
+    """
+    Make spec.image available locally, pulling only when needed.
+    
+    Raises:
+        HTTPException: 404 if the image is missing and cannot be pulled
+    """
+    policy = spec.pull_policy
+    if policy is None:
+        # Mutable tags are re-checked; anything else is pinned
+        name = spec.image.rsplit("/", 1)[-1]
+        mutable = "@" not in name and (":" not in name or name.endswith(":latest"))
+        policy = "always" if mutable else "if_not_present"
+    
+    try:
+        local = docker_client.images.get(spec.image)
+    except docker.errors.ImageNotFound:
+        local = None
+    
+    if local is not None and policy != "always":
+        logger.info(f"[{execution_id}] Image present locally, not pulling: {spec.image}")
+        return
+    
+    if local is None and policy == "never":
+        raise HTTPException(status_code=404, detail=f"Image not present locally: {spec.image}")
+    
+    if local is not None:
+        # Skip the pull if the registry still serves the digest we have
+        try:
+            digest = docker_client.images.get_registry_data(spec.image).id
+        except docker.errors.APIError as e:
+            logger.warning(f"[{execution_id}] Registry check failed, using local image: {e}")
+            return
+        if any(d.endswith(f"@{digest}") for d in local.attrs.get("RepoDigests", [])):
+            logger.info(f"[{execution_id}] Local image is up to date: {spec.image}")
+            return
+    
+    logger.info(f"[{execution_id}] Pulling image: {spec.image}")
+    try:
+        docker_client.images.pull(spec.image)
+        logger.info(f"[{execution_id}] ✅ Image pulled")
+    except docker.errors.ImageNotFound:
+        raise HTTPException(status_code=404, detail=f"Image not found: {spec.image}")
+
+
 # ============================================
 # ENDPOINTS
 # ============================================
+# Endpoints that call Docker are plain `def`: docker-py blocks (an image
+# pull can take minutes), and FastAPI runs sync endpoints in its
+# threadpool, so one slow deploy does not stall the event loop.
 
 @app.get("/health")
 async def health_check():
@@ -95,7 +152,7 @@ async def health_check():
 
 
 @app.get("/info", response_model=NodeInfoResponse)
-async def get_node_info():
+def get_node_info():
     """Get node information."""
     if docker_client is None:
         raise HTTPException(status_code=503, detail="Docker not available")
@@ -117,7 +174,7 @@ async def get_node_info():
 
 
 @app.post("/deploy", response_model=DeployResponse)
-async def deploy_container(request: DeployRequest):
+def deploy_container(request: DeployRequest):
     """
     Deploy a container.
     
@@ -135,13 +192,8 @@ async def deploy_container(request: DeployRequest):
     try:
         logger.info(f"[{request.execution_id}] Starting deployment: {spec.name}")
         
-        # Step 1: Pull image
-        logger.info(f"[{request.execution_id}] Pulling image: {spec.image}")
-        try:
-            docker_client.images.pull(spec.image)
-            logger.info(f"[{request.execution_id}] ✅ Image pulled")
-        except docker.errors.ImageNotFound:
-            raise HTTPException(status_code=404, detail=f"Image not found: {spec.image}")
+        # Step 1: Pull image (per spec.pull_policy)
+        _ensure_image(request.execution_id, spec)
         
         # Step 2: Prepare container config
         container_config = {
@@ -209,7 +261,7 @@ async def deploy_container(request: DeployRequest):
 
 
 @app.get("/containers/{container_id}/status", response_model=ContainerStatusResponse)
-async def get_container_status(container_id: str):
+def get_container_status(container_id: str):
     """Get container status."""
     if docker_client is None:
         raise HTTPException(status_code=503, detail="Docker not available")
@@ -232,7 +284,7 @@ async def get_container_status(container_id: str):
 
 
 @app.post("/containers/{container_id}/stop")
-async def stop_container(container_id: str):
+def stop_container(container_id: str):
     """Stop a container."""
     if docker_client is None:
         raise HTTPException(status_code=503, detail="Docker not available")
@@ -251,7 +303,7 @@ async def stop_container(container_id: str):
 
 
 @app.delete("/containers/{container_id}")
-async def remove_container(container_id: str, force: bool = False):
+def remove_container(container_id: str, force: bool = False):
     """Remove a container."""
     if docker_client is None:
         raise HTTPException(status_code=503, detail="Docker not available")
@@ -271,7 +323,7 @@ async def remove_container(container_id: str, force: bool = False):
 # runtime_agent/server.py (ADD restart endpoint)
 
 @app.post("/containers/{container_id}/restart")
-async def restart_container(container_id: str):
+def restart_container(container_id: str):
     """
     Restart a container.
 
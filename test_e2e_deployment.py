@@ -7,6 +7,7 @@ from execution_engine.container import (
     node_manager_service,
     execution_service,
     deployment_repository,
+    deployed_resource_repository,
 )
 from execution_engine.orchestrator.deployment_orchestrator import DeploymentOrchestrator
 from execution_engine.node_manager.models import InfrastructureNode, NodeType
@@ -133,6 +134,7 @@ def main():
         execution_service=execution_service,
         node_manager_service=node_manager_service,
         deployment_repo=deployment_repository,
+        deployed_resource_repo=deployed_resource_repository,
     )
     
     try:
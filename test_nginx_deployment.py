@@ -9,6 +9,7 @@ from execution_engine.container import (
     domain_service,
     node_manager_service,
     execution_service,
+    deployed_resource_repository,
 )
 from execution_engine.orchestrator.deployment_orchestrator import DeploymentOrchestrator
 from execution_engine.infrastructure.postgres.domain_repository import DeploymentRepository
@@ -142,6 +143,7 @@ def main():
         execution_service=execution_service,
         node_manager_service=node_manager_service,
         deployment_repo=deployment_repo,
+        deployed_resource_repo=deployed_resource_repository,
     )
     
     try:
@@ -9,6 +9,7 @@ from execution_engine.container import (
     node_manager_service,
     execution_service,        # ✅ ADD THIS
     execution_repository,     # ✅ ADD THIS
+    deployed_resource_repository,
 )
 from execution_engine.orchestrator.deployment_orchestrator import DeploymentOrchestrator
 from execution_engine.infrastructure.postgres.domain_repository import DeploymentRepository
@@ -77,6 +78,7 @@ def main():
         execution_service=execution_service,
         node_manager_service=node_manager_service,
         deployment_repo=deployment_repo,
+        deployed_resource_repo=deployed_resource_repository,
     )
     
     print("⚡ Starting orchestrator (returns immediately)...")
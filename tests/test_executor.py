@@ -0,0 +1,73 @@
+#tests\test_executor.py
+
+"""Test executor slot handling when claiming fails (no database needed)."""
+
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+
+from execution_engine.executor.executor import Executor
+
+
+class FailingRepository:
+    """Repository whose queue lookup fails like a lost DB connection."""
+
+    def list_by_state(self, state, limit):
+        raise RuntimeError("connection refused")
+
+    def list_recoverable(self, limit):
+        return []
+
+
+class FailingService:
+    """Service whose claim fails."""
+
+    def claim_execution(self, execution_id, worker_id, lease_seconds):
+        raise RuntimeError("connection refused")
+
+
+def make_executor(repository, service=None, max_slots=2):
+    return Executor(
+        executor_id="test-executor",
+        service=service or FailingService(),
+        repository=repository,
+        max_slots=max_slots,
+    )
+
+
+class TestClaimFailure:
+    """Test slots come back when claiming work raises."""
+
+    def test_list_by_state_error_returns_slot(self):
+        """Test a failing queue lookup does not leak the reserved slot."""
+        executor = make_executor(FailingRepository())
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                executor._claim_and_execute()
+
+        assert executor.slots.free_slots() == 2
+
+    def test_claim_error_returns_slot(self):
+        """Test a failing claim does not leak the reserved slot."""
+        queued = SimpleNamespace(execution_id=uuid4())
+        repository = SimpleNamespace(list_by_state=lambda state, limit: [queued])
+        executor = make_executor(repository)
+
+        with pytest.raises(RuntimeError):
+            executor._claim_and_execute()
+
+        assert executor.slots.free_slots() == 2
+        assert executor.slots.active_slots() == []
+
+    def test_no_work_returns_slot(self):
+        """Test an empty queue gives the slot back."""
+        repository = SimpleNamespace(
+            list_by_state=lambda state, limit: [],
+            list_recoverable=lambda limit: [],
+        )
+        executor = make_executor(repository, max_slots=1)
+
+        executor._claim_and_execute()
+
+        assert executor.slots.free_slots() == 1
@@ -0,0 +1,594 @@
+#tests\test_health_checker.py
+
+"""Test health checker probes and scheduling (no database or containers needed)."""
+
+import errno
+import os
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from uuid import uuid4
+
+from execution_engine.health_checker import checker as checker_module
+from execution_engine.health_checker.checker import HealthChecker, _build_port_map
+
+
+def make_container(check_type="tcp", port=80, host_port=None, timeout_seconds=1, **health_check):
+    """Container record as _find_containers_to_check builds it."""
+    ports = {f"{port}/tcp": host_port} if host_port is not None else {}
+    return {
+        'resource_id': uuid4(),
+        'deployment_id': uuid4(),
+        'external_id': 'c0ffee',
+        'name': 'test-container',
+        'spec': {'health_check': {'type': check_type, 'port': port, 'timeout_seconds': timeout_seconds, **health_check}},
+        'node_id': uuid4(),
+        'health_status': 'HEALTHY',
+        'consecutive_failures': 0,
+        'last_check_at': None,
+        'runtime_agent_url': 'http://agent:9000',
+        'port_map': _build_port_map(ports),
+    }
+
+
+@pytest.fixture
+def checker():
+    """Health checker that never connects anywhere on its own."""
+    checker = HealthChecker(check_interval=10, failure_threshold=3, restart_delay=60)
+    yield checker
+    checker._session.close()
+
+
+@pytest.fixture
+def listening_port():
+    """Port on localhost that accepts connections."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('localhost', 0))
+    server.listen(16)
+    yield server.getsockname()[1]
+    server.close()
+
+
+@pytest.fixture
+def closed_port():
+    """Port on localhost that refuses connections."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('localhost', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+@pytest.fixture
+def http_server():
+    """Local HTTP server that sets a cookie and records the Cookie headers it receives."""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            received.append(self.headers.get('Cookie'))
+            self.send_response(200)
+            self.send_header('Set-Cookie', 'session=tenant-a; Path=/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('localhost', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1], received
+    server.shutdown()
+    server.server_close()
+
+
+class FakeSocket:
+    """Socket stand-in recording close(); connect_ex is configurable."""
+
+    def __init__(self, connect_result=None, connect_error=None, fileno=None):
+        self.connect_result = connect_result
+        self.connect_error = connect_error
+        self._fileno = fileno
+        self.closed = False
+
+    def setblocking(self, flag):
+        pass
+
+    def connect_ex(self, address):
+        if self.connect_error is not None:
+            raise self.connect_error
+        return self.connect_result
+
+    def fileno(self):
+        return self._fileno
+
+    def getsockopt(self, level, option):
+        return 0
+
+    def close(self):
+        self.closed = True
+
+
+class TestTcpBatch:
+    """Test the selector-based TCP probe pass."""
+
+    def test_open_and_refused_ports(self, checker, listening_port, closed_port):
+        """Test each container gets its own probe result."""
+        up = make_container(host_port=listening_port)
+        down = make_container(host_port=closed_port)
+
+        results = checker._check_tcp_batch([up, down])
+
+        assert results == {up['resource_id']: True, down['resource_id']: False}
+
+    def test_non_tcp_checks_ignored(self, checker, listening_port):
+        """Test HTTP and unconfigured containers are left to their own checks."""
+        http = make_container(check_type='http', host_port=listening_port)
+        unchecked = make_container(host_port=listening_port)
+        unchecked['spec'] = {}
+
+        assert checker._check_tcp_batch([http, unchecked]) == {}
+
+    def test_unmapped_port_fails(self, checker):
+        """Test a health check port without a host mapping is unhealthy."""
+        container = make_container(port=8080)
+
+        assert checker._check_tcp_batch([container]) == {container['resource_id']: False}
+
+    @pytest.mark.parametrize("port", ["http", None, [80]])
+    def test_bad_port_fails_only_that_container(self, checker, listening_port, port):
+        """Test an unparseable port marks its container unhealthy and the rest are still probed."""
+        bad = make_container(host_port=listening_port)
+        bad['spec']['health_check']['port'] = port
+        good = make_container(host_port=listening_port)
+
+        results = checker._check_tcp_batch([bad, good])
+
+        assert results == {bad['resource_id']: False, good['resource_id']: True}
+
+    def test_connect_error_closes_socket(self, checker, monkeypatch, listening_port):
+        """Test a socket whose connect raises is closed and reported unhealthy."""
+        fake = FakeSocket(connect_error=OSError(errno.EADDRNOTAVAIL, "cannot assign address"))
+        monkeypatch.setattr(checker_module.socket, "socket", lambda *args: fake)
+        container = make_container(host_port=listening_port)
+
+        results = checker._check_tcp_batch([container])
+
+        assert results == {container['resource_id']: False}
+        assert fake.closed
+
+    def test_timeout_fails_and_closes_socket(self, checker, monkeypatch):
+        """Test a handshake that never completes times out as unhealthy."""
+        # A pipe's read end never becomes writable, like a stalled connect
+        read_fd, write_fd = os.pipe()
+        fake = FakeSocket(connect_result=errno.EINPROGRESS, fileno=read_fd)
+        monkeypatch.setattr(checker_module.socket, "socket", lambda *args: fake)
+        container = make_container(host_port=9, timeout_seconds=0.05)
+
+        try:
+            results = checker._check_tcp_batch([container])
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+        assert results == {container['resource_id']: False}
+        assert fake.closed
+
+    def test_check_cycle_survives_bad_port(self, checker, monkeypatch, listening_port):
+        """Test one bad port does not abort the cycle's other checks."""
+        bad = make_container(host_port=listening_port, port="http")
+        good = make_container(host_port=listening_port)
+        monkeypatch.setattr(checker, "_find_containers_to_check", lambda: [bad, good])
+        monkeypatch.setattr(checker, "_flush_health_updates", lambda: None)
+
+        assert checker._check_cycle() == 2
+
+        statuses = {row[0]: (row[1], row[2]) for row in checker._pending_health_updates}
+        assert statuses == {
+            str(bad['resource_id']): ('HEALTHY', 1),
+            str(good['resource_id']): ('HEALTHY', 0),
+        }
+
+
+class TestHttpProbe:
+    """Test the shared HTTP probe session."""
+
+    def test_cookies_not_kept_between_probes(self, checker, http_server):
+        """Test a cookie set by one container is never sent to another."""
+        port, received = http_server
+        first = make_container(check_type='http', host_port=port)
+        second = make_container(check_type='http', host_port=port)
+
+        assert checker._check_http_health(first, first['spec']['health_check'])
+        assert checker._check_http_health(second, second['spec']['health_check'])
+
+        assert received == [None, None]
+        assert len(checker._session.cookies) == 0
+
+    def test_restart_does_not_use_loop_session(self, checker, monkeypatch):
+        """Test restart timers call the runtime agent without the check loop's session."""
+        calls = []
+
+        class Response:
+            status_code = 500
+
+        def post(url, **kwargs):
+            calls.append(url)
+            return Response()
+
+        def session_post(*args, **kwargs):
+            raise AssertionError("restart used the shared session")
+
+        monkeypatch.setattr(checker_module.requests, "post", post)
+        monkeypatch.setattr(checker._session, "post", session_post)
+        container = make_container()
+
+        checker._restart_container(container)
+
+        assert calls == ['http://agent:9000/containers/c0ffee/restart']
+
+
+class FakeListener:
+    """NotificationListener stand-in recording calls in a shared log."""
+
+    def __init__(self, log, on_wait=None):
+        self.log = log
+        self.on_wait = on_wait
+        self.waits = []
+
+    def listen(self):
+        self.log.append('listen')
+
+    def wait(self, timeout):
+        self.log.append('wait')
+        self.waits.append(timeout)
+        if self.on_wait is not None:
+            self.on_wait()
+        return []
+
+    def close(self):
+        self.log.append('close')
+
+
+class TestLoop:
+    """Test the main loop's LISTEN setup."""
+
+    def test_listen_before_first_cycle(self, checker, monkeypatch):
+        """Test LISTEN is open before the first cycle runs."""
+        log = []
+
+        def stop():
+            checker._stop_requested = True
+
+        def check_cycle():
+            log.append('cycle')
+            return 0
+
+        monkeypatch.setattr(checker_module.signal, "signal", lambda *args: None)
+        monkeypatch.setattr(checker, "_listener", FakeListener(log, on_wait=stop))
+        monkeypatch.setattr(checker, "_check_cycle", check_cycle)
+
+        checker.start()
+
+        assert log == ['listen', 'cycle', 'wait', 'close']
+
+
+class TestRestartScheduling:
+    """Test delayed restarts run off the check loop."""
+
+    @pytest.fixture
+    def restarts(self, checker, monkeypatch):
+        """Replace the runtime agent call with one that records and signals."""
+        done = threading.Event()
+        calls = []
+
+        def restart(container):
+            calls.append(container['resource_id'])
+            done.set()
+
+        monkeypatch.setattr(checker, "_restart_container", restart)
+        checker.restart_delay = 0.05
+        return calls, done
+
+    def test_restart_scheduled_without_blocking(self, checker, restarts):
+        """Test crossing the threshold schedules a restart and returns at once."""
+        calls, done = restarts
+        container = make_container()
+        container['consecutive_failures'] = checker.failure_threshold - 1
+
+        checker._handle_unhealthy_container(container)
+
+        assert calls == []
+        assert container['resource_id'] in checker._pending_restarts
+        assert done.wait(5)
+        assert calls == [container['resource_id']]
+
+    def test_pending_entry_cleared_after_restart(self, checker, restarts):
+        """Test the pending entry is dropped once the restart ran."""
+        calls, done = restarts
+        container = make_container()
+        container['consecutive_failures'] = checker.failure_threshold - 1
+
+        checker._handle_unhealthy_container(container)
+        timer = checker._pending_restarts[container['resource_id']]
+        timer.join(5)
+
+        assert done.is_set()
+        assert checker._pending_restarts == {}
+
+    def test_restart_not_scheduled_twice(self, checker, restarts):
+        """Test a container with a restart in flight is not scheduled again."""
+        calls, done = restarts
+        checker.restart_delay = 60
+        container = make_container()
+        container['consecutive_failures'] = checker.failure_threshold - 1
+
+        checker._handle_unhealthy_container(container)
+        timer = checker._pending_restarts[container['resource_id']]
+        checker._handle_unhealthy_container(container)
+
+        assert checker._pending_restarts == {container['resource_id']: timer}
+        timer.cancel()
+
+    @pytest.mark.parametrize("failures", [0, 3, 5])
+    def test_restart_only_when_crossing_threshold(self, checker, restarts, failures):
+        """Test failures below or past the threshold schedule nothing."""
+        container = make_container()
+        container['consecutive_failures'] = failures
+
+        checker._handle_unhealthy_container(container)
+
+        assert checker._pending_restarts == {}
+
+
+class TestPortMap:
+    """Test port mappings pre-indexed when containers are loaded."""
+
+    def test_key_forms_normalized(self):
+        """Test "80/tcp", "80" and 80 keys all index as (80, "tcp")."""
+        assert _build_port_map({"80/tcp": 8080}) == {(80, "tcp"): 8080}
+        assert _build_port_map({"80": 8080}) == {(80, "tcp"): 8080}
+        assert _build_port_map({80: "8080"}) == {(80, "tcp"): 8080}
+
+    def test_protocol_kept(self):
+        """Test UDP mappings do not shadow TCP ones."""
+        port_map = _build_port_map({"53/udp": 5353, "53/tcp": 5354})
+
+        assert port_map == {(53, "udp"): 5353, (53, "tcp"): 5354}
+
+    @pytest.mark.parametrize("ports", [
+        {"http/tcp": 8080},
+        {"80/tcp": None},
+        {"80/tcp": "auto"},
+    ])
+    def test_malformed_entries_skipped(self, ports):
+        """Test malformed entries are dropped instead of failing the load."""
+        assert _build_port_map({**ports, "443/tcp": 8443}) == {(443, "tcp"): 8443}
+
+
+class FakeRawConnection:
+    """DBAPI connection stand-in for engine.raw_connection()."""
+
+    def __init__(self, log):
+        self.log = log
+
+    def cursor(self):
+        log = self.log
+
+        class Cursor:
+            def close(self):
+                log.append('cursor.close')
+
+        return Cursor()
+
+    def commit(self):
+        self.log.append('commit')
+
+    def rollback(self):
+        self.log.append('rollback')
+
+    def close(self):
+        self.log.append('close')
+
+
+class TestFlushHealthUpdates:
+    """Test the end-of-cycle batched health status write."""
+
+    @pytest.fixture
+    def db(self, monkeypatch):
+        """Fake engine and execute_values; returns the call log and statements."""
+        log = []
+        statements = []
+
+        def execute_values(cursor, sql, rows, template=None):
+            statements.append(list(rows))
+
+        monkeypatch.setattr(checker_module.engine, "raw_connection", lambda: FakeRawConnection(log))
+        monkeypatch.setattr(checker_module, "execute_values", execute_values)
+        return log, statements
+
+    def test_one_statement_per_cycle(self, checker, db):
+        """Test every buffered row goes out in a single statement."""
+        log, statements = db
+        ids = [uuid4() for _ in range(3)]
+        checker._update_health_status(ids[0], is_healthy=True, current_failures=2)
+        checker._update_health_status(ids[1], is_healthy=False, current_failures=0)
+        checker._update_health_status(ids[2], is_healthy=False, current_failures=2)
+
+        checker._flush_health_updates()
+
+        assert len(statements) == 1
+        assert [row[:3] for row in statements[0]] == [
+            (str(ids[0]), 'HEALTHY', 0),
+            (str(ids[1]), 'HEALTHY', 1),
+            (str(ids[2]), 'UNHEALTHY', 3),
+        ]
+        assert log == ['cursor.close', 'commit', 'close']
+        assert checker._pending_health_updates == []
+
+    def test_nothing_buffered_no_connection(self, checker, db):
+        """Test an empty buffer does not touch the database."""
+        log, statements = db
+
+        checker._flush_health_updates()
+
+        assert log == []
+        assert statements == []
+
+    def test_failed_write_rolls_back(self, checker, db, monkeypatch):
+        """Test a failing write is rolled back, the connection returned and the error raised."""
+        log, _ = db
+
+        def execute_values(cursor, sql, rows, template=None):
+            raise RuntimeError("deadlock detected")
+
+        monkeypatch.setattr(checker_module, "execute_values", execute_values)
+        checker._update_health_status(uuid4(), is_healthy=True, current_failures=0)
+
+        with pytest.raises(RuntimeError):
+            checker._flush_health_updates()
+
+        assert log == ['rollback', 'close']
+        assert checker._pending_health_updates == []
+
+    def test_cycle_flushes_after_check_error(self, checker, monkeypatch, listening_port):
+        """Test the cycle's buffered rows are written even if a check raises."""
+        flushed = []
+        containers = [make_container(host_port=listening_port) for _ in range(2)]
+
+        def check(container, tcp_results):
+            if container is containers[0]:
+                raise RuntimeError("boom")
+            checker._update_health_status(container['resource_id'], True, 0)
+
+        monkeypatch.setattr(checker, "_find_containers_to_check", lambda: containers)
+        monkeypatch.setattr(checker, "_check_container_health", check)
+        monkeypatch.setattr(
+            checker, "_flush_health_updates",
+            lambda: flushed.append(list(checker._pending_health_updates)),
+        )
+
+        checker._check_cycle()
+
+        assert len(flushed) == 1
+        assert [row[0] for row in flushed[0]] == [str(containers[1]['resource_id'])]
+
+
+class TestIdleBackoff:
+    """Test polling slows down while there is nothing to check."""
+
+    @pytest.mark.parametrize("empty_cycles, expected", [
+        (0, 10),
+        (1, 20),
+        (2, 40),
+        (3, 60),
+        (16, 60),
+    ])
+    def test_wait_doubles_up_to_cap(self, checker, empty_cycles, expected):
+        """Test the wait doubles per empty cycle, capped at MAX_IDLE_INTERVAL."""
+        checker._consecutive_empty_cycles = empty_cycles
+
+        assert checker._next_wait_interval() == expected
+
+    def test_cap_never_below_check_interval(self):
+        """Test a check_interval above MAX_IDLE_INTERVAL is not shortened."""
+        checker = HealthChecker(check_interval=120)
+        checker._consecutive_empty_cycles = 3
+
+        assert checker._next_wait_interval() == 120
+        checker._session.close()
+
+    def test_loop_resets_backoff_on_work(self, checker, monkeypatch):
+        """Test the loop backs off on empty cycles and resets once containers appear."""
+        cycles = iter([0, 0, 0, 2, 0])
+        listener = FakeListener([])
+
+        def check_cycle():
+            count = next(cycles, None)
+            if count is None:
+                checker._stop_requested = True
+                return 0
+            return count
+
+        monkeypatch.setattr(checker_module.signal, "signal", lambda *args: None)
+        monkeypatch.setattr(checker, "_listener", listener)
+        monkeypatch.setattr(checker, "_check_cycle", check_cycle)
+
+        checker.start()
+
+        assert listener.waits == [20, 40, 60, 10, 20]
+
+    def test_failed_cycle_resets_backoff(self, checker, monkeypatch):
+        """Test an erroring cycle is not counted as empty."""
+        listener = FakeListener([], on_wait=lambda: setattr(checker, "_stop_requested", True))
+
+        def check_cycle():
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(checker_module.signal, "signal", lambda *args: None)
+        monkeypatch.setattr(checker, "_listener", listener)
+        monkeypatch.setattr(checker, "_check_cycle", check_cycle)
+        checker._consecutive_empty_cycles = 3
+
+        checker.start()
+
+        assert listener.waits == [10]
+
+
+class TestNodeUrlCache:
+    """Test the node_id -> runtime_agent_url cache."""
+
+    @pytest.fixture
+    def refreshes(self, checker, monkeypatch):
+        """Replace the DB reload with one serving a fixed node map."""
+        nodes = {uuid4(): 'http://node-a:9000', uuid4(): 'http://node-b:9000'}
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            checker._node_urls = dict(nodes)
+            checker._node_urls_loaded_at = checker_module.time.monotonic()
+
+        monkeypatch.setattr(checker, "_refresh_node_urls", refresh)
+        return nodes, calls
+
+    def test_first_use_loads(self, checker, refreshes):
+        """Test an empty cache is loaded."""
+        nodes, calls = refreshes
+
+        checker._ensure_node_urls(set(nodes))
+
+        assert calls == [1]
+        assert checker._node_urls == nodes
+
+    def test_fresh_cache_reused(self, checker, refreshes):
+        """Test a fresh cache covering the nodes is not reloaded."""
+        nodes, calls = refreshes
+        checker._ensure_node_urls(set(nodes))
+
+        for _ in range(5):
+            checker._ensure_node_urls(set(nodes))
+
+        assert calls == [1]
+
+    def test_unknown_node_reloads(self, checker, refreshes):
+        """Test a node missing from the cache (e.g. newly registered) forces a reload."""
+        nodes, calls = refreshes
+        checker._ensure_node_urls(set(nodes))
+
+        checker._ensure_node_urls(set(nodes) | {uuid4()})
+
+        assert calls == [1, 1]
+
+    def test_expired_cache_reloads(self, checker, refreshes):
+        """Test the cache is reloaded after NODE_URL_CACHE_TTL."""
+        nodes, calls = refreshes
+        checker._ensure_node_urls(set(nodes))
+        checker._node_urls_loaded_at -= checker_module.NODE_URL_CACHE_TTL + 1
+
+        checker._ensure_node_urls(set(nodes))
+
+        assert calls == [1, 1]
@@ -59,6 +59,33 @@ class TestIntegrationWorkflow:
         assert final_execution.state == ExecutionState.COMPLETED
         assert final_execution.lease_owner is None
     
+    def test_submit_executions_queues_batch(self, service):
+        """Test: submitted executions are stored QUEUED and claimable."""
+        executions = [
+            Execution(
+                execution_id=uuid4(),
+                tenant_id=uuid4(),
+                application_id=uuid4(),
+                runtime_type="docker",
+                spec={"image": "nginx:alpine"}
+            )
+            for _ in range(3)
+        ]
+        
+        service.submit_executions(executions)
+        
+        for execution in executions:
+            stored = service._require_execution(execution.execution_id)
+            assert stored.state == ExecutionState.QUEUED
+            assert stored.queued_at is not None
+            assert stored.version == 1
+        
+        assert service.claim_execution(
+            executions[0].execution_id,
+            worker_id="worker-1",
+            lease_seconds=30
+        ) is True
+    
     def test_lease_expiration_recovery(self, service, repository):
         """Test recovering from expired lease."""
         
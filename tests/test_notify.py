@@ -0,0 +1,45 @@
+#tests\test_notify.py
+
+"""Test the LISTEN helper's behaviour when the connection fails (no database needed)."""
+
+import pytest
+
+from execution_engine.infrastructure.postgres import notify
+from execution_engine.infrastructure.postgres.notify import NotificationListener, RECONNECT_DELAY
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record time.sleep calls in the notify module instead of sleeping."""
+    calls = []
+    monkeypatch.setattr(notify.time, "sleep", calls.append)
+    return calls
+
+
+@pytest.fixture
+def listener():
+    """Listener pointed at a port nothing listens on."""
+    listener = NotificationListener(["test_channel"], dsn="host=127.0.0.1 port=1 connect_timeout=1")
+    yield listener
+    listener.close()
+
+
+class TestConnectionFailure:
+    """Test a failed LISTEN connection."""
+
+    def test_wait_backs_off_briefly(self, listener, sleeps):
+        """Test a failed wait pauses RECONNECT_DELAY, not the whole timeout."""
+        assert listener.wait(300) == []
+        assert sleeps == [RECONNECT_DELAY]
+
+    def test_short_timeout_not_exceeded(self, listener, sleeps):
+        """Test a timeout below RECONNECT_DELAY is kept."""
+        assert listener.wait_payloads(0.5) == []
+        assert sleeps == [0.5]
+
+    def test_listen_failure_only_logged(self, listener, sleeps):
+        """Test listen() swallows the error and leaves reconnecting to wait()."""
+        listener.listen()
+
+        assert listener._conn is None
+        assert sleeps == []
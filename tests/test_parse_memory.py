@@ -0,0 +1,55 @@
+#tests\test_parse_memory.py
+
+"""Test parsing of container memory sizes (no database needed)."""
+
+import pytest
+
+from execution_engine.orchestrator.deployment_orchestrator import _parse_memory
+
+
+class TestParseMemory:
+    """Test memory string parsing."""
+
+    @pytest.mark.parametrize("memory_str, expected", [
+        ("512Mi", 512),
+        ("1Gi", 1024),
+        ("1.5Gi", 1536),
+        ("512M", 512),
+        ("2G", 2048),
+        ("256", 256),
+        ("0.5G", 512),
+        ("  128Mi ", 128),
+        ("64 Mi", 64),
+        ("1.9Mi", 1),
+    ])
+    def test_accepted(self, memory_str, expected):
+        """Test values the original suffix parser accepted give the same MB."""
+        assert _parse_memory(memory_str) == expected
+
+    def test_plain_decimal_accepted(self):
+        """Test a unitless decimal is truncated to MB like suffixed values."""
+        # The original parser passed unitless values to int() and raised here
+        assert _parse_memory("256.5") == 256
+
+    @pytest.mark.parametrize("memory_str", [
+        "",
+        "Mi",
+        "abc",
+        "512Ki",
+        "1Ti",
+        "512mi",
+        "1.2.3Gi",
+        "nanM",
+    ])
+    def test_rejected(self, memory_str):
+        """Test values the original parser also rejected raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid memory value"):
+            _parse_memory(memory_str)
+
+    @pytest.mark.parametrize("memory_str", ["-1Gi", "+512Mi", "1e3M", "infGi"])
+    def test_rejected_signs_and_float_forms(self, memory_str):
+        """Test signs, exponents and inf are rejected."""
+        # The original parser handed these to float(): '-1Gi' gave -1024,
+        # '+512Mi' 512, '1e3M' 1000, and 'infGi' raised OverflowError
+        with pytest.raises(ValueError, match="Invalid memory value"):
+            _parse_memory(memory_str)
@@ -0,0 +1,134 @@
+#tests\test_placement.py
+
+"""Test in-memory batch placement (no database needed)."""
+
+import pytest
+from uuid import uuid4
+
+from execution_engine.infrastructure.postgres.node_repository import _assign_placements
+from execution_engine.node_manager.models import (
+    CapacityRequest,
+    InfrastructureNode,
+    NodeType,
+    PlacementStrategy,
+)
+
+
+def make_node(name, cpu, memory, storage=100, max_containers=50, active_containers=0):
+    """Node with the given free capacity."""
+    return InfrastructureNode(
+        node_id=uuid4(),
+        node_name=name,
+        node_type=NodeType.APP_NODE,
+        internal_ip="10.0.0.1",
+        runtime_agent_url="http://10.0.0.1:9000",
+        total_cpu=cpu,
+        total_memory=memory,
+        total_storage=storage,
+        available_cpu=cpu,
+        available_memory=memory,
+        available_storage=storage,
+        max_containers=max_containers,
+        active_containers=active_containers,
+    )
+
+
+class TestAssignPlacements:
+    """Test first-fit-decreasing assignment."""
+
+    def test_largest_request_placed_first(self):
+        """Test a large request is not crowded out by a smaller one listed before it."""
+        big_node = make_node("big", cpu=2.0, memory=8192)
+        small_node = make_node("small", cpu=1.0, memory=8192)
+        requests = [
+            CapacityRequest(cpu=1.0, memory=256, storage=1),
+            CapacityRequest(cpu=2.0, memory=256, storage=1),
+        ]
+
+        assignment = _assign_placements(
+            [big_node, small_node], requests, PlacementStrategy.LEAST_LOADED
+        )
+
+        # In input order the 1-core request would take big_node and leave
+        # no node for the 2-core one
+        assert assignment == [small_node, big_node]
+
+    def test_capacity_consumed_within_batch(self):
+        """Test later requests see capacity left by earlier assignments."""
+        node = make_node("node", cpu=2.0, memory=1024)
+        requests = [CapacityRequest(cpu=0.7, memory=256, storage=1)] * 3
+
+        assignment = _assign_placements([node], requests, PlacementStrategy.BEST_FIT)
+
+        assert assignment == [node, node, None]
+
+    def test_centicores_do_not_drift(self):
+        """Test fractional CPU requests fill a node exactly."""
+        node = make_node("node", cpu=0.3, memory=1024)
+        requests = [CapacityRequest(cpu=0.1, memory=1, storage=1)] * 3
+
+        assignment = _assign_placements([node], requests, PlacementStrategy.BEST_FIT)
+
+        assert assignment == [node, node, node]
+
+    def test_max_containers_bound(self):
+        """Test a node takes no more containers than max_containers."""
+        node = make_node("node", cpu=8.0, memory=8192, max_containers=3, active_containers=1)
+        requests = [CapacityRequest(cpu=0.1, memory=64, storage=1)] * 4
+
+        assignment = _assign_placements([node], requests, PlacementStrategy.BEST_FIT)
+
+        assert assignment.count(node) == 2
+        assert assignment.count(None) == 2
+
+    def test_full_node_skipped(self):
+        """Test a node already at max_containers is never chosen."""
+        full = make_node("full", cpu=8.0, memory=8192, max_containers=2, active_containers=2)
+        other = make_node("other", cpu=1.0, memory=1024)
+        requests = [CapacityRequest(cpu=0.5, memory=256, storage=1)]
+
+        assignment = _assign_placements([full, other], requests, PlacementStrategy.BEST_FIT)
+
+        assert assignment == [other]
+
+    def test_best_fit_packs_tightest_node(self):
+        """Test BEST_FIT picks the node with the least spare capacity."""
+        roomy = make_node("roomy", cpu=8.0, memory=8192)
+        tight = make_node("tight", cpu=1.0, memory=1024)
+        requests = [CapacityRequest(cpu=0.5, memory=256, storage=1)] * 2
+
+        assignment = _assign_placements([roomy, tight], requests, PlacementStrategy.BEST_FIT)
+
+        assert assignment == [tight, tight]
+
+    def test_least_loaded_spreads(self):
+        """Test LEAST_LOADED spreads a batch across nodes."""
+        first = make_node("first", cpu=8.0, memory=8192)
+        second = make_node("second", cpu=8.0, memory=8192)
+        requests = [CapacityRequest(cpu=0.5, memory=256, storage=1)] * 4
+
+        assignment = _assign_placements([first, second], requests, PlacementStrategy.LEAST_LOADED)
+
+        assert assignment.count(first) == 2
+        assert assignment.count(second) == 2
+
+    @pytest.mark.parametrize("request_", [
+        CapacityRequest(cpu=4.0, memory=256, storage=1),
+        CapacityRequest(cpu=0.5, memory=4096, storage=1),
+        CapacityRequest(cpu=0.5, memory=256, storage=500),
+    ])
+    def test_no_fit_returns_none(self, request_):
+        """Test a request exceeding every node's free CPU, memory or storage is unplaced."""
+        node = make_node("node", cpu=2.0, memory=2048, storage=100)
+
+        assert _assign_placements([node], [request_], PlacementStrategy.BEST_FIT) == [None]
+
+    def test_node_objects_not_mutated(self):
+        """Test assignment works on a copy of the nodes' capacity."""
+        node = make_node("node", cpu=2.0, memory=2048)
+
+        _assign_placements([node], [CapacityRequest(cpu=1.0, memory=512, storage=1)], PlacementStrategy.BEST_FIT)
+
+        assert node.available_cpu == 2.0
+        assert node.available_memory == 2048
+        assert node.active_containers == 0
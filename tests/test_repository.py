@@ -153,7 +153,35 @@ class TestPostgresExecutionRepository:
         # Verify expiration extended
         execution = repository.get(sample_execution.execution_id)
         assert execution.lease_expires_at > initial_expires_at
-    
+
+    def test_renew_lease_wrong_worker_fails(self, repository, sample_execution):
+        """Test renewing a lease held by another worker."""
+        repository.create(sample_execution)
+        sample_execution.queue()
+        repository.update(sample_execution)
+        repository.try_claim(sample_execution.execution_id, "worker-1", 30)
+
+        with pytest.raises(ExecutionLeaseError):
+            repository.renew_lease(sample_execution.execution_id, "worker-2", 30)
+
+    def test_finalize_releases_lease(self, repository, sample_execution):
+        """Test finalizing a started execution."""
+        repository.create(sample_execution)
+        sample_execution.queue()
+        repository.update(sample_execution)
+        repository.try_claim(sample_execution.execution_id, "worker-1", 30)
+        repository.start(sample_execution.execution_id, "worker-1")
+
+        with pytest.raises(ExecutionLeaseError):
+            repository.finalize(sample_execution.execution_id, "worker-2", ExecutionState.COMPLETED)
+
+        repository.finalize(sample_execution.execution_id, "worker-1", ExecutionState.COMPLETED)
+
+        execution = repository.get(sample_execution.execution_id)
+        assert execution.state == ExecutionState.COMPLETED
+        assert execution.lease_owner is None
+        assert execution.finished_at is not None
+
     def test_list_recoverable(self, repository, sample_execution):
         """Test listing recoverable executions."""
         repository.create(sample_execution)
@@ -0,0 +1,176 @@
+#tests\test_runtime_agent_images.py
+
+"""Test the runtime agent's image pull decisions (no database or Docker daemon needed)."""
+
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+
+docker = pytest.importorskip("docker")
+fastapi = pytest.importorskip("fastapi")
+
+from runtime_agent import server
+from runtime_agent.server import ContainerSpec, _ensure_image
+
+
+class FakeImages:
+    """docker_client.images stand-in recording pulls."""
+
+    def __init__(self, local=None, registry_digest=None, registry_error=False, pullable=True):
+        self.local = local or {}
+        self.registry_digest = registry_digest
+        self.registry_error = registry_error
+        self.pullable = pullable
+        self.pulled = []
+        self.registry_checks = []
+
+    def get(self, image):
+        if image not in self.local:
+            raise docker.errors.ImageNotFound(f"No such image: {image}")
+        return SimpleNamespace(attrs={"RepoDigests": self.local[image]})
+
+    def get_registry_data(self, image):
+        self.registry_checks.append(image)
+        if self.registry_error:
+            raise docker.errors.APIError("registry unreachable")
+        return SimpleNamespace(id=self.registry_digest)
+
+    def pull(self, image):
+        if not self.pullable:
+            raise docker.errors.ImageNotFound(f"pull access denied for {image}")
+        self.pulled.append(image)
+
+
+@pytest.fixture
+def images(monkeypatch):
+    """Install a fake Docker client; tests configure its images."""
+    fake = FakeImages()
+    monkeypatch.setattr(server, "docker_client", SimpleNamespace(images=fake))
+    return fake
+
+
+def ensure(image, pull_policy=None):
+    _ensure_image(uuid4(), ContainerSpec(image=image, name="test", pull_policy=pull_policy))
+
+
+class TestDefaultPullPolicy:
+    """Test the policy chosen from the image reference."""
+
+    @pytest.mark.parametrize("image", [
+        "nginx",
+        "nginx:latest",
+        "registry.example.com:5000/team/app",
+        "registry.example.com:5000/team/app:latest",
+    ])
+    def test_mutable_tag_rechecks_registry(self, images, image):
+        """Test untagged and :latest images are checked against the registry."""
+        images.local = {image: ["nginx@sha256:old"]}
+        images.registry_digest = "sha256:new"
+
+        ensure(image)
+
+        assert images.registry_checks == [image]
+        assert images.pulled == [image]
+
+    @pytest.mark.parametrize("image", [
+        "nginx:1.25-alpine",
+        "registry.example.com:5000/team/app:v2",
+        "nginx@sha256:abc123",
+        "nginx:1.25@sha256:abc123",
+    ])
+    def test_pinned_image_present_not_pulled(self, images, image):
+        """Test pinned tags and digests present locally skip the registry entirely."""
+        images.local = {image: []}
+
+        ensure(image)
+
+        assert images.registry_checks == []
+        assert images.pulled == []
+
+    @pytest.mark.parametrize("image", ["nginx:1.25-alpine", "nginx@sha256:abc123"])
+    def test_pinned_image_missing_pulled(self, images, image):
+        """Test pinned images are pulled when not present locally."""
+        ensure(image)
+
+        assert images.pulled == [image]
+
+
+class TestMutableTagCheck:
+    """Test the registry digest comparison for :latest images."""
+
+    def test_up_to_date_not_pulled(self, images):
+        """Test a local image matching the registry digest is not pulled."""
+        images.local = {"nginx:latest": ["nginx@sha256:same"]}
+        images.registry_digest = "sha256:same"
+
+        ensure("nginx:latest")
+
+        assert images.pulled == []
+
+    def test_registry_error_uses_local_image(self, images):
+        """Test an unreachable registry falls back to the local image."""
+        images.local = {"nginx:latest": ["nginx@sha256:old"]}
+        images.registry_error = True
+
+        ensure("nginx:latest")
+
+        assert images.pulled == []
+
+    def test_missing_latest_pulled(self, images):
+        """Test a missing :latest image is pulled without a registry check."""
+        ensure("nginx:latest")
+
+        assert images.registry_checks == []
+        assert images.pulled == ["nginx:latest"]
+
+
+class TestExplicitPullPolicy:
+    """Test pull_policy overrides."""
+
+    def test_always_pulls_pinned_tag(self, images):
+        """Test 'always' re-checks even a pinned tag."""
+        images.local = {"nginx:1.25": ["nginx@sha256:old"]}
+        images.registry_digest = "sha256:new"
+
+        ensure("nginx:1.25", pull_policy="always")
+
+        assert images.pulled == ["nginx:1.25"]
+
+    def test_if_not_present_skips_latest(self, images):
+        """Test 'if_not_present' uses a local :latest image as is."""
+        images.local = {"nginx:latest": []}
+
+        ensure("nginx:latest", pull_policy="if_not_present")
+
+        assert images.registry_checks == []
+        assert images.pulled == []
+
+    def test_never_uses_local_image(self, images):
+        """Test 'never' uses a local image without contacting the registry."""
+        images.local = {"nginx:latest": []}
+
+        ensure("nginx:latest", pull_policy="never")
+
+        assert images.registry_checks == []
+        assert images.pulled == []
+
+    def test_never_missing_image_404(self, images):
+        """Test 'never' with no local image is a 404, not a pull."""
+        with pytest.raises(fastapi.HTTPException) as exc_info:
+            ensure("nginx:1.25", pull_policy="never")
+
+        assert exc_info.value.status_code == 404
+        assert images.pulled == []
+
+
+class TestPullFailure:
+    """Test images that cannot be pulled."""
+
+    def test_unknown_image_404(self, images):
+        """Test an image the registry does not have is a 404."""
+        images.pullable = False
+
+        with pytest.raises(fastapi.HTTPException) as exc_info:
+            ensure("no-such-image:1.0")
+
+        assert exc_info.value.status_code == 404
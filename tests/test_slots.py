@@ -115,4 +115,32 @@ class TestSlotManager:
         active = manager.active_slots()
         
         assert len(active) == 2
-        assert manager.free_slots() == 3
\ No newline at end of file
+        assert manager.free_slots() == 3
+    
+    def test_release_returns_slot_to_pool(self):
+        """Test released slot can be acquired again."""
+        manager = SlotManager(max_slots=1)
+        
+        slot = manager.acquire_free_slot()
+        slot.bind(uuid4())
+        assert manager.acquire_free_slot() is None
+        
+        slot.release()
+        
+        assert manager.free_slots() == 1
+        assert manager.acquire_free_slot() is slot
+    
+    def test_double_release_does_not_duplicate_slot(self):
+        """Test releasing the same slot twice only frees it once."""
+        manager = SlotManager(max_slots=2)
+        
+        slot = manager.acquire_free_slot()
+        slot.release()
+        slot.release()
+        
+        assert manager.free_slots() == 2
+        
+        first = manager.acquire_free_slot()
+        second = manager.acquire_free_slot()
+        assert first is not second
+        assert manager.acquire_free_slot() is None
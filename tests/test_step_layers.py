@@ -0,0 +1,74 @@
+#tests\test_step_layers.py
+
+"""Test grouping of deployment steps into dependency layers (no database needed)."""
+
+import pytest
+
+from execution_engine.domain.models import DeploymentStepDefinition
+from execution_engine.orchestrator.deployment_orchestrator import _step_layers
+
+
+def make_step(step_id, *depends_on, order=1):
+    """Container step with the given dependencies."""
+    return DeploymentStepDefinition(
+        step_id=step_id,
+        step_name=step_id,
+        step_type="container",
+        order=order,
+        depends_on=list(depends_on),
+    )
+
+
+def layer_ids(layers):
+    """Step ids per layer."""
+    return [[step.step_id for step in layer] for layer in layers]
+
+
+class TestStepLayers:
+    """Test dependency layering."""
+
+    def test_no_steps(self):
+        """Test an empty template has no layers."""
+        assert _step_layers([]) == []
+
+    def test_independent_steps_share_layer(self):
+        """Test steps without dependencies form one layer in input order."""
+        steps = [make_step("web"), make_step("db"), make_step("cache")]
+
+        assert layer_ids(_step_layers(steps)) == [["web", "db", "cache"]]
+
+    def test_chain(self):
+        """Test a dependency chain yields one step per layer."""
+        steps = [make_step("app", "db"), make_step("proxy", "app"), make_step("db")]
+
+        assert layer_ids(_step_layers(steps)) == [["db"], ["app"], ["proxy"]]
+
+    def test_diamond(self):
+        """Test a step waits for all of its dependencies."""
+        steps = [
+            make_step("db"),
+            make_step("api", "db"),
+            make_step("worker", "db"),
+            make_step("proxy", "api", "worker"),
+        ]
+
+        assert layer_ids(_step_layers(steps)) == [["db"], ["api", "worker"], ["proxy"]]
+
+    def test_unknown_dependency(self):
+        """Test a dependency that is not a step raises."""
+        steps = [make_step("app", "db", "cache")]
+
+        with pytest.raises(ValueError, match=r"Step app depends on unknown step\(s\): cache, db"):
+            _step_layers(steps)
+
+    def test_self_dependency(self):
+        """Test a step depending on itself is a cycle."""
+        with pytest.raises(ValueError, match="Dependency cycle between steps: app"):
+            _step_layers([make_step("app", "app")])
+
+    def test_cycle(self):
+        """Test a cycle raises and names only the steps left unresolved."""
+        steps = [make_step("db"), make_step("a", "db", "b"), make_step("b", "a")]
+
+        with pytest.raises(ValueError, match="Dependency cycle between steps: a, b$"):
+            _step_layers(steps)